@@ -0,0 +1,151 @@
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from urllib.parse import parse_qs
+import asyncio
+import functools
+import time
+import logging
+
+from core.config import settings
+from core.metrics import http_request_duration
+from core.profiler import SamplingProfiler
+from core.timing import start_request, mark_endpoint_done, register_thread
+from core.query_stats import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """요청 처리 시간을 라우트별 히스토그램으로 기록하는 ASGI 미들웨어
+    
+    응답 헤더를 보내는 시점까지 측정한다 (JSON 응답은 직렬화까지 포함,
+    SSE 같은 스트리밍 응답은 연결 유지 시간을 제외). 라우트는 경로 템플릿
+    (/api/v1/holdings/{ticker}) 으로 집계해 종목별로 레이블이 늘지 않는다.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        recorded = False
+        
+        def record(status):
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status
+            )
+        
+        async def send_wrapper(message):
+            nonlocal recorded
+            if message["type"] == "http.response.start" and not recorded:
+                recorded = True
+                record(message["status"])
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not recorded:
+                record(500)
+
+
+class TimedRoute(APIRoute):
+    """엔드포인트 함수 반환 시각을 기록하는 라우트 (Server-Timing 의 serialize 구간 경계)
+    
+    라우터 생성시 route_class 로 지정한다. 동기 엔드포인트는 스레드 풀에서
+    실행되므로 그 스레드를 프로파일러 샘플 대상으로 등록한다.
+    """
+    
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+def _timed_endpoint(endpoint):
+    if getattr(endpoint, "_timed", False):
+        return endpoint
+    
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                mark_endpoint_done()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            register_thread()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                mark_endpoint_done()
+    
+    wrapper._timed = True
+    return wrapper
+
+
+class RequestTimingMiddleware:
+    """요청 시간을 SQL/시세/환율/애플리케이션/직렬화 구간으로 나눠 Server-Timing 헤더로 반환
+    
+    요청이 끝나면 같은 SQL 을 SQL_REPEAT_THRESHOLD 번 넘게 실행했는지 확인해
+    N+1 의심 경고를 남긴다. Server-Timing 헤더는 SERVER_TIMING_ENABLED 일 때만 붙인다.
+    PROFILING_ENABLED 일 때 `X-Profile: 1` 헤더나 `?profile=1` 로 요청하면 그
+    요청 동안 샘플링 프로파일러를 돌려 PROFILE_DIR 에 저장하고, 파일 이름을
+    X-Profile 응답 헤더로 돌려준다.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    @staticmethod
+    def _profile_requested(scope) -> bool:
+        if not settings.PROFILING_ENABLED:
+            return False
+        if dict(scope["headers"]).get(b"x-profile", b"").lower() in (b"1", b"true"):
+            return True
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return query.get("profile", [""])[-1].lower() in ("1", "true")
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timings = start_request(f"{scope['method']} {scope['path']}")
+        profiler = None
+        if self._profile_requested(scope):
+            profiler = SamplingProfiler(
+                lambda: timings.threads, settings.PROFILE_SAMPLE_INTERVAL_MS / 1000
+            )
+            profiler.start()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if settings.SERVER_TIMING_ENABLED:
+                    headers.append("Server-Timing", timings.server_timing(time.perf_counter()))
+                    headers.append("Timing-Allow-Origin", settings.FRONTEND_URL)
+                if profiler is not None:
+                    profiler.stop()
+                    filename = profiler.save(settings.PROFILE_DIR, scope["method"], scope["path"])
+                    headers.append("X-Profile", filename)
+                    logger.info(
+                        f"Profile saved: {filename} ({profiler.sample_count} samples, "
+                        f"{scope['method']} {scope['path']})"
+                    )
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.stop()
+            query_stats.check_repeated(timings)
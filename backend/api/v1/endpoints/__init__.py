@@ -3,5 +3,6 @@ from api.v1.endpoints import transactions
 from api.v1.endpoints import portfolio
 from api.v1.endpoints import exchange
 from api.v1.endpoints import alerts
+from api.v1.endpoints import diagnostics
 
-__all__ = ["holdings", "transactions", "portfolio", "exchange", "alerts"]
+__all__ = ["holdings", "transactions", "portfolio", "exchange", "alerts", "diagnostics"]
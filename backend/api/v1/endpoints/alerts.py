@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from api.deps import get_db_session
+from api.middleware import TimedRoute
 from crud import alert as crud_alert
-from schemas import AlertResponse, AlertListResponse
+from crud import alert_outbox as crud_alert_outbox
+from crud import alert_rule as crud_alert_rule
+from services.alert_delivery import alert_delivery
+from schemas import (
+    AlertResponse,
+    AlertListResponse,
+    AlertOutboxStatusResponse,
+    AlertRuleCreate,
+    AlertRuleResponse,
+    MessageResponse,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=AlertListResponse)
@@ -30,7 +41,10 @@ async def get_alerts(
             ticker=a.ticker,
             change_percent=float(a.change_percent),
             price=float(a.price),
-            sent_at=a.sent_at
+            sent_at=a.sent_at,
+            rule_id=a.rule_id,
+            rule_type=a.rule_type,
+            threshold=float(a.threshold) if a.threshold is not None else None
         )
         for a in alerts
     ]
@@ -39,3 +53,67 @@ async def get_alerts(
         alerts=alerts_data,
         total_count=total_count
     )
+
+
+@router.get("/outbox", response_model=AlertOutboxStatusResponse)
+async def get_alert_outbox_status(db: Session = Depends(get_db_session)):
+    """알림 발송 대기열 상태 (대기/완료/실패 수, 발송 지연)"""
+    counts = crud_alert_outbox.get_status_counts(db)
+    stats = alert_delivery.stats()
+    
+    return AlertOutboxStatusResponse(
+        pending=counts["pending"],
+        sent=counts["sent"],
+        failed=counts["failed"],
+        latency_avg_seconds=stats["latency_avg_seconds"],
+        latency_max_seconds=stats["latency_max_seconds"]
+    )
+
+
+def _rule_response(rule) -> AlertRuleResponse:
+    return AlertRuleResponse(
+        id=rule.id,
+        ticker=rule.ticker,
+        rule_type=rule.rule_type,
+        threshold=float(rule.threshold),
+        last_triggered_at=rule.last_triggered_at,
+        created_at=rule.created_at
+    )
+
+
+@router.get("/rules", response_model=List[AlertRuleResponse])
+async def get_alert_rules(
+    ticker: str = None,
+    db: Session = Depends(get_db_session)
+):
+    """알림 규칙 목록"""
+    rules = crud_alert_rule.get_rules(db, ticker)
+    return [_rule_response(r) for r in rules]
+
+
+@router.post("/rules", response_model=AlertRuleResponse, status_code=status.HTTP_201_CREATED)
+async def create_alert_rule(
+    rule: AlertRuleCreate,
+    db: Session = Depends(get_db_session)
+):
+    """알림 규칙 추가 (다음 가격 체크부터 적용)"""
+    created = crud_alert_rule.create_rule(db, rule.ticker, rule.rule_type, rule.threshold)
+    return _rule_response(created)
+
+
+@router.delete("/rules/{rule_id}", response_model=MessageResponse)
+async def delete_alert_rule(
+    rule_id: int,
+    db: Session = Depends(get_db_session)
+):
+    """알림 규칙 삭제"""
+    if not crud_alert_rule.delete_rule(db, rule_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"알림 규칙 ID {rule_id}를 찾을 수 없습니다"
+        )
+    
+    return MessageResponse(
+        message="알림 규칙이 삭제되었습니다",
+        detail=f"Rule ID: {rule_id}"
+    )
@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+
+from services.stock_service import quote_cache, quote_flight, quote_breaker, negative_cache
+from services.forex_service import forex_flight
+from services.market_data import market_data
+from services.scheduler import scan_stats, scheduler_leader
+from services.alert_dedup import alert_index
+from services.alert_rules import rule_index
+from services.email_service import smtp_session
+from services.alert_delivery import alert_delivery
+from services.event_stream import event_hub, stream_poller
+from core.query_stats import query_stats
+from api.middleware import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/market-data")
+async def get_market_data_diagnostics():
+    """시세/환율 캐시, 조회 coalescing, 차단기/실패 종목 백오프 상태, 스케줄러 리더, 가격 체크 소요 시간, 알림 중복 방지/규칙 인덱스, SMTP 연결, 알림 발송, 실시간 스트림, SQL 통계"""
+    return {
+        "provider": {
+            "name": market_data.name,
+            **(market_data.stats() if hasattr(market_data, "stats") else {}),
+        },
+        "quote_cache": quote_cache.stats(),
+        "circuit_breaker": quote_breaker.stats(),
+        "negative_cache": negative_cache.stats(),
+        "scheduler_leader": scheduler_leader.stats(),
+        "price_scan": scan_stats.stats(),
+        "alert_dedup": alert_index.stats(),
+        "alert_rules": rule_index.stats(),
+        "smtp": smtp_session.stats(),
+        "alert_delivery": alert_delivery.stats(),
+        "stream": {**event_hub.stats(), **stream_poller.stats()},
+        "sql": query_stats.stats(),
+        "coalescing": {
+            "quotes": quote_flight.stats(),
+            "forex": forex_flight.stats(),
+        },
+    }
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from datetime import datetime
 
 from services.forex_service import ForexService
 from schemas import ExchangeRateResponse
+from api.middleware import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 forex_service = ForexService()
 
 
 @router.get("/", response_model=ExchangeRateResponse)
 async def get_exchange_rate():
-    """현재 USD/KRW 환율 조회"""
+    """현재 USD/KRW 환율 조회 (환율 갱신 시각 및 경과 시간 포함)"""
     rate = forex_service.get_usd_to_krw()
     
     if not rate:
@@ -21,5 +21,7 @@ async def get_exchange_rate():
     
     return ExchangeRateResponse(
         usd_to_krw=rate,
-        updated_at=datetime.now()
+        updated_at=forex_service.get_updated_at(),
+        age_seconds=round(forex_service.get_rate_age(), 1),
+        is_stale=forex_service.provider.is_stale()
     )
@@ -1,24 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from typing import List, Literal, Optional
 
 from api.deps import get_db_session
+from api.middleware import TimedRoute
 from crud import holdings as crud_holdings
-from schemas import HoldingResponse, StockDetailResponse
+from crud import price_history as crud_price_history
+from schemas import HoldingResponse, StockDetailResponse, PriceHistoryResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+PriceSource = Literal["live", "snapshot"]
 
 
 @router.get("/", response_model=List[HoldingResponse])
-async def read_holdings(db: Session = Depends(get_db_session)):
+async def read_holdings(
+    source: Optional[PriceSource] = Query(None, description="시세 출처 (기본: PRICE_SOURCE 설정)"),
+    db: Session = Depends(get_db_session)
+):
     """보유 종목 목록 조회 (현재가 포함)"""
-    return crud_holdings.get_all_holdings_with_stats(db)
+    return crud_holdings.get_all_holdings_with_stats(db, source)
 
 
 @router.get("/{ticker}", response_model=StockDetailResponse)
-async def read_holding_detail(ticker: str, db: Session = Depends(get_db_session)):
+async def read_holding_detail(
+    ticker: str,
+    source: Optional[PriceSource] = Query(None, description="시세 출처 (기본: PRICE_SOURCE 설정)"),
+    db: Session = Depends(get_db_session)
+):
     """특정 종목 상세 정보 조회"""
-    holding_detail = crud_holdings.get_holding_detail(db, ticker)
+    holding_detail = crud_holdings.get_holding_detail(db, ticker, source)
     
     if not holding_detail:
         raise HTTPException(
@@ -29,6 +41,20 @@ async def read_holding_detail(ticker: str, db: Session = Depends(get_db_session)
     return holding_detail
 
 
+@router.get("/{ticker}/history", response_model=PriceHistoryResponse)
+async def read_price_history(
+    ticker: str,
+    start: Optional[date] = Query(None, description="시작일 (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="종료일 (YYYY-MM-DD)"),
+    db: Session = Depends(get_db_session)
+):
+    """종목 일봉(OHLCV) 조회 (로컬 가격 저장소)"""
+    return PriceHistoryResponse(
+        ticker=ticker.upper(),
+        bars=crud_price_history.get_bars(db, ticker, start, end)
+    )
+
+
 @router.delete("/{ticker}")
 async def delete_holding(ticker: str, db: Session = Depends(get_db_session)):
     """종목 삭제"""
@@ -1,14 +1,35 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from datetime import date
+from typing import Literal, Optional
 
 from api.deps import get_db_session
+from api.middleware import TimedRoute
+from core.config import settings
 from crud import portfolio as crud_portfolio
-from schemas import PortfolioSummaryResponse
+from crud import portfolio_history as crud_portfolio_history
+from schemas import PortfolioSummaryResponse, PortfolioHistoryResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/summary", response_model=PortfolioSummaryResponse)
-async def get_portfolio_summary(db: Session = Depends(get_db_session)):
+async def get_portfolio_summary(
+    source: Optional[Literal["live", "snapshot"]] = Query(None, description="시세 출처 (기본: PRICE_SOURCE 설정)"),
+    db: Session = Depends(get_db_session)
+):
     """포트폴리오 전체 요약 정보"""
-    return crud_portfolio.get_portfolio_summary(db)
+    return crud_portfolio.get_portfolio_summary(db, source)
+
+
+@router.get("/history", response_model=PortfolioHistoryResponse)
+async def get_portfolio_history(
+    start: Optional[date] = Query(None, description="시작일 (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="종료일 (YYYY-MM-DD)"),
+    db: Session = Depends(get_db_session)
+):
+    """포트폴리오 일별 평가액/매입 비용/손익 추이"""
+    return PortfolioHistoryResponse(
+        history=crud_portfolio_history.get_history(db, start, end),
+        reporting_currency=settings.REPORTING_CURRENCY
+    )
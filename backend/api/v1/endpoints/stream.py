@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+
+from services.event_stream import event_hub, format_sse
+from core.config import settings
+from api.middleware import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/")
+async def stream_events(request: Request):
+    """실시간 이벤트 스트림 (Server-Sent Events)
+    
+    - prices: 스케줄러가 갱신한 종목별 시세 (연결 직후 전체, 이후 변경분)
+    - exchange_rate: USD/KRW 환율 갱신
+    - alert: 새로 발송된 알림
+    
+    모든 연결이 프로세스 공용 fan-out 을 구독하므로 연결 수가 늘어도
+    시세/환율 조회는 늘지 않는다.
+    """
+    subscriber = event_hub.subscribe()
+    
+    async def events():
+        try:
+            yield f"retry: {settings.STREAM_RETRY_MS}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.STREAM_HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(message)
+        finally:
+            event_hub.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -3,15 +3,17 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from api.deps import get_db_session
+from api.middleware import TimedRoute
 from crud import transaction as crud_transaction
 from schemas import (
     TransactionCreate,
+    TransactionBulkCreate,
     TransactionResponse,
     TransactionListResponse,
     MessageResponse
 )
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
@@ -40,6 +42,32 @@ async def create_transaction(
         )
 
 
+@router.post("/bulk", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
+async def create_transactions_bulk(
+    payload: TransactionBulkCreate,
+    db: Session = Depends(get_db_session)
+):
+    """거래 일괄 입력 (과거 거래 가져오기)"""
+    try:
+        new_transactions = crud_transaction.create_transactions_bulk(db, payload.transactions)
+        
+        return MessageResponse(
+            message="거래가 일괄 등록되었습니다",
+            detail=f"{len(new_transactions)}건"
+        )
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"거래 일괄 등록 실패: {str(e)}"
+        )
+
+
 @router.get("/", response_model=TransactionListResponse)
 async def read_transactions(
     ticker: str = None,
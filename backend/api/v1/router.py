@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from api.v1.endpoints import holdings, transactions, portfolio, exchange, alerts
+from api.v1.endpoints import holdings, transactions, portfolio, exchange, alerts, stream, diagnostics
 
 # API v1 메인 라우터
 api_router = APIRouter()
@@ -34,3 +34,15 @@ api_router.include_router(
     prefix="/alerts",
     tags=["알림"]
 )
+
+api_router.include_router(
+    stream.router,
+    prefix="/stream",
+    tags=["실시간"]
+)
+
+api_router.include_router(
+    diagnostics.router,
+    prefix="/diagnostics",
+    tags=["진단"]
+)
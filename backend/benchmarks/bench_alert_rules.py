@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+알림 규칙 평가 벤치마크: 전체 규칙 순회 vs 종목별 정렬 배열 이진 탐색
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_alert_rules [규칙 수] [종목 수] [반복 횟수]
+"""
+
+import random
+import sys
+import time
+from datetime import timedelta
+
+from services.alert_rules import AlertRuleIndex, RULE_TYPES
+
+
+def make_data(n_rules: int, n_tickers: int):
+    """임의의 규칙과 체크 1회분 시세 생성"""
+    rng = random.Random(42)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    base = {t: rng.uniform(10, 500) for t in tickers}
+    
+    rules = []
+    for rule_id in range(1, n_rules + 1):
+        ticker = rng.choice(tickers)
+        rule_type = rng.choice(RULE_TYPES)
+        if rule_type in ("price_above", "price_below"):
+            threshold = base[ticker] * rng.uniform(0.7, 1.3)
+        else:
+            threshold = rng.uniform(2, 30)
+        rules.append((rule_id, ticker, rule_type, threshold, None))
+    
+    ticks = []
+    for t in tickers:
+        previous_close = base[t]
+        price = previous_close * rng.uniform(0.97, 1.03)  # 체크 1회분 변동
+        ticks.append((t, price, previous_close, (price - previous_close) / previous_close * 100, previous_close * 1.05))
+    return rules, ticks
+
+
+def scan_rules(rules, ticks):
+    """기존 방식 확장: 체크마다 모든 규칙을 순회하며 조건 비교"""
+    by_ticker = {t[0]: t for t in ticks}
+    fired = []
+    for rule_id, ticker, rule_type, threshold, _ in rules:
+        _, price, previous, change, avg_cost = by_ticker[ticker]
+        if rule_type == "pct_move":
+            hit = abs(change) >= threshold
+        elif rule_type == "price_above":
+            hit = previous < threshold <= price
+        elif rule_type == "price_below":
+            hit = price <= threshold < previous
+        else:
+            hit = price < avg_cost and (avg_cost - price) / avg_cost * 100 >= threshold
+        if hit:
+            fired.append(rule_id)
+    return fired
+
+
+def index_rules(index, ticks):
+    """규칙 인덱스: 종목별 이진 탐색"""
+    index._last_price.clear()  # 매 반복 전일 종가 기준으로 돌파 판단
+    fired = []
+    for ticker, price, previous, change, avg_cost in ticks:
+        fired += index.evaluate(ticker, price, previous, change, avg_cost)
+    return fired
+
+
+def bench(fn, *args, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, sorted(timings)[len(timings) // 2] * 1000
+
+
+def main():
+    n_rules = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    
+    rules, ticks = make_data(n_rules, n_tickers)
+    index = AlertRuleIndex(cooldown=timedelta(0))  # 재발동 금지 없이 매번 평가
+    start = time.perf_counter()
+    index.build(rules)
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    # 발동 규칙 일치 확인
+    expected = sorted(scan_rules(rules, ticks))
+    assert sorted(index_rules(index, ticks)) == expected
+    
+    print(f"규칙 수: {n_rules:,}  종목 수: {n_tickers:,}  반복: {repeat}  발동: {len(expected):,}")
+    print(f"  인덱스 생성 {build_ms:.2f} ms (규칙 추가/삭제시 1회)")
+    for label, fn, data in [
+        ("전체 순회", scan_rules, rules),
+        ("인덱스", index_rules, index),
+    ]:
+        best, median = bench(fn, data, ticks, repeat=repeat)
+        print(f"  {label:<10} best {best:8.2f} ms   median {median:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
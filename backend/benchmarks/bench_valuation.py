@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+보유 종목 평가 벤치마크: 기존 종목별 루프 vs NumPy 벡터 평가 엔진
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bench_valuation [종목 수] [반복 횟수]
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+
+from services.valuation import PortfolioValuation
+
+EXCHANGE_RATE = 1385.25
+
+
+def make_data(n: int):
+    """임의의 보유 현황 (Decimal, DB 컬럼과 동일) 과 시세 생성"""
+    rng = random.Random(42)
+    positions = {}
+    quotes = {}
+    for i in range(n):
+        ticker = f"T{i:05d}"
+        buy_shares = Decimal(rng.randint(1, 500))
+        price = Decimal(str(round(rng.uniform(5, 900), 2)))
+        positions[ticker] = {
+            "name": ticker,
+            "net_shares": buy_shares - Decimal(rng.randint(0, int(buy_shares) - 1)),
+            "buy_shares": buy_shares,
+            "cost_usd": buy_shares * price,
+            "cost_krw": buy_shares * price * Decimal("1320.50"),
+        }
+        quotes[ticker] = {
+            "current_price": float(price) * rng.uniform(0.7, 1.4),
+            "daily_change": rng.uniform(-5, 5),
+            "currency": "USD",
+        }
+    return positions, quotes
+
+
+def convert(amount: float, base: str, quote: str):
+    """기존 to_reporting_currency 와 같은 종목별 환율 조회 + 환산"""
+    if base.upper() == quote.upper():
+        return amount
+    return amount * EXCHANGE_RATE
+
+
+def loop_valuation(positions, quotes):
+    """기존 방식: 종목별 Decimal/float 혼합 연산 (vector_valuation 과 같은 필드 생성)"""
+    result = []
+    total_value = 0.0
+    total_cost = 0.0
+    for ticker, p in positions.items():
+        avg_price = float(p["cost_usd"] / p["buy_shares"]) if p["buy_shares"] > 0 else 0
+        quote = quotes.get(ticker, {})
+        current_price = quote.get("current_price")
+        cost_krw = float(p["cost_krw"])
+        value_krw = None
+        profit_pct = None
+        profit_krw = None
+        position_profit_pct = None
+        if current_price:
+            value_krw = convert(float(p["net_shares"]) * current_price, quote.get("currency", "USD"), "KRW")
+            profit_pct = ((current_price - avg_price) / avg_price * 100) if avg_price > 0 else 0
+            profit_krw = value_krw - cost_krw
+            position_profit_pct = (profit_krw / cost_krw * 100) if cost_krw > 0 else 0
+            total_value += value_krw
+        total_cost += cost_krw
+        result.append({
+            "ticker": ticker,
+            "name": p["name"],
+            "shares": float(p["net_shares"]),
+            "avg_price": avg_price,
+            "current_price": current_price,
+            "value_krw": value_krw,
+            "profit_pct": profit_pct,
+            "daily_change_pct": quote.get("daily_change"),
+            "profit_krw": profit_krw,
+            "position_profit_pct": position_profit_pct,
+            "reporting_currency": "KRW",
+        })
+    for row in result:
+        row["weight_pct"] = row["value_krw"] / total_value * 100 if row["value_krw"] else None
+    result.sort(key=lambda x: x["profit_pct"] if x["profit_pct"] is not None else -999, reverse=True)
+    return result, total_value, total_cost
+
+
+def vector_valuation(positions, quotes):
+    """NumPy 평가 엔진"""
+    valuation = PortfolioValuation(positions, quotes, {"USD": EXCHANGE_RATE}, "KRW")
+    return valuation.rows(), valuation.totals()
+
+
+def vector_compute(positions, quotes):
+    """NumPy 평가 엔진 (배열 변환 + 연산만, 결과 dict 생성 제외)"""
+    return PortfolioValuation(positions, quotes, {"USD": EXCHANGE_RATE}, "KRW").totals()
+
+
+def bench(fn, *args, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, sorted(timings)[len(timings) // 2] * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    
+    positions, quotes = make_data(n)
+    
+    # 평가 결과 일치 확인 (총 평가액)
+    _, loop_total, _ = loop_valuation(positions, quotes)
+    _, totals = vector_valuation(positions, quotes)
+    assert abs(loop_total - totals["total_value_krw"]) < 1e-3 * max(loop_total, 1)
+    
+    # NumPy 엔진은 float 로 변환된 보유 현황(get_positions 결과)을 입력으로 받는다
+    float_positions = {
+        t: {k: (float(v) if isinstance(v, Decimal) else v) for k, v in p.items()}
+        for t, p in positions.items()
+    }
+    
+    print(f"종목 수: {n:,}  반복: {repeat}")
+    for label, fn, data in [
+        ("loop (Decimal)", loop_valuation, positions),
+        ("numpy", vector_valuation, float_positions),
+        ("numpy (계산만)", vector_compute, float_positions),
+    ]:
+        best, median = bench(fn, data, quotes, repeat=repeat)
+        print(f"  {label:<16} best {best:8.2f} ms   median {median:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
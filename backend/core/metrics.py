@@ -0,0 +1,262 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from threading import Lock, Thread, current_thread, local
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: Any) -> str:
+    """레이블 값 이스케이프 (역슬래시, 따옴표, 줄바꿈)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    """Prometheus 레이블 문자열 ({a="x",b="y"})"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _ThreadShardedMetric(ABC):
+    """스레드별 집계 메트릭 기반 클래스
+    
+    값은 스레드마다 따로 두는 dict(shard)에 기록하므로 기록 경로에 잠금이
+    없다 (스레드당 첫 기록에서만 shard 등록). 수집할 때 shard 를 합치고,
+    종료된 스레드의 shard 는 누적값(retired)에 합쳐 정리한다.
+    """
+    
+    type = ""
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        """
+        Args:
+            name: 메트릭 이름
+            help: 설명
+            labels: 레이블 이름
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._local = local()
+        self._shards: List[Tuple[Thread, Dict[tuple, Any]]] = []
+        self._retired: Dict[tuple, Any] = {}
+        self._lock = Lock()
+    
+    def _shard(self) -> Dict[tuple, Any]:
+        """현재 스레드의 shard"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append((current_thread(), shard))
+            self._local.shard = shard
+        return shard
+    
+    @abstractmethod
+    def _merge(self, target: Dict[tuple, Any], shard: Dict[tuple, Any]):
+        """shard 값을 target 에 합침"""
+    
+    def collect(self) -> Dict[tuple, Any]:
+        """전 스레드 합계 {레이블 값: 값}"""
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = alive
+            
+            merged: Dict[tuple, Any] = {}
+            self._merge(merged, self._retired)
+            for _, shard in alive:
+                self._merge(merged, shard.copy())
+        return merged
+
+
+class Counter(_ThreadShardedMetric):
+    """누적 카운터"""
+    
+    type = "counter"
+    
+    def inc(self, *labels, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+    
+    def _merge(self, target, shard):
+        for key, value in shard.items():
+            target[key] = target.get(key, 0) + value
+    
+    def render(self) -> List[str]:
+        values = self.collect()
+        if not values and not self.labelnames:
+            values = {(): 0}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_ThreadShardedMetric):
+    """구간별 관측 수 히스토그램 (+ 합계)"""
+    
+    type = "histogram"
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            name: 메트릭 이름
+            help: 설명
+            labels: 레이블 이름
+            buckets: 구간 상한 (오름차순, +Inf 는 자동 추가)
+        """
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # [구간별 관측 수..., +Inf 구간, 합계]
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+    
+    def _merge(self, target, shard):
+        for key, entry in shard.items():
+            entry = list(entry)
+            current = target.get(key)
+            if current is None:
+                target[key] = entry
+            else:
+                target[key] = [a + b for a, b in zip(current, entry)]
+    
+    def render(self) -> List[str]:
+        lines = []
+        for key, entry in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), entry):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(entry[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """수집 시점에 함수를 호출해 값을 읽는 메트릭 (게이지, 기존 통계 노출용)"""
+    
+    def __init__(self, name: str, help: str, type: str, fn: Callable[[], Any], labels: Sequence[str] = ()):
+        """
+        Args:
+            name: 메트릭 이름
+            help: 설명
+            type: gauge | counter
+            fn: 값 (레이블이 있으면 {레이블 값 tuple: 값}) 을 반환하는 함수
+            labels: 레이블 이름
+        """
+        self.name = name
+        self.help = help
+        self.type = type
+        self.fn = fn
+        self.labelnames = tuple(labels)
+    
+    def render(self) -> List[str]:
+        value = self.fn()
+        if value is None:
+            return []
+        if not isinstance(value, dict):
+            value = {(): value}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in sorted(value.items())
+            if v is not None
+        ]
+
+
+class MetricsRegistry:
+    """메트릭 목록과 Prometheus 텍스트 형식 출력"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = Lock()
+    
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+    
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+    
+    def callback(self, name: str, help: str, type: str, fn: Callable[[], Any], labels: Sequence[str] = ()) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, type, fn, labels))
+    
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 공용 메트릭 (워커 프로세스마다 따로 집계)
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "API 요청 처리 시간 (라우트별)", ("method", "route", "status")
+)
+upstream_requests = metrics.counter(
+    "upstream_requests_total", "시세/환율 제공자 호출 수", ("provider", "operation")
+)
+upstream_errors = metrics.counter(
+    "upstream_errors_total", "시세/환율 제공자 호출 실패 수", ("provider", "operation")
+)
+upstream_duration = metrics.histogram(
+    "upstream_request_duration_seconds", "시세/환율 제공자 호출 시간", ("provider", "operation")
+)
+fx_cache_requests = metrics.counter(
+    "fx_cache_requests_total", "환율표 조회 (hit: 유효, stale: 백그라운드 갱신, miss: 호출 대기)", ("result",)
+)
+price_scan_duration = metrics.histogram(
+    "price_scan_duration_seconds", "가격 변동 체크(check_price_changes) 1회 소요 시간",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+quote_fetch_per_ticker = metrics.histogram(
+    "quote_fetch_seconds_per_ticker", "시세 배치 조회 시간 / 배치 종목 수",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+db_query_duration = metrics.histogram(
+    "db_query_duration_seconds", "SQL 문 실행 시간",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+db_slow_queries = metrics.counter(
+    "db_slow_queries_total", "SQL_SLOW_QUERY_MS 를 넘은 SQL 문 수"
+)
+db_repeated_queries = metrics.counter(
+    "db_repeated_queries_total", "요청 1건에서 같은 SQL 을 SQL_REPEAT_THRESHOLD 번 넘게 실행한 경우 (N+1 의심)"
+)
+email_send_duration = metrics.histogram(
+    "email_send_duration_seconds", "알림 메일 발송 시간 (재연결 포함)", ("result",)
+)
@@ -0,0 +1,79 @@
+from collections import Counter
+from datetime import datetime
+from threading import Event, Thread, get_ident
+from typing import Callable, Iterable, Optional
+import os
+import re
+import sys
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """스택 샘플링 프로파일러 (요청 1건 단위, 외부 의존성 없음)
+    
+    백그라운드 스레드가 interval 마다 대상 스레드의 현재 스택을 읽어
+    같은 스택의 샘플 수를 센다. 결과는 collapsed stack 형식
+    (`a.py:f;b.py:g 12`)으로 저장해 speedscope / flamegraph.pl 로 볼 수 있다.
+    """
+    
+    def __init__(self, threads: Callable[[], Iterable[int]], interval: float):
+        """
+        Args:
+            threads: 샘플링할 스레드 id 를 반환하는 함수 (요청 중 늘어날 수 있음)
+            interval: 샘플링 간격 (초)
+        """
+        self.threads = threads
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+    
+    def _sample(self):
+        frames = sys._current_frames()
+        own = get_ident()
+        for thread_id in list(self.threads()):
+            frame = frames.get(thread_id)
+            if frame is None or thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+        self.sample_count += 1
+    
+    def start(self):
+        def loop():
+            while not self._stop_event.wait(self.interval):
+                self._sample()
+        
+        self._thread = Thread(target=loop, name="request-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def collapsed(self) -> str:
+        """collapsed stack 형식 (샘플 많은 순)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+    
+    def save(self, directory: str, method: str, path: str) -> str:
+        """프로파일 파일 저장
+        
+        Returns:
+            저장한 파일 이름
+        """
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        filename = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{method.lower()}-{slug}.txt"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        return filename
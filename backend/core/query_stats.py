@@ -0,0 +1,136 @@
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List
+import re
+import logging
+
+from core.config import settings
+from core.metrics import metrics, db_query_duration, db_slow_queries, db_repeated_queries
+from core.timing import current, record_query
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\?")
+_PARAM_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_ROW_LIST = re.compile(r"(\(\?\.\.\.\))(?:, \(\?\.\.\.\))+")
+
+# 문장 표시 길이 (로그/진단)
+_DISPLAY_LENGTH = 300
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """SQL 문 정규화 (리터럴/바인드 파라미터 -> ?, IN 목록/다중 VALUES 축약, 공백 정리)
+    
+    값만 다른 같은 모양의 쿼리는 같은 fingerprint 가 된다.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(?...)", normalized)
+    return _ROW_LIST.sub(r"\1...", normalized)
+
+
+def _short(text: str) -> str:
+    return text if len(text) <= _DISPLAY_LENGTH else text[:_DISPLAY_LENGTH] + "..."
+
+
+class QueryStats:
+    """SQL 실행 통계 (fingerprint 별 횟수/누적/최대 시간, 느린 쿼리 로그)
+    
+    SQLAlchemy cursor 실행 이벤트에서 record 를 호출한다. 요청 중이면 요청별
+    fingerprint 횟수도 함께 기록해 요청이 끝날 때 N+1 패턴을 경고한다.
+    """
+    
+    def __init__(self, slow_threshold: float, repeat_threshold: int, max_fingerprints: int = 500):
+        """
+        Args:
+            slow_threshold: 느린 쿼리 기준 (초)
+            repeat_threshold: 요청당 같은 fingerprint 허용 횟수 (초과시 N+1 경고)
+            max_fingerprints: 통계를 따로 두는 최대 fingerprint 수 (이후는 "other")
+        """
+        self.slow_threshold = slow_threshold
+        self.repeat_threshold = repeat_threshold
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, List[float]] = {}  # fingerprint -> [횟수, 누적 시간, 최대 시간]
+        self._lock = Lock()
+        self.queries = 0
+        self.slow_queries = 0
+        self.repeated = 0
+    
+    def record(self, statement: str, seconds: float):
+        """쿼리 1회 기록"""
+        key = fingerprint(statement)
+        db_query_duration.observe(seconds)
+        record_query(key, seconds)
+        
+        with self._lock:
+            self.queries += 1
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    key = "other"
+                entry = self._stats.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+        
+        if seconds >= self.slow_threshold:
+            with self._lock:
+                self.slow_queries += 1
+            db_slow_queries.inc()
+            timings = current()
+            where = f" [{timings.label}]" if timings is not None and timings.label else ""
+            logger.warning(f"Slow query {seconds * 1000:.0f}ms{where}: {_short(_WHITESPACE.sub(' ', statement))}")
+    
+    def check_repeated(self, timings) -> int:
+        """요청 1건에서 같은 fingerprint 를 repeat_threshold 번 넘게 실행했으면 경고
+        
+        Returns:
+            경고한 fingerprint 수
+        """
+        repeated = timings.repeated_queries(self.repeat_threshold)
+        for key, count, seconds in repeated:
+            logger.warning(
+                f"Possible N+1: {timings.label} ran the same query {count} times "
+                f"({seconds * 1000:.1f}ms): {_short(key)}"
+            )
+        if repeated:
+            with self._lock:
+                self.repeated += len(repeated)
+            db_repeated_queries.inc(amount=len(repeated))
+        return len(repeated)
+    
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """누적 통계 (누적 시간 상위 fingerprint)"""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1][1], reverse=True)[:top]
+            return {
+                "queries": self.queries,
+                "slow_queries": self.slow_queries,
+                "repeated_query_warnings": self.repeated,
+                "fingerprints": len(self._stats),
+                "top": [
+                    {
+                        "fingerprint": _short(key),
+                        "count": count,
+                        "total_ms": round(total * 1000, 1),
+                        "avg_ms": round(total / count * 1000, 2),
+                        "max_ms": round(longest * 1000, 1),
+                    }
+                    for key, (count, total, longest) in items
+                ],
+            }
+
+
+# 프로세스 공용 SQL 통계
+query_stats = QueryStats(
+    slow_threshold=settings.SQL_SLOW_QUERY_MS / 1000,
+    repeat_threshold=settings.SQL_REPEAT_THRESHOLD
+)
+
+metrics.callback("db_queries_total", "실행한 SQL 문 수", "counter", lambda: query_stats.queries)
@@ -0,0 +1,133 @@
+from contextvars import ContextVar
+from threading import Lock, get_ident
+from typing import Dict, List, Optional, Set, Tuple
+import time
+
+# 현재 요청의 구간별 시간 (요청이 아닌 스레드에서는 None)
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+# Server-Timing 구간 설명 (HTTP 헤더라 ASCII)
+PHASE_DESCRIPTIONS = {
+    "db": "SQL",
+    "market": "Market data",
+    "fx": "FX rates",
+    "app": "Application",
+    "serialize": "Serialization",
+    "total": "Total",
+}
+
+
+class RequestTimings:
+    """요청 1건의 구간별 소요 시간 (Server-Timing 헤더용)
+    
+    요청 컨텍스트(contextvars)에 담겨 스레드 풀로 넘어간 작업에서도 같은
+    객체에 기록된다. 병렬로 실행된 구간은 합산되므로 전체 시간보다 클 수 있다.
+    """
+    
+    __slots__ = ("label", "started", "endpoint_done", "phases", "queries", "threads", "_lock")
+    
+    def __init__(self, label: str = ""):
+        """
+        Args:
+            label: 로그 표시용 요청 이름 (예: "GET /api/v1/holdings/")
+        """
+        self.label = label
+        self.started = time.perf_counter()
+        self.endpoint_done: Optional[float] = None
+        self.phases: Dict[str, List[float]] = {}  # 구간 -> [누적 시간(초), 횟수]
+        self.queries: Dict[str, List[float]] = {}  # SQL fingerprint -> [횟수, 누적 시간(초)]
+        self.threads: Set[int] = {get_ident()}  # 요청을 처리한 스레드 (프로파일러 샘플 대상)
+        self._lock = Lock()
+    
+    def add(self, phase: str, seconds: float):
+        with self._lock:
+            entry = self.phases.get(phase)
+            if entry is None:
+                self.phases[phase] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+    
+    def add_query(self, fingerprint: str, seconds: float):
+        with self._lock:
+            entry = self.queries.get(fingerprint)
+            if entry is None:
+                self.queries[fingerprint] = [1, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+    
+    def repeated_queries(self, threshold: int) -> List[Tuple[str, int, float]]:
+        """threshold 번 넘게 실행한 SQL [(fingerprint, 횟수, 누적 시간), ...] (횟수 많은 순)"""
+        with self._lock:
+            repeated = [
+                (fingerprint, int(count), seconds)
+                for fingerprint, (count, seconds) in self.queries.items()
+                if count > threshold
+            ]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+    
+    def server_timing(self, finished: float) -> str:
+        """Server-Timing 헤더 값
+        
+        app 은 엔드포인트 실행 시간에서 SQL/시세/환율 시간을 뺀 나머지,
+        serialize 는 엔드포인트 반환 ~ 응답 시작 (응답 모델 검증/JSON 변환).
+        """
+        total = finished - self.started
+        endpoint_done = self.endpoint_done or finished
+        with self._lock:
+            phases = {phase: list(entry) for phase, entry in self.phases.items()}
+        
+        measured = sum(seconds for seconds, _ in phases.values())
+        phases["app"] = [max(endpoint_done - self.started - measured, 0.0), 0]
+        phases["serialize"] = [finished - endpoint_done, 0]
+        phases["total"] = [total, 0]
+        
+        parts = []
+        for phase, (seconds, count) in phases.items():
+            desc = PHASE_DESCRIPTIONS.get(phase, phase)
+            if count:
+                desc = f"{desc} ({count})"
+            parts.append(f'{phase};dur={seconds * 1000:.1f};desc="{desc}"')
+        return ", ".join(parts)
+
+
+def start_request(label: str = "") -> RequestTimings:
+    """현재 컨텍스트에서 요청 측정 시작"""
+    timings = RequestTimings(label)
+    _current.set(timings)
+    return timings
+
+
+def current() -> Optional[RequestTimings]:
+    """현재 요청의 측정 객체 (요청 밖이면 None)"""
+    return _current.get()
+
+
+def record_phase(phase: str, seconds: float):
+    """현재 요청에 구간 시간 추가 (요청 밖에서는 무시)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def record_query(fingerprint: str, seconds: float):
+    """현재 요청에 SQL 1회 추가 (db 구간 + fingerprint 별 횟수)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add("db", seconds)
+        timings.add_query(fingerprint, seconds)
+
+
+def mark_endpoint_done():
+    """엔드포인트 함수 반환 시각 기록 (이후는 직렬화 구간)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_done = time.perf_counter()
+
+
+def register_thread():
+    """현재 스레드를 요청 처리 스레드로 등록 (스레드 풀 작업용)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.threads.add(get_ident())
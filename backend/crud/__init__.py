@@ -1,6 +1,13 @@
+from crud import position
 from crud import holdings
+from crud import exchange_rate
+from crud import price_history
+from crud import portfolio_history
+from crud import price_snapshot
 from crud import transaction
 from crud import portfolio
 from crud import alert
+from crud import alert_outbox
+from crud import alert_rule
 
-__all__ = ["holdings", "transaction", "portfolio", "alert"]
+__all__ = ["position", "holdings", "exchange_rate", "price_history", "portfolio_history", "price_snapshot", "transaction", "portfolio", "alert", "alert_outbox", "alert_rule"]
@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func
+from datetime import datetime
+from typing import Dict, List
 import logging
 
 from models import Alerts
@@ -44,6 +46,49 @@ def get_alerts_by_ticker(
     ).limit(limit).all()
 
 
+def get_alerts_after(db: Session, after_id: int, limit: int = 100) -> List[Alerts]:
+    """id 가 after_id 보다 큰 알림 (오래된 순, 실시간 스트림용)
+    
+    Args:
+        db: 데이터베이스 세션
+        after_id: 마지막으로 확인한 알림 id
+        limit: 최대 조회 개수
+        
+    Returns:
+        알림 내역 리스트
+    """
+    return db.query(Alerts).filter(
+        Alerts.id > after_id
+    ).order_by(Alerts.id).limit(limit).all()
+
+
+def get_last_alert_id(db: Session) -> int:
+    """가장 최근 알림 id (없으면 0)"""
+    return db.query(func.max(Alerts.id)).scalar() or 0
+
+
+def get_last_alert_times(db: Session, since: datetime) -> Dict[str, datetime]:
+    """종목별 마지막 알림 시각 (GROUP BY 쿼리 1회, 중복 방지 인덱스 적재용)
+    
+    전역 임계값 알림만 대상이다 (규칙 알림은 규칙별 재발동 금지 기간을 따름).
+    
+    Args:
+        db: 데이터베이스 세션
+        since: 이 시각 이후 알림만 조회
+        
+    Returns:
+        {ticker: 마지막 발송 시각}
+    """
+    rows = db.query(
+        Alerts.ticker, func.max(Alerts.sent_at)
+    ).filter(
+        Alerts.sent_at >= since,
+        Alerts.rule_id.is_(None)
+    ).group_by(Alerts.ticker).all()
+    
+    return {ticker: sent_at for ticker, sent_at in rows}
+
+
 def get_alert_count(db: Session, ticker: str = None) -> int:
     """알림 개수 조회
     
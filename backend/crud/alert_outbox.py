@@ -0,0 +1,193 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import pytz
+import logging
+
+from models import Alerts, AlertOutbox
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+class PendingAlert(NamedTuple):
+    """대기열에 기록할 알림 (rule_*: 알림 규칙으로 발동한 경우만)"""
+    ticker: str
+    change_percent: float
+    price: float
+    rule_id: Optional[int] = None
+    rule_type: Optional[str] = None
+    threshold: Optional[float] = None
+
+
+def enqueue_alerts(db: Session, alerts: Iterable[PendingAlert], commit: bool = True) -> int:
+    """발송할 알림을 대기열에 일괄 기록 (INSERT 1회)
+    
+    Args:
+        db: 데이터베이스 세션
+        alerts: [PendingAlert, ...] (규칙 알림은 규칙마다 1건)
+        commit: 커밋 여부
+        
+    Returns:
+        기록된 알림 수
+    """
+    now = datetime.now(pytz.UTC)
+    rows = [
+        {
+            **PendingAlert(*alert)._asdict(),
+            "status": PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        }
+        for alert in alerts
+    ]
+    if not rows:
+        return 0
+    
+    db.execute(insert(AlertOutbox), rows)
+    if commit:
+        db.commit()
+    
+    logger.info(f"Queued {len(rows)} alerts")
+    return len(rows)
+
+
+def claim_due(db: Session, limit: int) -> List[AlertOutbox]:
+    """발송 시각이 된 대기 알림 조회 (오래된 순, 다른 워커가 잡은 행은 건너뜀)
+    
+    Args:
+        db: 데이터베이스 세션
+        limit: 최대 조회 개수
+        
+    Returns:
+        AlertOutbox 리스트 (트랜잭션 종료 전까지 행 잠금)
+    """
+    return db.query(AlertOutbox).filter(
+        AlertOutbox.status == PENDING,
+        AlertOutbox.next_attempt_at <= datetime.now(pytz.UTC)
+    ).order_by(
+        AlertOutbox.id
+    ).limit(limit).with_for_update(skip_locked=True).all()
+
+
+def mark_sent(db: Session, entries: List[AlertOutbox], sent_at: datetime, commit: bool = True):
+    """발송 완료 처리 (알림 기록 저장, 같은 트랜잭션)"""
+    db.add_all([
+        Alerts(
+            ticker=entry.ticker,
+            change_percent=entry.change_percent,
+            price=entry.price,
+            rule_id=entry.rule_id,
+            rule_type=entry.rule_type,
+            threshold=entry.threshold,
+            sent_at=sent_at
+        )
+        for entry in entries
+    ])
+    for entry in entries:
+        entry.status = SENT
+        entry.attempts += 1
+        entry.sent_at = sent_at
+        entry.last_error = None
+    if commit:
+        db.commit()
+
+
+def mark_failed(
+    db: Session,
+    entries: List[AlertOutbox],
+    error: str,
+    base_backoff: float,
+    max_backoff: float,
+    max_attempts: int,
+    commit: bool = True
+) -> int:
+    """발송 실패 처리 (지수 백오프로 재시도 예약, 최대 시도 초과시 failed)
+    
+    Args:
+        db: 데이터베이스 세션
+        entries: 실패한 알림
+        error: 오류 내용
+        base_backoff: 첫 재시도 대기 (초, 실패마다 2배)
+        max_backoff: 최대 재시도 대기 (초)
+        max_attempts: 최대 시도 횟수
+        commit: 커밋 여부
+        
+    Returns:
+        포기(failed)한 알림 수
+    """
+    now = datetime.now(pytz.UTC)
+    given_up = 0
+    for entry in entries:
+        entry.attempts += 1
+        entry.last_error = error[:500]
+        if entry.attempts >= max_attempts:
+            entry.status = FAILED
+            given_up += 1
+        else:
+            backoff = min(base_backoff * 2 ** (entry.attempts - 1), max_backoff)
+            entry.next_attempt_at = now + timedelta(seconds=backoff)
+    if commit:
+        db.commit()
+    return given_up
+
+
+def get_last_enqueued_times(db: Session, since: datetime) -> Dict[str, datetime]:
+    """종목별 마지막 대기열 기록 시각 (발송 전 알림도 중복 방지에 포함)
+    
+    전역 임계값 알림만 대상이다 (규칙 알림은 규칙별 재발동 금지 기간을 따름).
+    
+    Args:
+        db: 데이터베이스 세션
+        since: 이 시각 이후 기록만 조회
+        
+    Returns:
+        {ticker: 마지막 기록 시각}
+    """
+    rows = db.query(
+        AlertOutbox.ticker, func.max(AlertOutbox.created_at)
+    ).filter(
+        AlertOutbox.created_at >= since,
+        AlertOutbox.status != FAILED,
+        AlertOutbox.rule_id.is_(None)
+    ).group_by(AlertOutbox.ticker).all()
+    
+    return {ticker: created_at for ticker, created_at in rows}
+
+
+def get_status_counts(db: Session) -> Dict[str, int]:
+    """상태별 알림 수"""
+    rows = db.query(
+        AlertOutbox.status, func.count(AlertOutbox.id)
+    ).group_by(AlertOutbox.status).all()
+    
+    counts = {PENDING: 0, SENT: 0, FAILED: 0}
+    counts.update({status: count for status, count in rows})
+    return counts
+
+
+def delete_sent(db: Session, days: int = 7) -> int:
+    """발송 완료 후 보관 기간이 지난 행 삭제
+    
+    Args:
+        db: 데이터베이스 세션
+        days: 보관 기간 (일)
+        
+    Returns:
+        삭제된 행 수
+    """
+    cutoff = datetime.now(pytz.UTC) - timedelta(days=days)
+    
+    deleted_count = db.query(AlertOutbox).filter(
+        AlertOutbox.status == SENT,
+        AlertOutbox.sent_at < cutoff
+    ).delete(synchronize_session=False)
+    
+    db.commit()
+    logger.info(f"Deleted {deleted_count} delivered outbox rows (older than {days} days)")
+    return deleted_count
@@ -0,0 +1,87 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, update
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+import logging
+
+from models import AlertRules
+
+logger = logging.getLogger(__name__)
+
+
+def get_rules(db: Session, ticker: Optional[str] = None) -> List[AlertRules]:
+    """알림 규칙 조회
+    
+    Args:
+        db: 데이터베이스 세션
+        ticker: 특정 종목만 조회 (옵션)
+        
+    Returns:
+        AlertRules 리스트 (종목, id 순)
+    """
+    query = db.query(AlertRules)
+    if ticker:
+        query = query.filter(AlertRules.ticker == ticker.upper())
+    return query.order_by(AlertRules.ticker, AlertRules.id).all()
+
+
+def get_rules_signature(db: Session) -> Tuple[int, Optional[datetime]]:
+    """규칙 변경 감지용 (개수, 최근 변경 시각)
+    
+    추가는 최근 변경 시각을, 삭제는 개수를 바꾼다. 삭제 후 추가로 개수가
+    같아져도 새 규칙의 변경 시각이 더 늦다 (SQLite 가 삭제된 최대 id 를
+    다시 써도 감지됨).
+    """
+    return tuple(db.query(func.count(AlertRules.id), func.max(AlertRules.updated_at)).one())
+
+
+def create_rule(db: Session, ticker: str, rule_type: str, threshold: float) -> AlertRules:
+    """알림 규칙 생성
+    
+    Args:
+        db: 데이터베이스 세션
+        ticker: 종목 심볼
+        rule_type: pct_move | price_above | price_below | drawdown
+        threshold: 기준값 (% 또는 가격)
+        
+    Returns:
+        생성된 AlertRules 객체
+    """
+    rule = AlertRules(ticker=ticker.upper(), rule_type=rule_type, threshold=threshold)
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    
+    logger.info(f"Created alert rule: {rule}")
+    return rule
+
+
+def delete_rule(db: Session, rule_id: int) -> bool:
+    """알림 규칙 삭제
+    
+    Returns:
+        삭제 성공 여부
+    """
+    deleted = db.query(AlertRules).filter(AlertRules.id == rule_id).delete()
+    db.commit()
+    return bool(deleted)
+
+
+def mark_triggered(db: Session, rule_ids: Iterable[int], triggered_at: datetime, commit: bool = True) -> int:
+    """발동한 규칙의 마지막 발동 시각 일괄 갱신 (UPDATE 1회)
+    
+    Returns:
+        갱신된 규칙 수
+    """
+    rule_ids = list(rule_ids)
+    if not rule_ids:
+        return 0
+    
+    db.execute(
+        update(AlertRules)
+        .where(AlertRules.id.in_(rule_ids))
+        .values(last_triggered_at=triggered_at)
+    )
+    if commit:
+        db.commit()
+    return len(rule_ids)
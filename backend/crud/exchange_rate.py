@@ -0,0 +1,123 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from models import ExchangeRates
+
+logger = logging.getLogger(__name__)
+
+# 직전 영업일 환율 탐색 범위 (연휴 포함)
+MAX_LOOKBACK_DAYS = 7
+
+
+def get_rate_on(
+    db: Session,
+    on_date: date,
+    currency: str = "KRW"
+) -> Optional[float]:
+    """특정 날짜의 환율 조회 (해당일이 휴일이면 직전 영업일 환율)
+    
+    (currency, rate_date) 인덱스를 역순으로 한 건만 읽으므로 O(log n).
+    
+    Args:
+        db: 데이터베이스 세션
+        on_date: 조회 날짜
+        currency: 통화 코드 (USD 1단위당)
+        
+    Returns:
+        환율 또는 None (MAX_LOOKBACK_DAYS 이내 기록 없음)
+    """
+    row = db.query(ExchangeRates.rate).filter(
+        ExchangeRates.currency == currency.upper(),
+        ExchangeRates.rate_date <= on_date,
+        ExchangeRates.rate_date > on_date - timedelta(days=MAX_LOOKBACK_DAYS)
+    ).order_by(
+        ExchangeRates.rate_date.desc()
+    ).limit(1).first()
+    
+    return float(row.rate) if row else None
+
+
+def get_rates_on(
+    db: Session,
+    dates: Iterable[date],
+    currency: str = "KRW"
+) -> Dict[date, Optional[float]]:
+    """여러 날짜의 환율 일괄 조회 (쿼리 1회)
+    
+    필요한 기간의 환율을 한 번에 읽은 뒤 날짜별로 이진 탐색한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        dates: 조회 날짜 목록
+        currency: 통화 코드
+        
+    Returns:
+        {날짜: 환율 또는 None}
+    """
+    dates = set(dates)
+    if not dates:
+        return {}
+    
+    rows = db.query(ExchangeRates.rate_date, ExchangeRates.rate).filter(
+        ExchangeRates.currency == currency.upper(),
+        ExchangeRates.rate_date <= max(dates),
+        ExchangeRates.rate_date > min(dates) - timedelta(days=MAX_LOOKBACK_DAYS)
+    ).order_by(ExchangeRates.rate_date).all()
+    
+    rate_dates = [r.rate_date for r in rows]
+    rates = [float(r.rate) for r in rows]
+    
+    result = {}
+    for d in dates:
+        i = bisect_right(rate_dates, d) - 1
+        if i >= 0 and (d - rate_dates[i]).days < MAX_LOOKBACK_DAYS:
+            result[d] = rates[i]
+        else:
+            result[d] = None
+    return result
+
+
+def bulk_upsert_rates(db: Session, rows: List[dict]) -> int:
+    """환율 기록 일괄 저장 (같은 통화/날짜는 덮어씀)
+    
+    Args:
+        db: 데이터베이스 세션
+        rows: [{"currency": "KRW", "rate_date": date, "rate": 1320.5}, ...]
+        
+    Returns:
+        저장된 행 수
+    """
+    if not rows:
+        return 0
+    
+    # 같은 키가 여러 번 나오면 마지막 값 사용
+    incoming = {
+        (r["currency"].upper(), r["rate_date"]): float(r["rate"])
+        for r in rows
+    }
+    currencies = {currency for currency, _ in incoming}
+    all_dates = [d for _, d in incoming]
+    
+    existing = db.query(ExchangeRates).filter(
+        ExchangeRates.currency.in_(currencies),
+        ExchangeRates.rate_date.between(min(all_dates), max(all_dates))
+    ).all()
+    
+    for record in existing:
+        key = (record.currency, record.rate_date)
+        if key in incoming:
+            record.rate = incoming.pop(key)
+    
+    if incoming:
+        db.execute(insert(ExchangeRates), [
+            {"currency": currency, "rate_date": rate_date, "rate": rate}
+            for (currency, rate_date), rate in incoming.items()
+        ])
+    
+    db.commit()
+    logger.info(f"Stored {len(rows)} historical exchange rates")
+    return len(rows)
@@ -1,11 +1,16 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional
+from typing import Dict, List, Optional
 import logging
 
+from core.config import settings
 from models import Holdings, Transactions
+from crud.position import get_positions
+from crud import portfolio_history as portfolio_history_crud
+from crud import price_snapshot as price_snapshot_crud
 from services.stock_service import StockService
 from services.forex_service import ForexService
+from services.valuation import PortfolioValuation
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +18,47 @@ stock_service = StockService()
 forex_service = ForexService()
 
 
+def resolve_price_source(price_source: Optional[str] = None) -> str:
+    """시세 출처 결정 (요청 값 > PRICE_SOURCE 설정)"""
+    return (price_source or settings.PRICE_SOURCE).lower()
+
+
+def value_positions(
+    db: Session,
+    positions: Dict[str, dict],
+    price_source: Optional[str] = None
+) -> PortfolioValuation:
+    """보유 현황을 현재가/환율로 평가 (시세 일괄 조회 + 벡터 연산)
+    
+    Args:
+        db: 데이터베이스 세션
+        positions: crud.position.get_positions 결과 (currency 포함)
+        price_source: live (yfinance) 또는 snapshot (price_snapshots 테이블만 사용,
+                      네트워크 호출 없음). 생략시 PRICE_SOURCE 설정
+                      
+    Returns:
+        PortfolioValuation (보고 통화 기준)
+    """
+    # 종목 거래 통화는 holdings.currency 기준 (시세 응답에는 통화가 없음)
+    trade_currencies = {ticker: position["currency"] for ticker, position in positions.items()}
+    if resolve_price_source(price_source) == "snapshot":
+        quotes = price_snapshot_crud.get_snapshot_quotes(db, positions.keys())
+        for ticker, quote in quotes.items():
+            quote["currency"] = trade_currencies.get(ticker, quote["currency"])
+    else:
+        quotes = stock_service.get_quotes(positions.keys(), trade_currencies)
+    reporting_currency = settings.REPORTING_CURRENCY
+    
+    # 통화별 환율은 한 번씩만 조회
+    currencies = {quote.get('currency', 'USD') for quote in quotes.values()} | {'USD'}
+    fx_rates = {
+        currency: forex_service.get_rate(currency, reporting_currency)
+        for currency in currencies
+    }
+    
+    return PortfolioValuation(positions, quotes, fx_rates, reporting_currency)
+
+
 def get_holding_by_ticker(db: Session, ticker: str) -> Optional[Holdings]:
     """티커로 종목 조회
     
@@ -26,18 +72,19 @@ def get_holding_by_ticker(db: Session, ticker: str) -> Optional[Holdings]:
     return db.query(Holdings).filter(Holdings.ticker == ticker.upper()).first()
 
 
-def create_holding(db: Session, ticker: str, name: str) -> Holdings:
+def create_holding(db: Session, ticker: str, name: str, currency: Optional[str] = None) -> Holdings:
     """새 종목 생성
     
     Args:
         db: 데이터베이스 세션
         ticker: 종목 심볼
         name: 종목 이름
+        currency: 거래 통화 (모르면 None, 시작시 backfill_currencies 가 채움)
         
     Returns:
         생성된 Holdings 객체
     """
-    holding = Holdings(ticker=ticker.upper(), name=name)
+    holding = Holdings(ticker=ticker.upper(), name=name, currency=currency)
     db.add(holding)
     db.commit()
     db.refresh(holding)
@@ -59,91 +106,71 @@ def get_or_create_holding(db: Session, ticker: str) -> Holdings:
     holding = get_holding_by_ticker(db, ticker)
     
     if not holding:
-        # yfinance에서 종목 정보 조회
+        # yfinance에서 종목 정보 조회 (이름, 거래 통화)
         stock_info = stock_service.get_stock_info(ticker)
         name = stock_info.get('name', ticker)
-        holding = create_holding(db, ticker, name)
+        holding = create_holding(db, ticker, name, stock_info.get('currency'))
     
     return holding
 
 
-def get_all_holdings_with_stats(db: Session) -> List[dict]:
+def backfill_currencies(db: Session) -> int:
+    """거래 통화가 비어 있는 종목의 통화를 종목 정보로 채움
+    
+    currency 컬럼 추가 전에 만든 종목과 생성 당시 종목 정보 조회에 실패한
+    종목이 대상이다. 이번에도 조회에 실패한 종목은 다음 시작시 다시 시도한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        
+    Returns:
+        통화를 채운 종목 수
+    """
+    filled = 0
+    for holding in db.query(Holdings).filter(Holdings.currency.is_(None)).all():
+        currency = stock_service.get_stock_info(holding.ticker).get('currency')
+        if currency:
+            holding.currency = currency.upper()
+            filled += 1
+    
+    if filled:
+        db.commit()
+        logger.info(f"Backfilled currency for {filled} holdings")
+    return filled
+
+
+def get_all_holdings_with_stats(db: Session, price_source: Optional[str] = None) -> List[dict]:
     """모든 보유 종목 + 통계 정보 조회
     
     Args:
         db: 데이터베이스 세션
+        price_source: 시세 출처 (live/snapshot, 생략시 설정값)
         
     Returns:
         종목별 상세 정보 리스트
     """
-    holdings = db.query(Holdings).all()
-    exchange_rate = forex_service.get_usd_to_krw()
-    
-    result = []
-    
-    for holding in holdings:
-        # 총 보유 수량 계산 (매수 - 매도)
-        total_shares = db.query(
-            func.sum(
-                func.case(
-                    (Transactions.type == 'BUY', Transactions.shares),
-                    else_=-Transactions.shares
-                )
-            )
-        ).filter(Transactions.ticker == holding.ticker).scalar() or 0
-        
-        # 보유 수량이 0 이하면 제외
-        if total_shares <= 0:
-            continue
-        
-        # 평균 매수가 계산
-        buy_transactions = db.query(Transactions).filter(
-            Transactions.ticker == holding.ticker,
-            Transactions.type == 'BUY'
-        ).all()
-        
-        if not buy_transactions:
-            continue
-        
-        total_cost = sum(t.shares * t.price_usd for t in buy_transactions)
-        total_buy_shares = sum(t.shares for t in buy_transactions)
-        avg_price = total_cost / total_buy_shares if total_buy_shares > 0 else 0
-        
-        # 현재가 조회
-        stock_info = stock_service.get_stock_info(holding.ticker)
-        current_price = stock_info.get('current_price')
-        daily_change = stock_info.get('daily_change')
-        
-        # 평가액 및 수익률 계산
-        value_krw = None
-        profit_pct = None
-        
-        if current_price and exchange_rate:
-            value_krw = float(total_shares) * current_price * exchange_rate
-            profit_pct = ((current_price - avg_price) / avg_price * 100) if avg_price > 0 else 0
-        
-        result.append({
-            "ticker": holding.ticker,
-            "name": holding.name or holding.ticker,
-            "shares": float(total_shares),
-            "avg_price": avg_price,
-            "current_price": current_price,
-            "value_krw": value_krw,
-            "profit_pct": profit_pct,
-            "daily_change_pct": daily_change
-        })
+    # 보유 수량이 0 이하이거나 매수 기록이 없는 종목은 제외
+    positions = {
+        ticker: position
+        for ticker, position in get_positions(db).items()
+        if position["net_shares"] > 0 and position["buy_shares"] > 0
+    }
     
-    # 수익률 높은 순으로 정렬
-    result.sort(key=lambda x: x['profit_pct'] if x['profit_pct'] is not None else -999, reverse=True)
-    return result
+    # 현재가 일괄 조회 후 일괄 평가 (수익률 높은 순 정렬)
+    return value_positions(db, positions, price_source).rows()
 
 
-def get_holding_detail(db: Session, ticker: str) -> Optional[dict]:
+def get_holding_detail(
+    db: Session,
+    ticker: str,
+    price_source: Optional[str] = None
+) -> Optional[dict]:
     """특정 종목 상세 정보 조회
     
     Args:
         db: 데이터베이스 세션
         ticker: 종목 심볼
+        price_source: 시세 출처 (live/snapshot, 생략시 설정값)
         
     Returns:
         종목 상세 정보 dict 또는 None
@@ -159,38 +186,18 @@ def get_holding_detail(db: Session, ticker: str) -> Optional[dict]:
         Transactions.ticker == ticker
     ).order_by(Transactions.transaction_time.desc()).all()
     
-    # 총 보유 수량
-    total_shares = db.query(
-        func.sum(
-            func.case(
-                (Transactions.type == 'BUY', Transactions.shares),
-                else_=-Transactions.shares
-            )
-        )
-    ).filter(Transactions.ticker == ticker).scalar() or 0
-    
-    # 평균 매수가
-    buy_transactions = [t for t in transactions if t.type == 'BUY']
-    total_cost = sum(t.shares * t.price_usd for t in buy_transactions)
-    total_buy_shares = sum(t.shares for t in buy_transactions)
-    avg_price = total_cost / total_buy_shares if total_buy_shares > 0 else 0
-    
-    # 현재가 조회
-    stock_info = stock_service.get_stock_info(ticker)
-    current_price = stock_info.get('current_price')
-    daily_change = stock_info.get('daily_change')
-    
-    # 평가액 및 손익
-    exchange_rate = forex_service.get_usd_to_krw()
-    value_krw = None
-    profit_pct = None
-    profit_krw = None
-    
-    if current_price and exchange_rate:
-        value_krw = float(total_shares) * current_price * exchange_rate
-        cost_krw = sum(t.shares * t.price_usd * t.exchange_rate for t in buy_transactions)
-        profit_krw = value_krw - cost_krw
-        profit_pct = (profit_krw / cost_krw * 100) if cost_krw > 0 else 0
+    # 보유 현황 평가
+    positions = get_positions(db, [ticker])
+    if ticker not in positions:
+        positions[ticker] = {
+            "name": holding.name or ticker,
+            "currency": holding.currency or "USD",
+            "net_shares": 0.0,
+            "buy_shares": 0.0,
+            "cost_usd": 0.0,
+            "cost_krw": 0.0,
+        }
+    valuation = value_positions(db, positions, price_source).rows()[0]
     
     # 거래 내역 변환
     transactions_data = []
@@ -203,19 +210,24 @@ def get_holding_detail(db: Session, ticker: str) -> Optional[dict]:
             "price_usd": float(t.price_usd),
             "exchange_rate": float(t.exchange_rate),
             "transaction_time": t.transaction_time,
-            "total_krw": float(t.shares * t.price_usd * t.exchange_rate)
+            "total_krw": float(t.shares * t.price_usd * t.exchange_rate),
+            "created_at": t.created_at
         })
     
     return {
         "ticker": ticker,
         "name": holding.name or ticker,
-        "current_price": current_price,
-        "daily_change_pct": daily_change,
-        "total_shares": float(total_shares),
-        "avg_price": avg_price,
-        "value_krw": value_krw,
-        "profit_pct": profit_pct,
-        "profit_krw": profit_krw,
+        "current_price": valuation["current_price"],
+        "daily_change_pct": valuation["daily_change_pct"],
+        "total_shares": valuation["shares"],
+        "avg_price": valuation["avg_price"],
+        "currency": valuation["currency"],
+        "value_krw": valuation["value_krw"],
+        "profit_pct": valuation["position_profit_pct"],
+        "profit_krw": valuation["profit_krw"],
+        "reporting_currency": valuation["reporting_currency"],
+        "price_source": resolve_price_source(price_source),
+        "price_as_of": valuation["price_as_of"],
         "transactions": transactions_data
     }
 
@@ -232,7 +244,13 @@ def delete_holding(db: Session, ticker: str) -> bool:
     """
     holding = get_holding_by_ticker(db, ticker)
     if holding:
+        first_trade = db.query(func.min(Transactions.transaction_time)).filter(
+            Transactions.ticker == holding.ticker
+        ).scalar()
         db.delete(holding)
+        db.flush()
+        if first_trade is not None:
+            portfolio_history_crud.recompute_from(db, first_trade.date(), commit=False)
         db.commit()
         logger.info(f"Deleted holding: {ticker}")
         return True
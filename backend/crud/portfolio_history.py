@@ -0,0 +1,243 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, text
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+from core.config import settings
+from models import Transactions, PortfolioHistory
+from services.forex_service import ForexService
+from crud import exchange_rate as exchange_rate_crud
+from crud import price_history as price_history_crud
+from utils.trading_calendar import nyse_calendar
+
+logger = logging.getLogger(__name__)
+
+forex_service = ForexService()
+
+# 재계산 시작일 이전 종가 탐색 범위 (이보다 오래된 종가는 마지막 거래 단가로 대체)
+CLOSE_LOOKBACK_DAYS = 14
+
+
+def _trading_days(start: date, end: date) -> Iterator[date]:
+    """start ~ end 사이의 NYSE 거래일 (휴장일은 기록하지 않음)"""
+    day = start
+    while day <= end:
+        if nyse_calendar.is_trading_day(day):
+            yield day
+        day += timedelta(days=1)
+
+
+def _last_trading_day(today: date) -> date:
+    """today 이전(포함) 마지막 NYSE 거래일"""
+    while not nyse_calendar.is_trading_day(today):
+        today -= timedelta(days=1)
+    return today
+
+
+def _close_on(series: Optional[Tuple[List[date], List[float]]], day: date) -> Optional[float]:
+    """해당일(휴장일이면 직전 거래일) 종가"""
+    if not series:
+        return None
+    dates, closes = series
+    i = bisect_right(dates, day) - 1
+    return closes[i] if i >= 0 else None
+
+
+def _lock_history(db: Session) -> None:
+    """일별 평가 재계산을 트랜잭션 끝까지 직렬화
+    
+    재계산은 시작일 이후 기록을 지우고 다시 넣으므로 두 요청이 동시에
+    돌면 나중 INSERT 가 먼저 커밋된 행과 충돌한다. PostgreSQL 은 트랜잭션
+    advisory lock 으로 한 번에 하나만 재계산하게 하고 (커밋/롤백시 해제),
+    잠금을 얻은 뒤 읽는 거래 내역에는 먼저 커밋된 거래가 포함된다.
+    SQLite 는 쓰기 트랜잭션이 DB 단위로 직렬화되므로 따로 잠그지 않는다.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": settings.HISTORY_LOCK_KEY})
+
+
+def recompute_from(
+    db: Session,
+    start_date: date,
+    end_date: Optional[date] = None,
+    commit: bool = True
+) -> int:
+    """start_date 이후의 일별 평가 기록 재계산
+    
+    거래 내역을 시간순으로 다시 적용하면서 NYSE 거래일마다 보유 수량, 로컬 종가,
+    일별 환율로 평가액/매입 비용/손익을 계산한다. 네트워크 호출은
+    과거 환율 기록이 없을 때의 현재 환율 조회뿐이다. 종가 기록이 없는
+    종목은 마지막 거래 단가로 평가한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        start_date: 재계산 시작일 (이전 기록은 유지)
+        end_date: 마지막 날짜 (기본: 오늘)
+        commit: 커밋 여부 (거래 쓰기와 같은 트랜잭션이면 False)
+        
+    Returns:
+        저장된 일자 수
+    """
+    end_date = end_date or date.today()
+    
+    _lock_history(db)
+    db.query(PortfolioHistory).filter(
+        PortfolioHistory.nav_date >= start_date
+    ).delete(synchronize_session=False)
+    
+    transactions = db.query(
+        Transactions.ticker,
+        Transactions.type,
+        Transactions.shares,
+        Transactions.price_usd,
+        Transactions.exchange_rate,
+        Transactions.transaction_time
+    ).order_by(Transactions.transaction_time, Transactions.id).all()
+    
+    days = []
+    if transactions:
+        first_date = transactions[0].transaction_time.date()
+        days = list(_trading_days(max(start_date, first_date), end_date))
+    
+    if not days:
+        if commit:
+            db.commit()
+        return 0
+    
+    reporting_currency = settings.REPORTING_CURRENCY.upper()
+    is_krw = reporting_currency == "KRW"
+    
+    # 재계산 구간 직전 종가부터 읽음 (연휴 포함)
+    closes = price_history_crud.get_close_series(
+        db,
+        {t.ticker for t in transactions},
+        days[0] - timedelta(days=CLOSE_LOOKBACK_DAYS),
+        end_date
+    )
+    if reporting_currency == "USD":
+        fx_rates = {}
+        current_rate = 1.0
+    else:
+        fx_rates = exchange_rate_crud.get_rates_on(db, days, reporting_currency)
+        current_rate = None
+        if not all(fx_rates.values()):
+            current_rate = forex_service.get_rate("USD", reporting_currency)
+    
+    # ticker -> [보유 수량, 매입 비용 USD, 매입 비용 KRW, 마지막 거래 단가]
+    state: Dict[str, list] = {}
+    i = 0
+    records = []
+    
+    for day in days:
+        while i < len(transactions) and transactions[i].transaction_time.date() <= day:
+            t = transactions[i]
+            shares = float(t.shares)
+            price = float(t.price_usd)
+            s = state.setdefault(t.ticker, [0.0, 0.0, 0.0, price])
+            if t.type == 'BUY':
+                s[0] += shares
+                s[1] += shares * price
+                s[2] += shares * price * float(t.exchange_rate)
+            else:
+                s[0] -= shares
+            s[3] = price
+            i += 1
+        
+        rate = fx_rates.get(day) or current_rate
+        if not rate:
+            logger.warning(f"No exchange rate for {day}, skipping portfolio history")
+            continue
+        
+        value = 0.0
+        cost = 0.0
+        count = 0
+        for ticker, (net_shares, cost_usd, cost_krw, last_price) in state.items():
+            if net_shares <= 0:
+                continue
+            price = _close_on(closes.get(ticker), day) or last_price
+            value += net_shares * price * rate
+            cost += cost_krw if is_krw else cost_usd * rate
+            count += 1
+        
+        profit = value - cost
+        records.append({
+            "nav_date": day,
+            "value_krw": value,
+            "cost_krw": cost,
+            "profit_krw": profit,
+            "profit_pct": (profit / cost * 100) if cost > 0 else 0,
+            "holdings_count": count,
+        })
+    
+    if records:
+        db.execute(insert(PortfolioHistory), records)
+    if commit:
+        db.commit()
+    
+    logger.info(f"Recomputed portfolio history from {days[0]} ({len(records)} days)")
+    return len(records)
+
+
+def rebuild_history(db: Session) -> int:
+    """거래 내역 전체로 일별 평가 기록 재구성
+    
+    Returns:
+        저장된 일자 수
+    """
+    return recompute_from(db, date.min)
+
+
+def rebuild_history_if_empty(db: Session) -> int:
+    """기록이 비어 있고 거래 내역이 있으면 재구성 (기존 DB 최초 기동용)
+    
+    Returns:
+        저장된 일자 수 (재구성하지 않았으면 0)
+    """
+    if db.query(PortfolioHistory.nav_date).first() is not None:
+        return 0
+    if db.query(Transactions.id).first() is None:
+        return 0
+    return rebuild_history(db)
+
+
+def extend_to_today(db: Session) -> int:
+    """마지막 기록일 이후 지난 거래일만큼 기록 추가
+    
+    Returns:
+        저장된 일자 수
+    """
+    latest = db.query(func.max(PortfolioHistory.nav_date)).scalar()
+    if latest is None:
+        return rebuild_history_if_empty(db)
+    
+    if latest >= _last_trading_day(date.today()):
+        return 0
+    return recompute_from(db, latest + timedelta(days=1))
+
+
+def get_history(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[PortfolioHistory]:
+    """일별 평가 기록 조회 (읽기 전용)
+    
+    오늘까지의 기록은 시작시와 장 마감 후 일봉 동기화 때 extend_to_today 가 채운다.
+    
+    Args:
+        db: 데이터베이스 세션
+        start_date: 시작일 (옵션)
+        end_date: 종료일 (옵션)
+        
+    Returns:
+        날짜 오름차순 PortfolioHistory 리스트
+    """
+    query = db.query(PortfolioHistory)
+    if start_date is not None:
+        query = query.filter(PortfolioHistory.nav_date >= start_date)
+    if end_date is not None:
+        query = query.filter(PortfolioHistory.nav_date <= end_date)
+    
+    return query.order_by(PortfolioHistory.nav_date).all()
@@ -0,0 +1,273 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from models import Holdings, Transactions, Positions
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _to_dict(ticker: str, name: Optional[str], currency: Optional[str], row) -> dict:
+    return {
+        "name": name or ticker,
+        "currency": currency or "USD",
+        "net_shares": float(row.net_shares or 0),
+        "buy_shares": float(row.buy_shares or 0),
+        "cost_usd": float(row.cost_usd or 0),
+        "cost_krw": float(row.cost_krw or 0),
+        "last_transaction_id": row.last_transaction_id,
+    }
+
+
+def _insert_missing(db: Session, tickers: Iterable[str]) -> None:
+    """없는 positions 행을 0 으로 생성 (이미 있으면 그대로 둠)
+    
+    같은 종목의 첫 거래가 동시에 들어오면 SELECT ... FOR UPDATE 는 잠글 행이
+    없어 둘 다 INSERT 를 시도한다. INSERT ... ON CONFLICT DO NOTHING 으로
+    나중 요청은 먼저 만든 행을 그대로 쓰고, 이어지는 SELECT ... FOR UPDATE 가
+    그 행을 잠근다.
+    
+    Args:
+        db: 데이터베이스 세션
+        tickers: 생성할 종목 (교착 방지를 위해 정렬해 삽입)
+    """
+    rows = [
+        {
+            "ticker": ticker,
+            "net_shares": Decimal(0),
+            "buy_shares": Decimal(0),
+            "cost_usd": Decimal(0),
+            "cost_krw": Decimal(0),
+        }
+        for ticker in sorted(tickers)
+    ]
+    if not rows:
+        return
+    
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(dialect_insert(Positions).on_conflict_do_nothing(index_elements=["ticker"]), rows)
+        return
+    
+    # ON CONFLICT 가 없는 DB 는 행마다 SAVEPOINT 안에서 삽입하고 중복은 무시
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Positions), [row])
+        except IntegrityError:
+            pass
+
+
+def get_positions(
+    db: Session,
+    tickers: Optional[Iterable[str]] = None
+) -> Dict[str, dict]:
+    """종목별 보유 현황 조회 (positions 테이블, 종목당 1행)
+    
+    Args:
+        db: 데이터베이스 세션
+        tickers: 특정 종목만 조회 (옵션)
+        
+    Returns:
+        {ticker: {name, currency, net_shares, buy_shares, cost_usd, cost_krw, last_transaction_id}}
+        (cost_* 는 매수 거래 기준 매입 비용, currency 는 종목 거래 통화)
+    """
+    query = db.query(Positions, Holdings.name, Holdings.currency).join(
+        Holdings, Holdings.ticker == Positions.ticker
+    )
+    
+    if tickers is not None:
+        query = query.filter(Positions.ticker.in_([t.upper() for t in tickers]))
+    
+    return {
+        position.ticker: _to_dict(position.ticker, name, currency, position)
+        for position, name, currency in query.all()
+    }
+
+
+def get_position_aggregates(
+    db: Session,
+    tickers: Optional[Iterable[str]] = None
+) -> Dict[str, dict]:
+    """거래 내역 전체에서 종목별 보유 현황 집계 (GROUP BY 쿼리 1회)
+    
+    positions 테이블 재구성에 사용한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        tickers: 특정 종목만 집계 (옵션)
+        
+    Returns:
+        get_positions 와 같은 형식의 dict
+    """
+    is_buy = Transactions.type == 'BUY'
+    buy_cost_usd = Transactions.shares * Transactions.price_usd
+    
+    query = db.query(
+        Holdings.ticker,
+        Holdings.name,
+        Holdings.currency,
+        func.sum(case((is_buy, Transactions.shares), else_=-Transactions.shares)).label('net_shares'),
+        func.sum(case((is_buy, Transactions.shares), else_=0)).label('buy_shares'),
+        func.sum(case((is_buy, buy_cost_usd), else_=0)).label('cost_usd'),
+        func.sum(case((is_buy, buy_cost_usd * Transactions.exchange_rate), else_=0)).label('cost_krw'),
+        func.max(Transactions.id).label('last_transaction_id'),
+    ).join(
+        Transactions, Transactions.ticker == Holdings.ticker
+    ).group_by(Holdings.ticker, Holdings.name, Holdings.currency)
+    
+    if tickers is not None:
+        query = query.filter(Holdings.ticker.in_([t.upper() for t in tickers]))
+    
+    return {row.ticker: _to_dict(row.ticker, row.name, row.currency, row) for row in query.all()}
+
+
+def apply_transaction(db: Session, transaction: Transactions, sign: int = 1) -> Positions:
+    """거래 1건을 positions 에 반영 (커밋은 호출자가 거래 쓰기와 함께 수행)
+    
+    Args:
+        db: 데이터베이스 세션
+        transaction: 반영할 거래 (flush 되어 id 가 있어야 함)
+        sign: 1 = 거래 추가, -1 = 거래 삭제
+        
+    Returns:
+        갱신된 Positions 객체
+    """
+    query = db.query(Positions).filter(Positions.ticker == transaction.ticker).with_for_update()
+    position = query.first()
+    
+    if position is None:
+        # 첫 거래: 행을 먼저 만들고 (동시 생성시 충돌 없이 한쪽만) 다시 잠가 읽음
+        _insert_missing(db, [transaction.ticker])
+        position = query.first()
+    
+    shares = _decimal(transaction.shares) * sign
+    
+    if transaction.type == 'BUY':
+        cost_usd = shares * _decimal(transaction.price_usd)
+        position.net_shares = _decimal(position.net_shares) + shares
+        position.buy_shares = _decimal(position.buy_shares) + shares
+        position.cost_usd = _decimal(position.cost_usd) + cost_usd
+        position.cost_krw = _decimal(position.cost_krw) + cost_usd * _decimal(transaction.exchange_rate)
+    else:
+        position.net_shares = _decimal(position.net_shares) - shares
+    
+    if sign > 0:
+        position.last_transaction_id = max(position.last_transaction_id or 0, transaction.id)
+    elif position.last_transaction_id == transaction.id:
+        position.last_transaction_id = db.query(func.max(Transactions.id)).filter(
+            Transactions.ticker == transaction.ticker,
+            Transactions.id != transaction.id
+        ).scalar()
+    
+    return position
+
+
+def apply_transactions(db: Session, transactions: List[Transactions]) -> Dict[str, Positions]:
+    """새 거래 여러 건을 positions 에 반영 (일괄 등록용, 커밋은 호출자가 수행)
+    
+    종목별로 변화량을 합산한 뒤 대상 종목 positions 행을 한 번의
+    SELECT ... FOR UPDATE 로 잠그고 종목당 한 번만 갱신한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        transactions: 반영할 새 거래 (flush 되어 id 가 있어야 함)
+        
+    Returns:
+        {ticker: 갱신된 Positions 객체}
+    """
+    # ticker -> [순보유 수량, 매수 수량, 매입 비용(USD), 매입 비용(KRW), 마지막 거래 id]
+    deltas: Dict[str, list] = {}
+    for transaction in transactions:
+        delta = deltas.setdefault(transaction.ticker, [Decimal(0), Decimal(0), Decimal(0), Decimal(0), 0])
+        shares = _decimal(transaction.shares)
+        if transaction.type == 'BUY':
+            cost_usd = shares * _decimal(transaction.price_usd)
+            delta[0] += shares
+            delta[1] += shares
+            delta[2] += cost_usd
+            delta[3] += cost_usd * _decimal(transaction.exchange_rate)
+        else:
+            delta[0] -= shares
+        delta[4] = max(delta[4], transaction.id)
+    
+    if not deltas:
+        return {}
+    
+    # 여러 요청이 같은 종목을 잠글 때 교착되지 않도록 종목 순서대로 잠금
+    def lock(tickers) -> Dict[str, Positions]:
+        return {
+            position.ticker: position
+            for position in db.query(Positions).filter(
+                Positions.ticker.in_(tickers)
+            ).order_by(Positions.ticker).with_for_update().all()
+        }
+    
+    positions = lock(deltas)
+    missing = deltas.keys() - positions.keys()
+    if missing:
+        # 처음 거래하는 종목은 행을 만든 뒤 (동시 생성시 충돌 없이 한쪽만) 잠금
+        _insert_missing(db, missing)
+        positions.update(lock(missing))
+    
+    for ticker, (net_shares, buy_shares, cost_usd, cost_krw, last_id) in deltas.items():
+        position = positions[ticker]
+        position.net_shares = _decimal(position.net_shares) + net_shares
+        position.buy_shares = _decimal(position.buy_shares) + buy_shares
+        position.cost_usd = _decimal(position.cost_usd) + cost_usd
+        position.cost_krw = _decimal(position.cost_krw) + cost_krw
+        position.last_transaction_id = max(position.last_transaction_id or 0, last_id)
+    
+    return positions
+
+
+def rebuild_positions(db: Session) -> int:
+    """거래 내역 전체로 positions 테이블 재구성
+    
+    Args:
+        db: 데이터베이스 세션
+        
+    Returns:
+        재구성된 종목 수
+    """
+    aggregates = get_position_aggregates(db)
+    
+    db.query(Positions).delete(synchronize_session=False)
+    if aggregates:
+        db.execute(insert(Positions), [
+            {
+                "ticker": ticker,
+                "net_shares": p["net_shares"],
+                "buy_shares": p["buy_shares"],
+                "cost_usd": p["cost_usd"],
+                "cost_krw": p["cost_krw"],
+                "last_transaction_id": p["last_transaction_id"],
+            }
+            for ticker, p in aggregates.items()
+        ])
+    db.commit()
+    
+    logger.info(f"Rebuilt positions for {len(aggregates)} tickers")
+    return len(aggregates)
+
+
+def rebuild_positions_if_empty(db: Session) -> int:
+    """positions 가 비어 있고 거래 내역이 있으면 재구성 (기존 DB 최초 기동용)
+    
+    Returns:
+        재구성된 종목 수 (재구성하지 않았으면 0)
+    """
+    if db.query(Positions.ticker).first() is not None:
+        return 0
+    if db.query(Transactions.id).first() is None:
+        return 0
+    return rebuild_positions(db)
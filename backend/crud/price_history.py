@@ -0,0 +1,181 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from models import PriceHistory
+from services.stock_service import StockService
+
+logger = logging.getLogger(__name__)
+
+stock_service = StockService()
+
+# 일봉 저장 필드 (close 외에는 생략 가능)
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def get_close_series(
+    db: Session,
+    tickers: Iterable[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Dict[str, Tuple[List[date], List[float]]]:
+    """종목별 일별 종가 시계열 조회 (쿼리 1회, 포트폴리오 평가 재계산용)
+    
+    Args:
+        db: 데이터베이스 세션
+        tickers: 종목 심볼 목록
+        start_date: 첫 날짜 (옵션, 포함)
+        end_date: 마지막 날짜 (옵션, 포함)
+        
+    Returns:
+        {ticker: ([날짜 오름차순], [종가])} (기록이 없는 종목은 제외)
+    """
+    tickers = {t.upper() for t in tickers}
+    if not tickers:
+        return {}
+    
+    query = db.query(
+        PriceHistory.ticker, PriceHistory.price_date, PriceHistory.close
+    ).filter(PriceHistory.ticker.in_(tickers))
+    
+    if start_date is not None:
+        query = query.filter(PriceHistory.price_date >= start_date)
+    if end_date is not None:
+        query = query.filter(PriceHistory.price_date <= end_date)
+    
+    series = {}
+    for row in query.order_by(PriceHistory.ticker, PriceHistory.price_date).all():
+        dates, closes = series.setdefault(row.ticker, ([], []))
+        dates.append(row.price_date)
+        closes.append(float(row.close))
+    return series
+
+
+def get_bars(
+    db: Session,
+    ticker: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[PriceHistory]:
+    """종목 일봉 기간 조회 (로컬 저장소만 사용)
+    
+    Args:
+        db: 데이터베이스 세션
+        ticker: 종목 심볼
+        start_date: 시작일 (옵션, 포함)
+        end_date: 종료일 (옵션, 포함)
+        
+    Returns:
+        날짜 오름차순 PriceHistory 리스트
+    """
+    query = db.query(PriceHistory).filter(PriceHistory.ticker == ticker.upper())
+    
+    if start_date is not None:
+        query = query.filter(PriceHistory.price_date >= start_date)
+    if end_date is not None:
+        query = query.filter(PriceHistory.price_date <= end_date)
+    
+    return query.order_by(PriceHistory.price_date).all()
+
+
+def get_latest_dates(db: Session, tickers: Iterable[str]) -> Dict[str, date]:
+    """종목별 마지막 저장 일자 (GROUP BY 쿼리 1회)
+    
+    Returns:
+        {ticker: 마지막 일자} (기록이 없는 종목은 제외)
+    """
+    tickers = {t.upper() for t in tickers}
+    if not tickers:
+        return {}
+    
+    rows = db.query(
+        PriceHistory.ticker, func.max(PriceHistory.price_date)
+    ).filter(
+        PriceHistory.ticker.in_(tickers)
+    ).group_by(PriceHistory.ticker).all()
+    
+    return {ticker: latest for ticker, latest in rows}
+
+
+def bulk_upsert_bars(db: Session, rows: List[dict]) -> int:
+    """일봉 일괄 저장 (같은 종목/날짜는 덮어씀)
+    
+    Args:
+        db: 데이터베이스 세션
+        rows: [{"ticker": "AAPL", "price_date": date, "close": 190.5,
+                "open": ..., "high": ..., "low": ..., "volume": ...}, ...]
+              (close 외 필드는 생략 가능)
+        
+    Returns:
+        저장된 행 수
+    """
+    if not rows:
+        return 0
+    
+    # 같은 키가 여러 번 나오면 마지막 값 사용
+    incoming = {
+        (r["ticker"].upper(), r["price_date"]): {
+            field: r.get(field) for field in BAR_FIELDS
+        }
+        for r in rows
+    }
+    tickers = {ticker for ticker, _ in incoming}
+    all_dates = [d for _, d in incoming]
+    
+    existing = db.query(PriceHistory).filter(
+        PriceHistory.ticker.in_(tickers),
+        PriceHistory.price_date.between(min(all_dates), max(all_dates))
+    ).all()
+    
+    for record in existing:
+        key = (record.ticker, record.price_date)
+        if key in incoming:
+            for field, value in incoming.pop(key).items():
+                setattr(record, field, value)
+    
+    if incoming:
+        db.execute(insert(PriceHistory), [
+            {"ticker": ticker, "price_date": price_date, **bar}
+            for (ticker, price_date), bar in incoming.items()
+        ])
+    
+    db.commit()
+    logger.info(f"Stored {len(rows)} daily bars")
+    return len(rows)
+
+
+def sync_bars(db: Session, start_dates: Dict[str, date]) -> Optional[date]:
+    """저장된 마지막 일자 이후의 일봉만 받아 추가
+    
+    마지막 일자 다음 날부터 조회하며, 기록이 없는 종목은 start_dates 의
+    날짜부터 받는다. 같은 시작일의 종목은 한 번에 조회한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        start_dates: {ticker: 기록이 없을 때의 시작일}
+        
+    Returns:
+        새로 저장된 가장 이른 일자 (없으면 None)
+    """
+    latest = get_latest_dates(db, start_dates)
+    today = date.today()
+    
+    groups: Dict[date, List[str]] = {}
+    for ticker, default_start in start_dates.items():
+        ticker = ticker.upper()
+        start = latest[ticker] + timedelta(days=1) if ticker in latest else default_start
+        if start <= today:
+            groups.setdefault(start, []).append(ticker)
+    
+    rows = []
+    for start, tickers in groups.items():
+        for ticker, bars in stock_service.download_daily_bars(tickers, start).items():
+            rows.extend({"ticker": ticker, **bar} for bar in bars if bar["price_date"] >= start)
+    
+    if not rows:
+        return None
+    
+    bulk_upsert_bars(db, rows)
+    return min(row["price_date"] for row in rows)
@@ -0,0 +1,105 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from models import PriceSnapshots
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_snapshots(db: Session, quotes: Dict[str, dict]) -> int:
+    """시세를 종목별 최신 스냅샷으로 저장 (종목당 1행, 덮어씀)
+    
+    Args:
+        db: 데이터베이스 세션
+        quotes: StockService.get_quotes 결과 (현재가가 없는 종목은 건너뜀)
+        
+    Returns:
+        저장된 종목 수
+    """
+    incoming = {
+        ticker.upper(): {
+            "price": quote["current_price"],
+            "previous_close": quote.get("previous_close"),
+            "change_pct": quote.get("daily_change"),
+            "currency": quote.get("currency", "USD"),
+            "fetched_at": quote.get("fetched_at") or datetime.now(),
+        }
+        for ticker, quote in quotes.items()
+        if quote.get("current_price") is not None
+    }
+    if not incoming:
+        return 0
+    
+    count = len(incoming)
+    for record in db.query(PriceSnapshots).filter(PriceSnapshots.ticker.in_(incoming)).all():
+        for field, value in incoming.pop(record.ticker).items():
+            setattr(record, field, value)
+    
+    if incoming:
+        db.execute(insert(PriceSnapshots), [
+            {"ticker": ticker, **snapshot} for ticker, snapshot in incoming.items()
+        ])
+    
+    db.commit()
+    logger.info(f"Stored price snapshots for {count} tickers")
+    return count
+
+
+def get_snapshot_quotes(db: Session, tickers: Iterable[str]) -> Dict[str, dict]:
+    """최신 스냅샷을 StockService 시세 dict 형식으로 조회 (네트워크 호출 없음)
+    
+    Args:
+        db: 데이터베이스 세션
+        tickers: 종목 심볼 목록
+        
+    Returns:
+        {ticker: 시세 dict (fetched_at 포함)} (스냅샷이 없는 종목은 가격 필드가 None)
+    """
+    tickers = [t.upper() for t in tickers]
+    snapshots = {
+        s.ticker: s
+        for s in db.query(PriceSnapshots).filter(PriceSnapshots.ticker.in_(tickers)).all()
+    } if tickers else {}
+    
+    quotes = {}
+    for ticker in tickers:
+        snapshot = snapshots.get(ticker)
+        if snapshot is None:
+            quotes[ticker] = {
+                "ticker": ticker,
+                "current_price": None,
+                "previous_close": None,
+                "daily_change": None,
+                "currency": "USD",
+                "fetched_at": None
+            }
+            continue
+        
+        quotes[ticker] = {
+            "ticker": ticker,
+            "current_price": float(snapshot.price),
+            "previous_close": float(snapshot.previous_close) if snapshot.previous_close is not None else None,
+            "daily_change": float(snapshot.change_pct) if snapshot.change_pct is not None else None,
+            "currency": snapshot.currency,
+            "fetched_at": snapshot.fetched_at
+        }
+    return quotes
+
+
+def get_snapshots_since(db: Session, since: Optional[datetime] = None) -> List[PriceSnapshots]:
+    """since 이후 갱신된 스냅샷 (실시간 스트림용, since 가 없으면 전체)
+    
+    Args:
+        db: 데이터베이스 세션
+        since: 마지막으로 확인한 fetched_at
+        
+    Returns:
+        PriceSnapshots 리스트 (fetched_at 오름차순)
+    """
+    query = db.query(PriceSnapshots)
+    if since is not None:
+        query = query.filter(PriceSnapshots.fetched_at > since)
+    return query.order_by(PriceSnapshots.fetched_at).all()
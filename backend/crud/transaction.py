@@ -1,18 +1,58 @@
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
 import logging
 
 from models import Transactions
 from schemas.transaction import TransactionCreate
 from services.forex_service import ForexService
 from crud import holdings as holdings_crud
+from crud import exchange_rate as exchange_rate_crud
+from crud import position as position_crud
+from crud import portfolio_history as portfolio_history_crud
 
 logger = logging.getLogger(__name__)
 
 forex_service = ForexService()
 
 
+def resolve_exchange_rates(
+    db: Session,
+    transaction_times: Iterable[datetime]
+) -> Dict[date, float]:
+    """거래 일자별 USD/KRW 환율 결정
+    
+    과거 일자는 일별 환율 테이블(직전 영업일 포함)에서 한 번의 쿼리로 찾고,
+    당일 거래나 기록이 없는 일자는 현재 환율을 사용한다.
+    
+    Args:
+        db: 데이터베이스 세션
+        transaction_times: 거래 일시 목록
+        
+    Returns:
+        {거래 일자: 환율}
+        
+    Raises:
+        ValueError: 환율 조회 실패시
+    """
+    today = date.today()
+    trade_dates = {t.date() for t in transaction_times}
+    
+    rates = exchange_rate_crud.get_rates_on(db, {d for d in trade_dates if d < today})
+    
+    missing = [d for d in trade_dates if not rates.get(d)]
+    if missing:
+        current_rate = forex_service.get_usd_to_krw()
+        if not current_rate:
+            raise ValueError("환율 정보를 가져올 수 없습니다")
+        for d in missing:
+            if d < today:
+                logger.warning(f"No historical rate stored for {d}, using current rate")
+            rates[d] = current_rate
+    
+    return rates
+
+
 def create_transaction(db: Session, transaction: TransactionCreate) -> Transactions:
     """거래 생성
     
@@ -29,10 +69,9 @@ def create_transaction(db: Session, transaction: TransactionCreate) -> Transacti
     # 종목이 없으면 자동 생성
     holdings_crud.get_or_create_holding(db, transaction.ticker)
     
-    # 거래 시점 환율 조회
-    exchange_rate = forex_service.get_usd_to_krw()
-    if not exchange_rate:
-        raise ValueError("환율 정보를 가져올 수 없습니다")
+    # 거래 일자 환율 조회
+    trade_date = transaction.transaction_time.date()
+    exchange_rate = resolve_exchange_rates(db, [transaction.transaction_time])[trade_date]
     
     # 거래 생성
     new_transaction = Transactions(
@@ -45,6 +84,11 @@ def create_transaction(db: Session, transaction: TransactionCreate) -> Transacti
     )
     
     db.add(new_transaction)
+    db.flush()
+    
+    # 보유 현황과 거래일 이후 일별 평가 기록을 같은 DB 트랜잭션에서 갱신
+    position_crud.apply_transaction(db, new_transaction)
+    portfolio_history_crud.recompute_from(db, trade_date, commit=False)
     db.commit()
     db.refresh(new_transaction)
     
@@ -52,6 +96,51 @@ def create_transaction(db: Session, transaction: TransactionCreate) -> Transacti
     return new_transaction
 
 
+def create_transactions_bulk(
+    db: Session,
+    transactions: List[TransactionCreate]
+) -> List[Transactions]:
+    """거래 일괄 생성 (환율은 쿼리 1회로 일괄 조회)
+    
+    Args:
+        db: 데이터베이스 세션
+        transactions: 거래 생성 데이터 목록
+        
+    Returns:
+        생성된 Transaction 객체 리스트
+        
+    Raises:
+        ValueError: 환율 조회 실패시
+    """
+    for ticker in {t.ticker.upper() for t in transactions}:
+        holdings_crud.get_or_create_holding(db, ticker)
+    
+    rates = resolve_exchange_rates(db, [t.transaction_time for t in transactions])
+    
+    new_transactions = [
+        Transactions(
+            ticker=t.ticker.upper(),
+            type=t.type,
+            shares=t.shares,
+            price_usd=t.price_usd,
+            exchange_rate=rates[t.transaction_time.date()],
+            transaction_time=t.transaction_time
+        )
+        for t in transactions
+    ]
+    
+    db.add_all(new_transactions)
+    db.flush()
+    
+    # 보유 현황은 종목별 합산 후 종목당 1행만 잠가 갱신
+    position_crud.apply_transactions(db, new_transactions)
+    portfolio_history_crud.recompute_from(db, min(rates), commit=False)
+    db.commit()
+    
+    logger.info(f"Created {len(new_transactions)} transactions (bulk)")
+    return new_transactions
+
+
 def get_transactions_by_ticker(
     db: Session,
     ticker: str,
@@ -121,7 +210,11 @@ def delete_transaction(db: Session, transaction_id: int) -> bool:
     """
     transaction = get_transaction_by_id(db, transaction_id)
     if transaction:
+        trade_date = transaction.transaction_time.date()
+        position_crud.apply_transaction(db, transaction, sign=-1)
         db.delete(transaction)
+        db.flush()
+        portfolio_history_crud.recompute_from(db, trade_date, commit=False)
         db.commit()
         logger.info(f"Deleted transaction ID: {transaction_id}")
         return True
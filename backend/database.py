@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from core.config import settings
+from core.metrics import metrics
+from core.query_stats import query_stats
+import time
 
 # SQLAlchemy engine
 engine = create_engine(
@@ -11,19 +14,69 @@ engine = create_engine(
     max_overflow=10
 )
 
+# SQL 문별 실행 시간 기록 (fingerprint 통계, 느린 쿼리 로그, 요청별 횟수/Server-Timing db 구간)
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._started = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    query_stats.record(statement, time.perf_counter() - context._started)
+
+
+# 연결 풀 게이지 (QueuePool 이 아닌 풀은 값 없음)
+metrics.callback(
+    "db_pool_checked_out", "사용 중인 DB 연결 수", "gauge",
+    lambda: engine.pool.checkedout() if hasattr(engine.pool, "checkedout") else None
+)
+metrics.callback(
+    "db_pool_overflow", "pool_size 를 넘어 추가로 연 DB 연결 수 (음수: 아직 열지 않은 기본 연결)", "gauge",
+    lambda: engine.pool.overflow() if hasattr(engine.pool, "overflow") else None
+)
+metrics.callback(
+    "db_pool_size", "DB 연결 풀 기본 크기", "gauge",
+    lambda: engine.pool.size() if hasattr(engine.pool, "size") else None
+)
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
+# create_all 은 기존 테이블에 컬럼을 추가하지 않으므로 나중에 생긴 컬럼은 직접 추가
+# (테이블, 컬럼, DDL 타입) - 모두 NULL 허용 컬럼
+ADDED_COLUMNS = [
+    ("holdings", "currency", "VARCHAR(3)"),
+    ("alerts", "rule_id", "INTEGER"),
+    ("alerts", "rule_type", "VARCHAR(20)"),
+    ("alerts", "threshold", "NUMERIC(14, 4)"),
+    ("alert_outbox", "rule_id", "INTEGER"),
+    ("alert_outbox", "rule_type", "VARCHAR(20)"),
+    ("alert_outbox", "threshold", "NUMERIC(14, 4)"),
+    ("alert_rules", "updated_at", "TIMESTAMP WITH TIME ZONE"),
+]
+
+
+def _add_missing_columns():
+    """기존 DB 에 없는 ADDED_COLUMNS 컬럼 추가"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, column, ddl_type in ADDED_COLUMNS:
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+                print(f"✅ Added column {table}.{column}")
+
 
 def init_db():
     """데이터베이스 테이블 생성"""
-    # Import all models here to ensure they are registered
-    from models import Holdings, Transactions, Alerts
+    # models 패키지가 모든 모델을 import 하므로 패키지만 불러와도 전부 등록됨
+    import models  # noqa: F401
     
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
     print("✅ Database tables created successfully!")
 
 
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+일별 환율 기록 일괄 적재 스크립트 (네트워크 불필요)
+
+사용법:
+    python load_fx_history.py rates.csv [rates2.json ...]
+
+지원 형식:
+    CSV (long)  : date,currency,rate
+    CSV (wide)  : date,KRW,EUR,...
+    JSON (list) : [{"date": "2024-01-02", "currency": "KRW", "rate": 1300.5}, ...]
+    JSON (dict) : {"rates": {"2024-01-02": {"KRW": 1300.5, ...}, ...}}
+
+환율은 모두 USD 1단위당 값이다.
+"""
+
+import csv
+import json
+import sys
+from datetime import date
+from typing import List
+
+from database import init_db, SessionLocal
+from crud import exchange_rate as crud_exchange_rate
+
+BATCH_SIZE = 5000
+
+
+def _row(day: str, currency: str, rate) -> dict:
+    return {
+        "rate_date": date.fromisoformat(day.strip()[:10]),
+        "currency": currency.strip().upper(),
+        "rate": float(rate)
+    }
+
+
+def parse_csv(path: str) -> List[dict]:
+    """CSV 파일 파싱 (long/wide 형식 자동 판별)"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fields = [name.strip().lower() for name in reader.fieldnames or []]
+        rows = []
+        
+        if 'currency' in fields and 'rate' in fields:
+            for record in reader:
+                record = {k.strip().lower(): v for k, v in record.items()}
+                if record.get('rate'):
+                    rows.append(_row(record['date'], record['currency'], record['rate']))
+        else:
+            date_key = reader.fieldnames[0]
+            for record in reader:
+                for currency, rate in record.items():
+                    if currency != date_key and rate:
+                        rows.append(_row(record[date_key], currency, rate))
+        
+        return rows
+
+
+def parse_json(path: str) -> List[dict]:
+    """JSON 파일 파싱 (레코드 리스트 또는 날짜별 환율 dict)"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if isinstance(data, list):
+        return [_row(r['date'], r['currency'], r['rate']) for r in data]
+    
+    by_date = data.get('rates', data)
+    return [
+        _row(day, currency, rate)
+        for day, rates in by_date.items()
+        for currency, rate in rates.items()
+    ]
+
+
+def load_file(path: str) -> int:
+    """파일 1개 적재"""
+    rows = parse_json(path) if path.lower().endswith('.json') else parse_csv(path)
+    
+    db = SessionLocal()
+    try:
+        for i in range(0, len(rows), BATCH_SIZE):
+            crud_exchange_rate.bulk_upsert_rates(db, rows[i:i + BATCH_SIZE])
+    finally:
+        db.close()
+    
+    return len(rows)
+
+
+def main():
+    """메인 실행 함수"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    
+    init_db()
+    
+    for path in sys.argv[1:]:
+        try:
+            count = load_file(path)
+            print(f"✅ {path}: {count}건 적재 완료")
+        except Exception as e:
+            print(f"❌ {path}: 적재 실패 - {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
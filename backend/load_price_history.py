@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+일봉(OHLCV) 일괄 적재 스크립트 (네트워크 불필요)
+
+사용법:
+    python load_price_history.py AAPL.csv VOO.csv [bars.csv ...]
+    
+지원 형식 (헤더 대소문자 무시):
+    종목별 CSV : Date,Open,High,Low,Close[,Adj Close],Volume  (종목 = 파일 이름, 예: AAPL.csv)
+    통합 CSV   : date,ticker,open,high,low,close,volume        (ticker 또는 symbol 컬럼)
+    
+close 외 컬럼은 생략 가능하다. 적재 후 해당 기간의 일별 포트폴리오 평가를 다시 계산한다.
+"""
+
+import csv
+import os
+import sys
+from datetime import date
+from typing import List, Optional
+
+from database import init_db, SessionLocal
+from crud import price_history as crud_price_history
+from crud import portfolio_history as crud_portfolio_history
+
+BATCH_SIZE = 5000
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    if value is None or not value.strip() or value.strip().lower() in ('null', 'nan'):
+        return None
+    return float(value.replace(',', ''))
+
+
+def parse_csv(path: str) -> List[dict]:
+    """CSV 파일 파싱 (종목별/통합 형식 자동 판별)"""
+    default_ticker = os.path.splitext(os.path.basename(path))[0].upper()
+    
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = []
+        
+        for record in reader:
+            record = {k.strip().lower(): v for k, v in record.items() if k}
+            close = _number(record.get('close'))
+            if close is None:
+                continue
+            
+            volume = _number(record.get('volume'))
+            rows.append({
+                "ticker": (record.get('ticker') or record.get('symbol') or default_ticker).strip().upper(),
+                "price_date": date.fromisoformat(record['date'].strip()[:10]),
+                "open": _number(record.get('open')),
+                "high": _number(record.get('high')),
+                "low": _number(record.get('low')),
+                "close": close,
+                "volume": int(volume) if volume is not None else None
+            })
+        
+        return rows
+
+
+def load_file(path: str) -> List[dict]:
+    """파일 1개 적재"""
+    rows = parse_csv(path)
+    
+    db = SessionLocal()
+    try:
+        for i in range(0, len(rows), BATCH_SIZE):
+            crud_price_history.bulk_upsert_bars(db, rows[i:i + BATCH_SIZE])
+    finally:
+        db.close()
+    
+    return rows
+
+
+def main():
+    """메인 실행 함수"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    
+    init_db()
+    earliest = None
+    
+    for path in sys.argv[1:]:
+        try:
+            rows = load_file(path)
+            print(f"✅ {path}: {len(rows)}건 적재 완료")
+        except Exception as e:
+            print(f"❌ {path}: 적재 실패 - {e}")
+            sys.exit(1)
+        
+        if rows:
+            first = min(row["price_date"] for row in rows)
+            earliest = first if earliest is None else min(earliest, first)
+    
+    if earliest:
+        db = SessionLocal()
+        try:
+            days = crud_portfolio_history.recompute_from(db, earliest)
+            print(f"✅ 일별 포트폴리오 평가 재계산: {days}일")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import logging
 
-from database import init_db
+from database import init_db, SessionLocal
+from crud import position as crud_position
+from crud import holdings as crud_holdings
+from crud import portfolio_history as crud_portfolio_history
 from api.v1.router import api_router
-from services.scheduler import PriceAlertScheduler
+from api.middleware import MetricsMiddleware, RequestTimingMiddleware
+from services.scheduler import scheduler_leader
+from services.forex_service import rate_provider
+from services.event_stream import stream_poller
 from schemas.common import MessageResponse, HealthCheckResponse
 from core.config import settings
+from core.metrics import metrics
 
 # 로깅 설정
 logging.basicConfig(
@@ -34,9 +42,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 스케줄러 인스턴스
-scheduler = PriceAlertScheduler()
+# 요청 구간별 시간 (Server-Timing 헤더, 요청별 SQL 횟수/N+1 경고, 요청별 프로파일러)
+app.add_middleware(RequestTimingMiddleware)
 
+# 요청 처리 시간 메트릭 (끄면 /metrics 도 제공하지 않음)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def get_metrics():
+        """Prometheus 메트릭 (이 워커 프로세스 기준)"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # ==================== 이벤트 핸들러 ====================
 
@@ -49,16 +65,38 @@ async def startup_event():
     init_db()
     logger.info("Database initialized")
     
-    # 스케줄러 시작
-    scheduler.start()
-    logger.info("Price alert scheduler started")
+    # 보유 현황/일별 평가 테이블이 비어 있으면 거래 내역으로 재구성
+    # (일별 평가는 비어 있지 않으면 마지막 기록일 이후 지난 거래일만 추가)
+    db = SessionLocal()
+    try:
+        rebuilt = crud_position.rebuild_positions_if_empty(db)
+        if rebuilt:
+            logger.info(f"Positions rebuilt for {rebuilt} tickers")
+        rebuilt = crud_portfolio_history.extend_to_today(db)
+        if rebuilt:
+            logger.info(f"Portfolio history updated for {rebuilt} days")
+        # 거래 통화를 모르는 종목 (currency 컬럼 추가 전 종목, 생성시 조회 실패) 채움
+        crud_holdings.backfill_currencies(db)
+    finally:
+        db.close()
+    
+    # 환율 백그라운드 갱신 시작
+    rate_provider.start()
+    
+    # 실시간 스트림 이벤트 수집 (워커당 1개, 모든 SSE 연결이 공유)
+    stream_poller.start()
+    
+    # 스케줄러 리더 선출 (리더 워커 하나만 가격 체크/알림 작업 실행)
+    scheduler_leader.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     logger.info("Shutting down application...")
-    scheduler.stop()
+    scheduler_leader.stop()
+    stream_poller.stop()
+    rate_provider.stop()
     logger.info("Application shutdown complete")
 
 
@@ -1,5 +1,12 @@
 from models.holdings import Holdings
 from models.transaction import Transactions
 from models.alert import Alerts
+from models.alert_outbox import AlertOutbox
+from models.alert_rule import AlertRules
+from models.exchange_rate import ExchangeRates
+from models.position import Positions
+from models.price_history import PriceHistory
+from models.portfolio_history import PortfolioHistory
+from models.price_snapshot import PriceSnapshots
 
-__all__ = ["Holdings", "Transactions", "Alerts"]
+__all__ = ["Holdings", "Transactions", "Alerts", "AlertOutbox", "AlertRules", "ExchangeRates", "Positions", "PriceHistory", "PortfolioHistory", "PriceSnapshots"]
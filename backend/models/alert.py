@@ -4,13 +4,16 @@ from database import Base
 
 
 class Alerts(Base):
-    """가격 변동 알림 기록 테이블"""
+    """가격 변동 알림 기록 테이블 (rule_*: 알림 규칙으로 발동한 경우의 규칙 정보)"""
     __tablename__ = "alerts"
     
     id = Column(Integer, primary_key=True, index=True)
     ticker = Column(String(10), nullable=False, index=True)
     change_percent = Column(Numeric(5, 2), nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
+    rule_id = Column(Integer)
+    rule_type = Column(String(20))
+    threshold = Column(Numeric(14, 4))
     sent_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     def __repr__(self):
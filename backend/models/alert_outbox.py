@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, Index
+from sqlalchemy.sql import func
+from database import Base
+
+
+class AlertOutbox(Base):
+    """알림 발송 대기열 (스케줄러가 기록, 발송 워커가 처리)
+    
+    status: pending (발송 대기/재시도 대기) -> sent (발송 완료, alerts 에 기록)
+            또는 failed (최대 재시도 초과)
+    rule_*: 알림 규칙으로 발동한 알림의 규칙 정보 (전역 임계값 알림은 NULL)
+    """
+    __tablename__ = "alert_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String(10), nullable=False)
+    change_percent = Column(Numeric(5, 2), nullable=False)
+    price = Column(Numeric(10, 2), nullable=False)
+    rule_id = Column(Integer)
+    rule_type = Column(String(20))
+    threshold = Column(Numeric(14, 4))
+    status = Column(String(10), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+    sent_at = Column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index("ix_alert_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+    
+    def __repr__(self):
+        return f"<AlertOutbox({self.ticker} {self.change_percent}% rule={self.rule_id} {self.status}, attempts={self.attempts})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime
+from sqlalchemy.sql import func
+from datetime import datetime, timezone
+from database import Base
+
+
+class AlertRules(Base):
+    """사용자 정의 알림 규칙 테이블
+    
+    rule_type:
+        pct_move    - 전일 대비 변동률 절댓값이 threshold(%) 이상
+        price_above - 가격이 threshold 를 아래에서 위로 돌파
+        price_below - 가격이 threshold 를 위에서 아래로 돌파
+        drawdown    - 평균 매수가 대비 하락률이 threshold(%) 이상
+    """
+    __tablename__ = "alert_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String(10), nullable=False, index=True)
+    rule_type = Column(String(20), nullable=False)
+    threshold = Column(Numeric(14, 4), nullable=False)
+    last_triggered_at = Column(DateTime(timezone=True))  # 재알림 금지 기간 계산용
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 규칙 인덱스 변경 감지용 (마이크로초 단위, 발동 기록 갱신은 바꾸지 않음)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    
+    def __repr__(self):
+        return f"<AlertRule({self.ticker} {self.rule_type} {self.threshold})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class ExchangeRates(Base):
+    """일별 환율 기록 테이블 (USD 1단위당 통화)"""
+    __tablename__ = "exchange_rates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    currency = Column(String(3), nullable=False)  # 'KRW', 'EUR', ...
+    rate_date = Column(Date, nullable=False)
+    rate = Column(Numeric(16, 6), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # (currency, rate_date) 인덱스로 직전 영업일 조회를 O(log n) 으로 처리
+    __table_args__ = (
+        UniqueConstraint("currency", "rate_date", name="uq_exchange_rates_currency_date"),
+    )
+    
+    def __repr__(self):
+        return f"<ExchangeRate(USD/{self.currency} {self.rate_date}: {self.rate})>"
@@ -11,10 +11,12 @@ class Holdings(Base):
     id = Column(Integer, primary_key=True, index=True)
     ticker = Column(String(10), unique=True, nullable=False, index=True)
     name = Column(String(100))
+    currency = Column(String(3))  # 거래 통화 (NULL: 종목 정보 조회 실패, 시작시 다시 조회)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     transactions = relationship("Transactions", back_populates="holding", cascade="all, delete-orphan")
+    position = relationship("Positions", back_populates="holding", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<Holdings(ticker={self.ticker}, name={self.name})>"
+        return f"<Holdings(ticker={self.ticker}, name={self.name}, currency={self.currency})>"
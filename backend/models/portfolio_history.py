@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+
+class PortfolioHistory(Base):
+    """일별 포트폴리오 평가 기록 테이블 (거래 입력/삭제시 해당 일자부터 재계산)"""
+    __tablename__ = "portfolio_history"
+    
+    nav_date = Column(Date, primary_key=True)
+    value_krw = Column(Numeric(20, 2), nullable=False)    # 평가액 (보고 통화)
+    cost_krw = Column(Numeric(20, 2), nullable=False)     # 매입 비용 (보고 통화)
+    profit_krw = Column(Numeric(20, 2), nullable=False)
+    profit_pct = Column(Numeric(10, 4), nullable=False)
+    holdings_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<PortfolioHistory({self.nav_date}: {self.value_krw})>"
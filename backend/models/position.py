@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from database import Base
+
+
+class Positions(Base):
+    """종목별 보유 현황 테이블 (거래 입력/삭제시 증분 갱신)"""
+    __tablename__ = "positions"
+    
+    ticker = Column(String(10), ForeignKey("holdings.ticker", ondelete="CASCADE"), primary_key=True)
+    net_shares = Column(Numeric(14, 4), nullable=False, default=0)   # 매수 - 매도
+    buy_shares = Column(Numeric(14, 4), nullable=False, default=0)   # 누적 매수 수량
+    cost_usd = Column(Numeric(18, 4), nullable=False, default=0)     # 누적 매수 금액 (USD)
+    cost_krw = Column(Numeric(20, 2), nullable=False, default=0)     # 누적 매수 금액 (거래 시점 KRW)
+    last_transaction_id = Column(Integer)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    holding = relationship("Holdings", back_populates="position")
+    
+    def __repr__(self):
+        return f"<Position(ticker={self.ticker}, shares={self.net_shares})>"
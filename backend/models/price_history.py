@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class PriceHistory(Base):
+    """일봉(OHLCV) 기록 테이블 (로컬 가격 저장소)"""
+    __tablename__ = "price_history"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String(10), nullable=False)
+    price_date = Column(Date, nullable=False)
+    open = Column(Numeric(14, 4))
+    high = Column(Numeric(14, 4))
+    low = Column(Numeric(14, 4))
+    close = Column(Numeric(14, 4), nullable=False)  # 현지 통화 종가
+    volume = Column(BigInteger)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # (ticker, price_date) 인덱스로 종목별 기간 조회
+    __table_args__ = (
+        UniqueConstraint("ticker", "price_date", name="uq_price_history_ticker_date"),
+    )
+    
+    def __repr__(self):
+        return f"<PriceHistory({self.ticker} {self.price_date}: {self.close})>"
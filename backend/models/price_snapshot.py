@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Numeric, DateTime
+from database import Base
+
+
+class PriceSnapshots(Base):
+    """종목별 최신 시세 스냅샷 테이블 (스케줄러가 기록, API 스냅샷 모드가 읽음)"""
+    __tablename__ = "price_snapshots"
+    
+    ticker = Column(String(10), primary_key=True)
+    price = Column(Numeric(14, 4), nullable=False)
+    previous_close = Column(Numeric(14, 4))
+    change_pct = Column(Numeric(10, 4))
+    currency = Column(String(3), nullable=False, default="USD")
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<PriceSnapshot({self.ticker}: {self.price} @ {self.fetched_at})>"
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+보유 현황(positions) 테이블 재구성 스크립트
+
+거래 내역 전체를 다시 집계해 positions 테이블을 처음부터 만든다.
+수동으로 DB 를 수정했거나 positions 값이 어긋났을 때 실행한다.
+
+사용법:
+    python rebuild_positions.py
+"""
+
+from database import init_db, SessionLocal
+from crud import position as crud_position
+
+
+def main():
+    """메인 실행 함수"""
+    init_db()
+    
+    db = SessionLocal()
+    try:
+        count = crud_position.rebuild_positions(db)
+        print(f"✅ 보유 현황 재구성 완료: {count}개 종목")
+    except Exception as e:
+        print(f"❌ 오류 발생: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
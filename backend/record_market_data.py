@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+시세/환율 기록 파일 생성 스크립트 (MARKET_DATA_PROVIDER=replay 용)
+
+사용법:
+    python record_market_data.py replay/market_data.json               # 보유 종목을 yfinance 에서 기록
+    python record_market_data.py replay/market_data.json --days 365    # 일봉 기록 기간 (기본 365일)
+    python record_market_data.py replay/bench.json --synthetic 500     # 네트워크 없이 가상 종목 500개 생성
+
+생성한 파일을 REPLAY_DATA_PATH 로 지정하면 앱 전체(스케줄러 포함)가 네트워크 없이
+같은 시세/환율로 실행된다. REPLAY_LATENCY_MS / REPLAY_FAILURE_RATE 로 지연과 실패를 주입한다.
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Dict
+
+from core.config import settings
+from database import init_db, SessionLocal
+from models import Holdings
+from services.market_data import YFinanceProvider
+
+
+def _bar_json(bar: dict) -> dict:
+    return {
+        "date": bar["price_date"].isoformat(),
+        "open": bar.get("open"),
+        "high": bar.get("high"),
+        "low": bar.get("low"),
+        "close": bar["close"],
+        "volume": bar.get("volume"),
+    }
+
+
+def record_live(days: int) -> Dict:
+    """보유 종목 시세/일봉과 환율표를 yfinance/환율 API 에서 기록"""
+    init_db()
+    db = SessionLocal()
+    try:
+        tickers = [h.ticker for h in db.query(Holdings).all()]
+    finally:
+        db.close()
+    
+    provider = YFinanceProvider(settings.EXCHANGE_RATE_API_URL)
+    closes = provider.get_recent_closes(tickers) if tickers else {}
+    bars = provider.get_daily_bars(tickers, date.today() - timedelta(days=days)) if tickers else {}
+    
+    quotes = {}
+    for ticker in tickers:
+        try:
+            info = provider.get_info(ticker)
+        except Exception as e:
+            print(f"⚠️  {ticker}: 종목 정보 조회 실패 - {e}")
+            info = {"name": ticker, "currency": "USD"}
+        quotes[ticker] = {
+            "name": info["name"],
+            "currency": info["currency"],
+            "closes": closes.get(ticker, []),
+        }
+    
+    return {
+        "quotes": quotes,
+        "bars": {ticker: [_bar_json(bar) for bar in ticker_bars] for ticker, ticker_bars in bars.items()},
+        "fx": provider.get_fx_rates(),
+    }
+
+
+def record_synthetic(count: int, days: int, seed: int = 42) -> Dict:
+    """가상 종목 count 개의 일봉/시세와 고정 환율표 생성 (random walk, 재현 가능)"""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=days)
+    quotes = {}
+    bars = {}
+    
+    for i in range(count):
+        ticker = f"T{i:04d}"
+        price = rng.uniform(10, 500)
+        ticker_bars = []
+        day = start
+        while day <= date.today():
+            if day.weekday() < 5:
+                open_price = price
+                price = max(price * (1 + rng.gauss(0, 0.02)), 1.0)
+                ticker_bars.append({
+                    "date": day.isoformat(),
+                    "open": round(open_price, 2),
+                    "high": round(max(open_price, price) * 1.01, 2),
+                    "low": round(min(open_price, price) * 0.99, 2),
+                    "close": round(price, 2),
+                    "volume": rng.randint(10_000, 5_000_000),
+                })
+            day += timedelta(days=1)
+        
+        bars[ticker] = ticker_bars
+        quotes[ticker] = {
+            "name": f"Synthetic {ticker}",
+            "currency": "USD",
+            "closes": [bar["close"] for bar in ticker_bars[-5:]],
+        }
+    
+    return {
+        "quotes": quotes,
+        "bars": bars,
+        "fx": {"base": "USD", "rates": {"USD": 1.0, "KRW": 1385.25, "EUR": 0.92, "JPY": 151.3}},
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="시세/환율 기록 파일 생성")
+    parser.add_argument("output", help="기록 파일 경로 (JSON)")
+    parser.add_argument("--days", type=int, default=365, help="일봉 기록 기간 (일)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="가상 종목 N개 생성 (네트워크 불필요)")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        data = record_synthetic(args.synthetic, args.days)
+    else:
+        data = record_live(args.days)
+    
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    
+    print(f"✅ {args.output}: {len(data['quotes'])}개 종목 기록 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,19 @@
 from schemas.common import MessageResponse, ExchangeRateResponse, HealthCheckResponse
-from schemas.holdings import HoldingResponse, HoldingDetail
-from schemas.transaction import TransactionCreate, TransactionResponse, TransactionListResponse
-from schemas.portfolio import StockDetailResponse, PortfolioSummaryResponse
-from schemas.alert import AlertResponse, AlertListResponse
+from schemas.holdings import HoldingResponse, HoldingDetail, PriceBar, PriceHistoryResponse
+from schemas.transaction import TransactionCreate, TransactionBulkCreate, TransactionResponse, TransactionListResponse
+from schemas.portfolio import (
+    StockDetailResponse,
+    PortfolioSummaryResponse,
+    PortfolioHistoryPoint,
+    PortfolioHistoryResponse,
+)
+from schemas.alert import (
+    AlertResponse,
+    AlertListResponse,
+    AlertOutboxStatusResponse,
+    AlertRuleCreate,
+    AlertRuleResponse,
+)
 
 __all__ = [
     # Common
@@ -12,14 +23,22 @@ __all__ = [
     # Holdings
     "HoldingResponse",
     "HoldingDetail",
+    "PriceBar",
+    "PriceHistoryResponse",
     # Transactions
     "TransactionCreate",
+    "TransactionBulkCreate",
     "TransactionResponse",
     "TransactionListResponse",
     # Portfolio
     "StockDetailResponse",
     "PortfolioSummaryResponse",
+    "PortfolioHistoryPoint",
+    "PortfolioHistoryResponse",
     # Alerts
     "AlertResponse",
     "AlertListResponse",
+    "AlertOutboxStatusResponse",
+    "AlertRuleCreate",
+    "AlertRuleResponse",
 ]
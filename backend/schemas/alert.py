@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, validator
 from datetime import datetime
+from typing import Literal, Optional
 
 
 class AlertResponse(BaseModel):
@@ -8,6 +9,9 @@ class AlertResponse(BaseModel):
     ticker: str
     change_percent: float
     price: float
+    rule_id: Optional[int] = None  # 알림 규칙으로 발동한 경우
+    rule_type: Optional[str] = None
+    threshold: Optional[float] = None
     sent_at: datetime
     
     class Config:
@@ -18,3 +22,47 @@ class AlertListResponse(BaseModel):
     """알림 목록 응답"""
     alerts: list[AlertResponse]
     total_count: int
+
+
+class AlertOutboxStatusResponse(BaseModel):
+    """알림 발송 대기열 상태 응답"""
+    pending: int
+    sent: int
+    failed: int
+    latency_avg_seconds: Optional[float] = None  # 대기열 기록 ~ 발송 (프로세스 기동 이후)
+    latency_max_seconds: Optional[float] = None
+
+
+class AlertRuleCreate(BaseModel):
+    """알림 규칙 생성 요청"""
+    ticker: str = Field(..., min_length=1, max_length=10, description="종목 티커")
+    rule_type: Literal["pct_move", "price_above", "price_below", "drawdown"] = Field(
+        ..., description="변동률(%) / 가격 상향 돌파 / 가격 하향 이탈 / 평균 매수가 대비 하락률(%)"
+    )
+    threshold: float = Field(..., gt=0, description="기준값 (% 또는 USD 가격)")
+    
+    @validator('ticker')
+    def ticker_uppercase(cls, v):
+        return v.upper().strip()
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ticker": "AAPL",
+                "rule_type": "price_above",
+                "threshold": 250.0
+            }
+        }
+
+
+class AlertRuleResponse(BaseModel):
+    """알림 규칙 응답"""
+    id: int
+    ticker: str
+    rule_type: str
+    threshold: float
+    last_triggered_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
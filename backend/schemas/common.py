@@ -13,6 +13,8 @@ class ExchangeRateResponse(BaseModel):
     """환율 정보 응답"""
     usd_to_krw: float
     updated_at: datetime
+    age_seconds: float
+    is_stale: bool
 
 
 class HealthCheckResponse(BaseModel):
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 
 class HoldingBase(BaseModel):
@@ -13,11 +14,15 @@ class HoldingResponse(BaseModel):
     ticker: str
     name: str
     shares: float
-    avg_price: float
+    avg_price: float  # 평균 매입가 (current_price 와 같은 종목 거래 통화)
     current_price: Optional[float] = None
     value_krw: Optional[float] = None
     profit_pct: Optional[float] = None
     daily_change_pct: Optional[float] = None
+    weight_pct: Optional[float] = None  # 포트폴리오 내 평가액 비중 (%)
+    price_as_of: Optional[datetime] = None  # current_price 조회 시각
+    currency: str = "USD"  # avg_price / current_price 의 종목 거래 통화
+    reporting_currency: str = "KRW"  # value_krw 의 실제 표시 통화
     
     class Config:
         from_attributes = True
@@ -27,3 +32,22 @@ class HoldingDetail(HoldingResponse):
     """보유 종목 상세 (거래내역 포함)"""
     total_shares: float
     profit_krw: Optional[float] = None
+
+
+class PriceBar(BaseModel):
+    """일봉 (OHLCV)"""
+    price_date: date
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: float
+    volume: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class PriceHistoryResponse(BaseModel):
+    """종목 일봉 기간 조회 응답"""
+    ticker: str
+    bars: List[PriceBar]
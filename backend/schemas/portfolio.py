@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import date, datetime
 from typing import List
 from schemas.transaction import TransactionResponse
 
@@ -10,10 +11,14 @@ class StockDetailResponse(BaseModel):
     current_price: float | None
     daily_change_pct: float | None
     total_shares: float
-    avg_price: float
+    avg_price: float  # 평균 매입가 (current_price 와 같은 종목 거래 통화)
     value_krw: float | None
     profit_pct: float | None
     profit_krw: float | None
+    currency: str = "USD"  # avg_price / current_price 의 종목 거래 통화
+    reporting_currency: str = "KRW"  # *_krw 필드의 실제 표시 통화
+    price_source: str = "live"  # live | snapshot
+    price_as_of: datetime | None = None  # current_price 조회 시각
     transactions: List[TransactionResponse]
 
 
@@ -25,6 +30,9 @@ class PortfolioSummaryResponse(BaseModel):
     total_profit_pct: float
     exchange_rate: float
     holdings_count: int
+    reporting_currency: str = "KRW"  # *_krw 필드의 실제 표시 통화
+    price_source: str = "live"  # live | snapshot
+    prices_as_of: datetime | None = None  # 평가에 사용한 시세 중 가장 오래된 조회 시각
     
     class Config:
         json_schema_extra = {
@@ -34,6 +42,28 @@ class PortfolioSummaryResponse(BaseModel):
                 "total_profit_krw": 2000000,
                 "total_profit_pct": 15.38,
                 "exchange_rate": 1320.50,
-                "holdings_count": 5
+                "holdings_count": 5,
+                "reporting_currency": "KRW",
+                "price_source": "snapshot",
+                "prices_as_of": "2024-12-05T06:05:00"
             }
         }
+
+
+class PortfolioHistoryPoint(BaseModel):
+    """일별 포트폴리오 평가 기록"""
+    nav_date: date
+    value_krw: float
+    cost_krw: float
+    profit_krw: float
+    profit_pct: float
+    holdings_count: int
+    
+    class Config:
+        from_attributes = True
+
+
+class PortfolioHistoryResponse(BaseModel):
+    """포트폴리오 일별 평가 추이"""
+    history: List[PortfolioHistoryPoint]
+    reporting_currency: str = "KRW"  # *_krw 필드의 실제 표시 통화
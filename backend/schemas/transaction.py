@@ -31,6 +31,11 @@ class TransactionCreate(TransactionBase):
         }
 
 
+class TransactionBulkCreate(BaseModel):
+    """거래 일괄 생성 요청"""
+    transactions: list[TransactionCreate] = Field(..., min_length=1, max_length=10000)
+
+
 class TransactionResponse(TransactionBase):
     """거래 내역 응답"""
     id: int
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, Optional
+import pytz
+import logging
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from crud import alert as alert_crud
+from crud import alert_outbox as alert_outbox_crud
+
+logger = logging.getLogger(__name__)
+
+
+def as_utc(value: datetime) -> datetime:
+    """naive 시각(SQLite)은 UTC 로 간주"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=pytz.UTC)
+    return value.astimezone(pytz.UTC)
+
+
+class AlertDedupIndex:
+    """종목별 마지막 알림 시각 인덱스 (중복 알림 방지, thread-safe)
+    
+    스케줄러 시작시 최근 window 안의 알림을 쿼리 1회로 읽어 두고, 발송할 때마다
+    갱신한다. 중복 확인은 dict 조회뿐이라 DB 를 거치지 않는다. 적재 전이거나
+    invalidate() 로 비워진 경우 다음 확인 때 다시 적재한다.
+    """
+    
+    def __init__(self, window: timedelta):
+        """
+        Args:
+            window: 같은 종목 재알림 금지 기간
+        """
+        self.window = window
+        self._last_sent: Dict[str, datetime] = {}
+        self._loaded = False
+        self._lock = Lock()
+        self.suppressed = 0  # 중복으로 막은 알림 수
+    
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+    
+    def load(self, db: Session) -> int:
+        """alerts/alert_outbox 테이블에서 window 안의 종목별 마지막 알림 시각 적재
+        
+        Returns:
+            적재된 종목 수
+        """
+        since = datetime.now(pytz.UTC) - self.window
+        last_sent = {
+            ticker: as_utc(sent_at)
+            for ticker, sent_at in alert_crud.get_last_alert_times(db, since).items()
+        }
+        
+        # 발송 대기 중인 알림도 포함
+        for ticker, created_at in alert_outbox_crud.get_last_enqueued_times(db, since).items():
+            created_at = as_utc(created_at)
+            if ticker not in last_sent or created_at > last_sent[ticker]:
+                last_sent[ticker] = created_at
+        
+        with self._lock:
+            self._last_sent = last_sent
+            self._loaded = True
+        
+        logger.info(f"Alert dedup index loaded: {len(last_sent)} tickers")
+        return len(last_sent)
+    
+    def ensure_loaded(self, db: Session):
+        """적재되지 않았으면 적재"""
+        if not self._loaded:
+            self.load(db)
+    
+    def is_recent(self, ticker: str, now: Optional[datetime] = None) -> bool:
+        """window 안에 같은 종목 알림을 보냈는지 여부"""
+        now = now or datetime.now(pytz.UTC)
+        with self._lock:
+            sent_at = self._last_sent.get(ticker)
+            if sent_at is None:
+                return False
+            if now - sent_at >= self.window:
+                del self._last_sent[ticker]
+                return False
+            self.suppressed += 1
+            return True
+    
+    def record(self, ticker: str, sent_at: Optional[datetime] = None):
+        """알림 발송 기록"""
+        with self._lock:
+            self._last_sent[ticker] = as_utc(sent_at) if sent_at else datetime.now(pytz.UTC)
+    
+    def invalidate(self):
+        """인덱스 비우기 (다음 확인 때 DB 에서 다시 적재)"""
+        with self._lock:
+            self._last_sent.clear()
+            self._loaded = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 상태"""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "size": len(self._last_sent),
+                "window_seconds": self.window.total_seconds(),
+                "suppressed": self.suppressed,
+            }
+
+
+# 스케줄러 공용 중복 방지 인덱스
+alert_index = AlertDedupIndex(timedelta(minutes=settings.ALERT_DEDUP_WINDOW))
@@ -0,0 +1,154 @@
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import pytz
+import logging
+
+from database import SessionLocal
+from models import AlertOutbox
+from crud import alert_outbox as alert_outbox_crud
+from crud.alert_outbox import PendingAlert
+from services.email_service import EmailService
+from services.alert_dedup import as_utc
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대기 상한 (초)
+MAX_RETRY_BACKOFF = 3600
+
+
+class AlertDeliveryWorker:
+    """알림 대기열(alert_outbox) 발송 워커
+    
+    스케줄러는 감지한 알림을 대기열에 기록만 하고 바로 반환하며, 이 워커가
+    별도 스레드(스케줄러 작업)에서 발송 시각이 된 알림을 배치 단위로 보낸다.
+    다이제스트 모드에서는 배치를 메일 1통으로 보낸다. 실패한 알림은 지수
+    백오프로 재시도하고 ALERT_DELIVERY_MAX_ATTEMPTS 를 넘기면 failed 로 둔다.
+    발송 완료시 alerts 테이블에 기록하고 대기열 기록 ~ 발송 지연을 집계한다.
+    """
+    
+    def __init__(self, email_service: EmailService = None):
+        self.email_service = email_service or EmailService()
+        self.batch_size = settings.ALERT_DELIVERY_BATCH_SIZE
+        self.max_attempts = settings.ALERT_DELIVERY_MAX_ATTEMPTS
+        self.retry_backoff = settings.ALERT_DELIVERY_RETRY_BACKOFF
+        self._lock = Lock()
+        self.sent = 0
+        self.failed_attempts = 0
+        self.given_up = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_latency = None
+    
+    def _send(self, entries: List[AlertOutbox]) -> List[Optional[bool]]:
+        """배치 발송 (개별 발송은 첫 실패에서 중단)
+        
+        Returns:
+            알림별 발송 성공 여부 (시도하지 않은 알림은 None)
+        """
+        alerts = [
+            PendingAlert(
+                e.ticker, float(e.change_percent), float(e.price),
+                e.rule_id, e.rule_type, float(e.threshold) if e.threshold is not None else None
+            )
+            for e in entries
+        ]
+        
+        if settings.ALERT_DIGEST:
+            return [self.email_service.send_alert_digest(alerts)] * len(entries)
+        
+        results = [None] * len(entries)
+        for i, alert in enumerate(alerts):
+            results[i] = self.email_service.send_price_alert(*alert)
+            if not results[i]:
+                break
+        return results
+    
+    def _record_latency(self, latencies: List[float]):
+        with self._lock:
+            self.sent += len(latencies)
+            self.latency_total += sum(latencies)
+            self.latency_max = max(self.latency_max, *latencies)
+            self.last_latency = latencies[-1]
+    
+    def deliver_pending(self) -> int:
+        """발송 시각이 된 알림을 모두 발송 (배치 단위, 실패가 나오면 다음 실행으로 미룸)
+        
+        Returns:
+            발송 완료된 알림 수
+        """
+        delivered = 0
+        
+        while True:
+            db = SessionLocal()
+            try:
+                entries = alert_outbox_crud.claim_due(db, self.batch_size)
+                if not entries:
+                    break
+                
+                if not self.email_service.is_configured():
+                    given_up = alert_outbox_crud.mark_failed(
+                        db, entries, "email not configured", 0, 0, max_attempts=0
+                    )
+                    with self._lock:
+                        self.given_up += given_up
+                    logger.warning(f"Email not configured - dropped {given_up} queued alerts")
+                    break
+                
+                results = self._send(entries)
+                sent = [e for e, ok in zip(entries, results) if ok]
+                failed = [e for e, ok in zip(entries, results) if ok is False]
+                sent_at = datetime.now(pytz.UTC)
+                
+                latencies = [(sent_at - as_utc(e.created_at)).total_seconds() for e in sent]
+                if sent:
+                    alert_outbox_crud.mark_sent(db, sent, sent_at, commit=False)
+                given_up = 0
+                if failed:
+                    given_up = alert_outbox_crud.mark_failed(
+                        db, failed, "email send failed",
+                        self.retry_backoff, MAX_RETRY_BACKOFF, self.max_attempts,
+                        commit=False
+                    )
+                db.commit()
+                
+                if latencies:
+                    self._record_latency(latencies)
+                delivered += len(sent)
+                if failed:
+                    with self._lock:
+                        self.failed_attempts += len(failed)
+                        self.given_up += given_up
+                    logger.warning(
+                        f"Alert delivery failed for {len(failed)} alerts "
+                        f"({given_up} given up), retrying later"
+                    )
+                    break
+            
+            except Exception as e:
+                logger.error(f"Alert delivery error: {e}")
+                db.rollback()
+                break
+            finally:
+                db.close()
+        
+        if delivered:
+            logger.info(f"Delivered {delivered} queued alerts")
+        return delivered
+    
+    def stats(self) -> Dict[str, Any]:
+        """발송 통계 (지연: 대기열 기록 ~ 발송, 초)"""
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "failed_attempts": self.failed_attempts,
+                "given_up": self.given_up,
+                "latency_avg_seconds": round(self.latency_total / self.sent, 3) if self.sent else None,
+                "latency_max_seconds": round(self.latency_max, 3),
+                "last_latency_seconds": round(self.last_latency, 3) if self.last_latency is not None else None,
+            }
+
+
+# 스케줄러 공용 발송 워커
+alert_delivery = AlertDeliveryWorker()
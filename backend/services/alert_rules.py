@@ -0,0 +1,198 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import pytz
+import logging
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from crud import alert_rule as alert_rule_crud
+from services.alert_dedup import as_utc
+
+logger = logging.getLogger(__name__)
+
+RULE_TYPES = ("pct_move", "price_above", "price_below", "drawdown")
+
+
+class _SortedRules:
+    """기준값 오름차순 배열 + 같은 순서의 규칙 id (이진 탐색용)"""
+    
+    __slots__ = ("thresholds", "rule_ids")
+    
+    def __init__(self, pairs: List[Tuple[float, int]]):
+        pairs.sort()
+        self.thresholds = [threshold for threshold, _ in pairs]
+        self.rule_ids = [rule_id for _, rule_id in pairs]
+    
+    def up_to(self, value: float) -> List[int]:
+        """기준값 <= value 인 규칙"""
+        return self.rule_ids[:bisect_right(self.thresholds, value)]
+    
+    def between(self, low: float, high: float) -> List[int]:
+        """low < 기준값 <= high 인 규칙"""
+        return self.rule_ids[bisect_right(self.thresholds, low):bisect_right(self.thresholds, high)]
+    
+    def between_left(self, low: float, high: float) -> List[int]:
+        """low <= 기준값 < high 인 규칙"""
+        return self.rule_ids[bisect_left(self.thresholds, low):bisect_left(self.thresholds, high)]
+
+
+class AlertRuleIndex:
+    """알림 규칙 인덱스 (종목 -> 규칙 종류 -> 정렬된 기준값 배열)
+    
+    규칙을 종목별/종류별로 기준값 오름차순 배열에 담아 두고, 체크마다
+    종목당 이진 탐색 몇 번으로 발동한 규칙을 찾는다 (전체 규칙 순회 없음).
+    
+    - pct_move: |변동률| >= 기준값 -> 앞쪽 구간
+    - drawdown: 평균 매수가 대비 하락률 >= 기준값 -> 앞쪽 구간
+    - price_above: 직전 가격 < 기준값 <= 현재가 (돌파)
+    - price_below: 현재가 <= 기준값 < 직전 가격 (이탈)
+    
+    직전 가격은 이전 체크의 가격이며, 처음에는 전일 종가를 쓴다. 발동한
+    규칙은 cooldown 동안 다시 발동하지 않는다. 규칙 테이블의 추가/삭제는
+    체크마다 (개수, 최대 id) 로 감지해 인덱스를 다시 만든다.
+    """
+    
+    def __init__(self, cooldown: timedelta):
+        """
+        Args:
+            cooldown: 같은 규칙 재발동 금지 기간
+        """
+        self.cooldown = cooldown
+        self._index: Dict[str, Dict[str, _SortedRules]] = {}
+        self._rules: Dict[int, Tuple[str, float]] = {}  # id -> (rule_type, threshold)
+        self._last_triggered: Dict[int, datetime] = {}
+        self._last_price: Dict[str, float] = {}
+        self._signature = None
+        self._lock = Lock()
+        self.rule_count = 0
+        self.builds = 0
+        self.triggered = 0
+    
+    @property
+    def tickers(self) -> Set[str]:
+        """규칙이 있는 종목"""
+        return set(self._index)
+    
+    def build(self, rules: Iterable[Tuple[int, str, str, float, Optional[datetime]]]):
+        """인덱스 생성
+        
+        Args:
+            rules: [(id, ticker, rule_type, threshold, last_triggered_at), ...]
+        """
+        grouped: Dict[str, Dict[str, List[Tuple[float, int]]]] = {}
+        by_id = {}
+        last_triggered = {}
+        count = 0
+        for rule_id, ticker, rule_type, threshold, triggered_at in rules:
+            if rule_type not in RULE_TYPES:
+                logger.warning(f"Unknown alert rule type {rule_type!r} (rule {rule_id})")
+                continue
+            grouped.setdefault(ticker, {}).setdefault(rule_type, []).append((float(threshold), rule_id))
+            by_id[rule_id] = (rule_type, float(threshold))
+            if triggered_at is not None:
+                last_triggered[rule_id] = as_utc(triggered_at)
+            count += 1
+        
+        index = {
+            ticker: {rule_type: _SortedRules(pairs) for rule_type, pairs in by_type.items()}
+            for ticker, by_type in grouped.items()
+        }
+        with self._lock:
+            self._index = index
+            self._rules = by_id
+            self._last_triggered = last_triggered
+            self.rule_count = count
+            self.builds += 1
+    
+    def rule(self, rule_id: int) -> Optional[Tuple[str, float]]:
+        """규칙 종류와 기준값 (인덱스에 없으면 None)"""
+        return self._rules.get(rule_id)
+    
+    def ensure_fresh(self, db: Session) -> bool:
+        """규칙 테이블이 바뀌었으면 인덱스 재생성
+        
+        Returns:
+            재생성 여부
+        """
+        signature = alert_rule_crud.get_rules_signature(db)
+        if signature == self._signature:
+            return False
+        
+        self.build(
+            (r.id, r.ticker, r.rule_type, r.threshold, r.last_triggered_at)
+            for r in alert_rule_crud.get_rules(db)
+        )
+        self._signature = signature
+        logger.info(f"Alert rule index built: {self.rule_count} rules, {len(self._index)} tickers")
+        return True
+    
+    def evaluate(
+        self,
+        ticker: str,
+        price: float,
+        previous_close: Optional[float] = None,
+        change_percent: Optional[float] = None,
+        avg_cost: Optional[float] = None,
+        now: Optional[datetime] = None
+    ) -> List[int]:
+        """발동한 규칙 id (재발동 금지 기간 제외, 발동 시각 기록)
+        
+        Args:
+            ticker: 종목 심볼
+            price: 현재가
+            previous_close: 전일 종가 (첫 체크의 돌파 기준)
+            change_percent: 전일 대비 변동률 (%)
+            avg_cost: 평균 매수가 (보유 종목만)
+            now: 기준 시각 (기본: 현재)
+            
+        Returns:
+            발동한 규칙 id 리스트
+        """
+        rules = self._index.get(ticker)
+        previous = self._last_price.get(ticker, previous_close)
+        self._last_price[ticker] = price
+        if not rules:
+            return []
+        
+        candidates = []
+        if change_percent is not None and "pct_move" in rules:
+            candidates += rules["pct_move"].up_to(abs(change_percent))
+        if previous is not None:
+            if price > previous and "price_above" in rules:
+                candidates += rules["price_above"].between(previous, price)
+            elif price < previous and "price_below" in rules:
+                candidates += rules["price_below"].between_left(price, previous)
+        if avg_cost and price < avg_cost and "drawdown" in rules:
+            candidates += rules["drawdown"].up_to((avg_cost - price) / avg_cost * 100)
+        
+        if not candidates:
+            return []
+        
+        now = now or datetime.now(pytz.UTC)
+        fired = []
+        with self._lock:
+            for rule_id in candidates:
+                triggered_at = self._last_triggered.get(rule_id)
+                if triggered_at is not None and now - triggered_at < self.cooldown:
+                    continue
+                self._last_triggered[rule_id] = now
+                fired.append(rule_id)
+            self.triggered += len(fired)
+        return fired
+    
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 상태"""
+        with self._lock:
+            return {
+                "rules": self.rule_count,
+                "tickers": len(self._index),
+                "builds": self.builds,
+                "triggered": self.triggered,
+            }
+
+
+# 스케줄러 공용 규칙 인덱스 (재발동 금지 기간은 ALERT_DEDUP_WINDOW)
+rule_index = AlertRuleIndex(timedelta(minutes=settings.ALERT_DEDUP_WINDOW))
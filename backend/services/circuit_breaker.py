@@ -0,0 +1,183 @@
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, Set, Tuple
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NegativeCache:
+    """조회 실패 키 캐시 (지수 백오프, thread-safe)
+    
+    실패할 때마다 재시도 대기 시간을 base_backoff * 2^(연속 실패 - 1) 초로
+    늘리고(max_backoff 상한), 성공하면 기록을 지운다. 대기 중인 키는
+    upstream 을 호출하지 않고 바로 실패/마지막 값으로 처리한다.
+    """
+    
+    def __init__(self, base_backoff: float, max_backoff: float):
+        """
+        Args:
+            base_backoff: 첫 실패 후 대기 시간 (초)
+            max_backoff: 최대 대기 시간 (초)
+        """
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._entries: Dict[Hashable, Tuple[int, float]] = {}  # key -> (연속 실패 수, 재시도 가능 시각)
+        self._lock = Lock()
+        self.skipped = 0  # 대기 중이라 호출을 건너뛴 횟수
+    
+    def blocked(self, keys: Iterable[Hashable]) -> Set[Hashable]:
+        """재시도 대기 중인 키 목록"""
+        now = time.monotonic()
+        with self._lock:
+            result = {
+                key for key in keys
+                if key in self._entries and self._entries[key][1] > now
+            }
+            self.skipped += len(result)
+            return result
+    
+    def is_blocked(self, key: Hashable) -> bool:
+        """재시도 대기 중 여부"""
+        return bool(self.blocked([key]))
+    
+    def record_failure(self, key: Hashable) -> float:
+        """실패 기록
+        
+        Returns:
+            다음 재시도까지 대기 시간 (초)
+        """
+        with self._lock:
+            failures = self._entries.get(key, (0, 0.0))[0] + 1
+            backoff = min(self.base_backoff * 2 ** (failures - 1), self.max_backoff)
+            self._entries[key] = (failures, time.monotonic() + backoff)
+        
+        logger.warning(f"{key}: upstream failure #{failures}, retry in {backoff:.0f}s")
+        return backoff
+    
+    def record_success(self, key: Hashable):
+        """성공 기록 (실패 이력 삭제)"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """초기화 (테스트용)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """대기 중인 키와 연속 실패 수"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "skipped": self.skipped,
+                "entries": {
+                    str(key): {
+                        "failures": failures,
+                        "retry_in": round(max(retry_at - now, 0.0), 1),
+                    }
+                    for key, (failures, retry_at) in self._entries.items()
+                },
+            }
+
+
+class CircuitBreaker:
+    """upstream 전체 장애 차단기 (closed -> open -> half_open)
+    
+    연속 실패가 failure_threshold 에 이르면 open 되어 reset_timeout 초 동안
+    호출을 막는다. 이후 한 번의 시험 호출(half_open)이 성공하면 closed,
+    실패하면 다시 open 된다. open 동안 호출자는 마지막으로 받은 값을 쓴다.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        """
+        Args:
+            name: 차단기 이름 (로그/진단용)
+            failure_threshold: open 전환 연속 실패 수
+            reset_timeout: open 유지 시간 (초)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = Lock()
+        self.rejected = 0    # open 상태라 막은 호출 수
+        self.open_count = 0  # open 전환 횟수
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+    
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """upstream 호출 허용 여부 (half_open 에서는 시험 호출 1건만 허용)"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def record_success(self):
+        """호출 성공"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"[{self.name}] circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        """호출 실패 (임계값 도달 또는 시험 호출 실패시 open)"""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.open_count += 1
+                    logger.error(
+                        f"[{self.name}] circuit open after {self._failures} failures "
+                        f"(retry in {self.reset_timeout}s)"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+    
+    def reset(self):
+        """closed 로 초기화 (테스트용)"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """차단기 상태"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": round(max(self.reset_timeout - (now - self._opened_at), 0.0), 1)
+                if state == self.OPEN else 0.0,
+                "open_count": self.open_count,
+                "rejected": self.rejected,
+            }
@@ -2,14 +2,168 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import time
 import logging
 from core.config import settings
+from core.metrics import email_send_duration
+from crud.alert_outbox import PendingAlert
 
 logger = logging.getLogger(__name__)
 
 
+def describe_condition(rule_type: Optional[str] = None, threshold: Optional[float] = None) -> str:
+    """알림 발동 조건 설명 (규칙이 없으면 전역 임계값)"""
+    if rule_type is None:
+        return f"전일 대비 ±{settings.PRICE_ALERT_THRESHOLD}% 이상 변동"
+    threshold = float(threshold)
+    if rule_type == "pct_move":
+        return f"전일 대비 ±{threshold:.2f}% 이상 변동"
+    if rule_type == "price_above":
+        return f"${threshold:,.2f} 상향 돌파"
+    if rule_type == "price_below":
+        return f"${threshold:,.2f} 하향 이탈"
+    if rule_type == "drawdown":
+        return f"평균 매수가 대비 {threshold:.2f}% 이상 하락"
+    return f"{rule_type} {threshold}"
+
+
+class SMTPSession:
+    """재사용 SMTP 연결 (thread-safe)
+    
+    처음 보낼 때 한 번 연결/로그인하고 이후 메일은 같은 연결로 보낸다.
+    noop_after 초 이상 쉬었던 연결은 NOOP 으로 살아 있는지 확인하고,
+    서버가 끊은 연결은 다시 연결해 한 번 재시도한다.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        use_ssl: bool = True,
+        timeout: float = 10,
+        noop_after: float = 30
+    ):
+        """
+        Args:
+            host: SMTP 서버
+            port: SMTP 포트
+            user: 로그인 계정
+            password: 로그인 비밀번호
+            use_ssl: SMTP_SSL 사용 여부 (False 면 평문 SMTP, 로컬 테스트 서버용)
+            timeout: 소켓 타임아웃 (초)
+            noop_after: 이 시간(초) 이상 쉰 연결은 보내기 전 NOOP 확인
+        """
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.noop_after = noop_after
+        self._server = None
+        self._last_used = 0.0
+        self._lock = Lock()
+        self.connects = 0  # 연결(로그인) 횟수
+        self.sent = 0      # 보낸 메일 수
+    
+    def _connect(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.connects += 1
+        logger.info(f"SMTP connected: {self.host}:{self.port}")
+    
+    def _discard(self):
+        """현재 연결 버림 (오류 무시)"""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+            self._server = None
+    
+    def _ensure_connected(self):
+        if self._server is not None and time.monotonic() - self._last_used >= self.noop_after:
+            try:
+                if self._server.noop()[0] != 250:
+                    self._discard()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+                self._server = None
+        
+        if self._server is None:
+            self._connect()
+    
+    def send(self, msg: MIMEMultipart):
+        """메일 발송 (연결이 끊겼으면 재연결 후 1회 재시도)
+        
+        Raises:
+            smtplib.SMTPException, OSError: 발송 실패
+        """
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                for attempt in (1, 2):
+                    self._ensure_connected()
+                    try:
+                        self._server.send_message(msg)
+                        break
+                    except (smtplib.SMTPServerDisconnected, OSError):
+                        self._server.close()
+                        self._server = None
+                        if attempt == 2:
+                            raise
+                        logger.info("SMTP connection lost, reconnecting")
+            except Exception:
+                email_send_duration.observe(time.perf_counter() - started, "error")
+                raise
+            email_send_duration.observe(time.perf_counter() - started, "sent")
+            
+            self._last_used = time.monotonic()
+            self.sent += 1
+    
+    def check(self):
+        """연결/로그인 확인 (실패시 예외)"""
+        with self._lock:
+            self._ensure_connected()
+            self._last_used = time.monotonic()
+    
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._discard()
+    
+    def stats(self) -> Dict[str, Any]:
+        """연결 통계"""
+        with self._lock:
+            return {
+                "connected": self._server is not None,
+                "connects": self.connects,
+                "sent": self.sent,
+            }
+
+
+# 프로세스 공용 SMTP 연결
+smtp_session = SMTPSession(
+    settings.SMTP_HOST,
+    settings.SMTP_PORT,
+    settings.SMTP_USER,
+    settings.SMTP_PASSWORD,
+    use_ssl=settings.SMTP_USE_SSL
+)
+
+
 class EmailService:
-    """이메일 알림 서비스 (Gmail SMTP)"""
+    """이메일 알림 서비스 (Gmail SMTP, 공용 연결 재사용)"""
     
     def __init__(self):
         self.smtp_host = settings.SMTP_HOST
@@ -17,6 +171,7 @@ class EmailService:
         self.smtp_user = settings.SMTP_USER
         self.smtp_password = settings.SMTP_PASSWORD
         self.alert_email = settings.ALERT_EMAIL
+        self.session = smtp_session
     
     def is_configured(self) -> bool:
         """이메일 설정 완료 여부 확인"""
@@ -26,13 +181,13 @@ class EmailService:
             self.alert_email
         ])
     
-    def send_price_alert(self, ticker: str, change_percent: float, current_price: float) -> bool:
-        """가격 변동 알림 이메일 발송
+    def _send(self, subject: str, body: str, description: str) -> bool:
+        """HTML 메일 발송
         
         Args:
-            ticker: 종목 심볼
-            change_percent: 변동률 (%)
-            current_price: 현재가
+            subject: 제목
+            body: HTML 본문
+            description: 로그용 설명
             
         Returns:
             발송 성공 여부
@@ -42,39 +197,6 @@ class EmailService:
             return False
         
         try:
-            # 이메일 제목
-            subject = f"🚨 [{ticker}] {change_percent:+.2f}% 가격 변동 알림"
-            
-            # 색상 결정
-            color = '#EF4444' if change_percent < 0 else '#3B82F6'
-            
-            # HTML 본문
-            body = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2 style="color: {color};">
-                    가격 변동 알림
-                </h2>
-                <hr style="border: 1px solid #e5e7eb;">
-                <div style="margin: 20px 0;">
-                    <p><strong>종목:</strong> {ticker}</p>
-                    <p>
-                        <strong>변동률:</strong> 
-                        <span style="font-size: 24px; font-weight: bold; color: {color};">
-                            {change_percent:+.2f}%
-                        </span>
-                    </p>
-                    <p><strong>현재가:</strong> ${current_price:.2f}</p>
-                    <p><strong>시간:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                </div>
-                <hr style="border: 1px solid #e5e7eb;">
-                <p style="color: #6b7280; font-size: 12px; margin-top: 20px;">
-                    이 알림은 {settings.PRICE_ALERT_THRESHOLD}% 이상의 가격 변동 발생시 자동으로 전송됩니다.
-                </p>
-            </body>
-            </html>
-            """
-            
             # 메시지 생성
             msg = MIMEMultipart('alternative')
             msg['Subject'] = subject
@@ -84,14 +206,12 @@ class EmailService:
             html_part = MIMEText(body, 'html', 'utf-8')
             msg.attach(html_part)
             
-            # SMTP 전송
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=10) as server:
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            # SMTP 전송 (공용 연결)
+            self.session.send(msg)
             
-            logger.info(f"Alert email sent: {ticker} ({change_percent:+.2f}%)")
+            logger.info(f"Alert email sent: {description}")
             return True
-            
+        
         except smtplib.SMTPException as e:
             logger.error(f"SMTP error sending email: {e}")
             return False
@@ -99,6 +219,131 @@ class EmailService:
             logger.error(f"Failed to send email: {e}")
             return False
     
+    def send_price_alert(
+        self,
+        ticker: str,
+        change_percent: float,
+        current_price: float,
+        rule_id: Optional[int] = None,
+        rule_type: Optional[str] = None,
+        threshold: Optional[float] = None
+    ) -> bool:
+        """가격 변동 알림 이메일 발송
+        
+        Args:
+            ticker: 종목 심볼
+            change_percent: 변동률 (%)
+            current_price: 현재가
+            rule_id: 발동한 알림 규칙 id (전역 임계값 알림은 None)
+            rule_type: 규칙 종류 (pct_move / price_above / price_below / drawdown)
+            threshold: 규칙 기준값
+            
+        Returns:
+            발송 성공 여부
+        """
+        condition = describe_condition(rule_type, threshold)
+        
+        # 제목/문구 (규칙 알림은 규칙 조건 표시)
+        if rule_id is None:
+            title = "가격 변동 알림"
+            subject = f"🚨 [{ticker}] {change_percent:+.2f}% 가격 변동 알림"
+            footer = f"이 알림은 {settings.PRICE_ALERT_THRESHOLD}% 이상의 가격 변동 발생시 자동으로 전송됩니다."
+        else:
+            title = "알림 규칙 발동"
+            subject = f"🔔 [{ticker}] 알림 규칙: {condition}"
+            footer = f"이 알림은 등록한 알림 규칙 #{rule_id} ({condition}) 이 발동해 전송됩니다."
+        
+        # 색상 결정
+        color = '#EF4444' if change_percent < 0 else '#3B82F6'
+        
+        # HTML 본문
+        body = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; padding: 20px;">
+            <h2 style="color: {color};">
+                {title}
+            </h2>
+            <hr style="border: 1px solid #e5e7eb;">
+            <div style="margin: 20px 0;">
+                <p><strong>종목:</strong> {ticker}</p>
+                <p><strong>조건:</strong> {condition}</p>
+                <p><strong>현재가:</strong> ${current_price:.2f}</p>
+                <p>
+                    <strong>변동률:</strong>
+                    <span style="font-size: 24px; font-weight: bold; color: {color};">
+                        {change_percent:+.2f}%
+                    </span>
+                </p>
+                <p><strong>시간:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            </div>
+            <hr style="border: 1px solid #e5e7eb;">
+            <p style="color: #6b7280; font-size: 12px; margin-top: 20px;">
+                {footer}
+            </p>
+        </body>
+        </html>
+        """
+        
+        description = f"{ticker} ({change_percent:+.2f}%)"
+        if rule_id is not None:
+            description += f" rule #{rule_id}"
+        return self._send(subject, body, description)
+    
+    def send_alert_digest(self, alerts: List[PendingAlert]) -> bool:
+        """한 번의 체크에서 발생한 알림을 메일 1통으로 발송
+        
+        Args:
+            alerts: [PendingAlert, ...] (전역 임계값 알림과 규칙 알림)
+            
+        Returns:
+            발송 성공 여부
+        """
+        if not alerts:
+            return True
+        
+        alerts = sorted(alerts, key=lambda a: abs(a.change_percent), reverse=True)
+        tickers = list(dict.fromkeys(a.ticker for a in alerts))
+        subject = f"🚨 가격 변동 알림 {len(alerts)}건 ({', '.join(tickers[:5])}"
+        subject += ", ...)" if len(tickers) > 5 else ")"
+        
+        rows = "".join(
+            f"""
+                <tr>
+                    <td style="padding: 6px 12px;"><strong>{alert.ticker}</strong></td>
+                    <td style="padding: 6px 12px;">{describe_condition(alert.rule_type, alert.threshold)}</td>
+                    <td style="padding: 6px 12px; font-weight: bold; color: {'#EF4444' if alert.change_percent < 0 else '#3B82F6'};">
+                        {alert.change_percent:+.2f}%
+                    </td>
+                    <td style="padding: 6px 12px;">${alert.price:.2f}</td>
+                </tr>"""
+            for alert in alerts
+        )
+        
+        # HTML 본문
+        body = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; padding: 20px;">
+            <h2>가격 변동 알림 ({len(alerts)}건)</h2>
+            <hr style="border: 1px solid #e5e7eb;">
+            <table style="margin: 20px 0; border-collapse: collapse;">
+                <tr style="color: #6b7280; text-align: left;">
+                    <th style="padding: 6px 12px;">종목</th>
+                    <th style="padding: 6px 12px;">조건</th>
+                    <th style="padding: 6px 12px;">변동률</th>
+                    <th style="padding: 6px 12px;">현재가</th>
+                </tr>{rows}
+            </table>
+            <p><strong>시간:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <hr style="border: 1px solid #e5e7eb;">
+            <p style="color: #6b7280; font-size: 12px; margin-top: 20px;">
+                이 알림은 {settings.PRICE_ALERT_THRESHOLD}% 이상의 가격 변동 또는 등록한 알림 규칙 발동시 자동으로 전송됩니다.
+            </p>
+        </body>
+        </html>
+        """
+        
+        return self._send(subject, body, f"digest of {len(alerts)} alerts")
+    
     def test_connection(self) -> bool:
         """이메일 서버 연결 테스트
         
@@ -110,8 +355,7 @@ class EmailService:
             return False
         
         try:
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=10) as server:
-                server.login(self.smtp_user, self.smtp_password)
+            self.session.check()
             logger.info("Email connection test successful")
             return True
         except smtplib.SMTPException as e:
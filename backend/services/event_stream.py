@@ -0,0 +1,230 @@
+import asyncio
+import json
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Optional, Set, Tuple
+import logging
+
+from database import SessionLocal
+from crud import alert as alert_crud
+from crud import price_snapshot as price_snapshot_crud
+from services.forex_service import rate_provider
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (이벤트 id, 이벤트 종류, 데이터)
+Message = Tuple[int, str, Any]
+
+
+def format_sse(message: Message) -> str:
+    """SSE 메시지 형식으로 변환"""
+    event_id, event, data = message
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class Subscriber:
+    """스트림 구독자 1명 (연결된 클라이언트의 이벤트 루프와 큐)"""
+    
+    __slots__ = ("loop", "queue")
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+
+class EventHub:
+    """프로세스 공용 이벤트 fan-out (백그라운드 스레드 -> asyncio 구독자)
+    
+    publish 는 어느 스레드에서든 호출할 수 있고, 이벤트를 모든 구독자 큐에
+    넣는다. 큐가 찬 느린 구독자는 가장 오래된 이벤트를 버린다. retain 으로
+    넘긴 값은 종류별로 보관했다가 새 구독자에게 먼저 보낸다 (현재 상태).
+    """
+    
+    def __init__(self, queue_size: int):
+        """
+        Args:
+            queue_size: 구독자별 최대 대기 이벤트 수
+        """
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self._retained: Dict[str, Message] = {}
+        self._lock = Lock()
+        self._next_id = 0
+        self.published = 0
+        self.dropped = 0
+    
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+    
+    def subscribe(self) -> Subscriber:
+        """구독 시작 (이벤트 루프 안에서 호출, 보관된 현재 상태를 먼저 넣음)"""
+        subscriber = Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            for message in sorted(self._retained.values()):
+                subscriber.queue.put_nowait(message)
+            self._subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber):
+        """구독 종료"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+    
+    def publish(self, event: str, data: Any, retain: Any = None):
+        """이벤트 발행
+        
+        Args:
+            event: 이벤트 종류
+            data: 구독자에게 보낼 데이터
+            retain: 새 구독자에게 보낼 현재 상태 (None 이면 보관하지 않음)
+        """
+        with self._lock:
+            self._next_id += 1
+            message = (self._next_id, event, data)
+            if retain is not None:
+                self._retained[event] = (self._next_id, event, retain)
+            subscribers = list(self._subscribers)
+            self.published += 1
+        
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, message)
+            except RuntimeError:  # 이벤트 루프 종료
+                self.unsubscribe(subscriber)
+    
+    def _deliver(self, subscriber: Subscriber, message: Message):
+        """구독자 큐에 넣기 (구독자 이벤트 루프에서 실행)"""
+        if subscriber.queue.full():
+            subscriber.queue.get_nowait()
+            self.dropped += 1
+        subscriber.queue.put_nowait(message)
+    
+    def stats(self) -> Dict[str, Any]:
+        """fan-out 상태"""
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped": self.dropped,
+            "retained": sorted(self._retained),
+        }
+
+
+class StreamPoller:
+    """스트림 이벤트 수집기 (프로세스당 1개, 구독자 수와 무관하게 한 번만 조회)
+    
+    STREAM_POLL_INTERVAL 초마다 스케줄러가 기록한 시세 스냅샷, 새 알림
+    (alerts 테이블), 프로세스 공용 환율 제공자의 갱신을 확인해 EventHub 로
+    발행한다. 스케줄러는 리더 워커에서만 돌기 때문에 워커 간 전달은 DB 를
+    거치며, 구독자가 없으면 조회하지 않는다.
+    """
+    
+    def __init__(self, hub: EventHub, interval: float = None):
+        """
+        Args:
+            hub: 이벤트 fan-out
+            interval: 확인 주기 (초)
+        """
+        self.hub = hub
+        self.interval = interval or settings.STREAM_POLL_INTERVAL
+        self._prices: Dict[str, dict] = {}
+        self._prices_since: Optional[datetime] = None
+        self._last_alert_id: Optional[int] = None
+        self._fx_updated_at: Optional[datetime] = None
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+        self.polls = 0
+    
+    def poll(self):
+        """스냅샷/알림/환율 변경 확인 1회"""
+        db = SessionLocal()
+        try:
+            snapshots = price_snapshot_crud.get_snapshots_since(db, self._prices_since)
+            if snapshots:
+                changed = {
+                    s.ticker: {
+                        "price": float(s.price),
+                        "previous_close": float(s.previous_close) if s.previous_close is not None else None,
+                        "change_pct": float(s.change_pct) if s.change_pct is not None else None,
+                        "fetched_at": s.fetched_at.isoformat(),
+                    }
+                    for s in snapshots
+                }
+                self._prices.update(changed)
+                self._prices_since = snapshots[-1].fetched_at
+                self.hub.publish("prices", changed, retain=dict(self._prices))
+            
+            # 구독자가 없던 동안의 알림은 새 알림으로 보내지 않음
+            if self._last_alert_id is None:
+                self._last_alert_id = alert_crud.get_last_alert_id(db)
+            for alert in alert_crud.get_alerts_after(db, self._last_alert_id):
+                self.hub.publish("alert", {
+                    "id": alert.id,
+                    "ticker": alert.ticker,
+                    "change_percent": float(alert.change_percent),
+                    "price": float(alert.price),
+                    "rule_id": alert.rule_id,
+                    "rule_type": alert.rule_type,
+                    "threshold": float(alert.threshold) if alert.threshold is not None else None,
+                    "sent_at": alert.sent_at.isoformat(),
+                })
+                self._last_alert_id = alert.id
+        finally:
+            db.close()
+        
+        rate = rate_provider.get_usd_to_krw()
+        updated_at = rate_provider.updated_at
+        if rate and updated_at != self._fx_updated_at:
+            self._fx_updated_at = updated_at
+            data = {
+                "usd_to_krw": rate,
+                "updated_at": updated_at.isoformat(),
+                "age_seconds": round(rate_provider.age_seconds(), 1),
+                "is_stale": rate_provider.is_stale(),
+            }
+            self.hub.publish("exchange_rate", data, retain=data)
+        
+        self.polls += 1
+    
+    def start(self):
+        """확인 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def loop():
+            while not self._stop_event.wait(self.interval):
+                if not self.hub.subscriber_count:
+                    self._last_alert_id = None
+                    continue
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error(f"Event stream poll failed: {e}")
+        
+        self._thread = Thread(target=loop, name="event-stream-poller", daemon=True)
+        self._thread.start()
+        logger.info(f"Event stream poller started (every {self.interval}s)")
+    
+    def stop(self):
+        """확인 스레드 종료"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """수집 상태"""
+        return {
+            "polls": self.polls,
+            "tickers": len(self._prices),
+            "last_alert_id": self._last_alert_id,
+        }
+
+
+# 모든 스트림 연결이 공유하는 fan-out 과 수집기
+event_hub = EventHub(settings.STREAM_QUEUE_SIZE)
+stream_poller = StreamPoller(event_hub)
@@ -1,66 +1,279 @@
 import requests
-from typing import Optional
-from datetime import datetime, timedelta
+from array import array
+from typing import Dict, Optional
+from datetime import datetime
+from threading import Event, Lock, Thread
+from sqlalchemy.orm import Session
 import logging
 from core.config import settings
+from services.singleflight import SingleFlight
+from services.market_data import market_data, MarketDataError
+from core.metrics import fx_cache_requests
 
 logger = logging.getLogger(__name__)
 
+# 캐시 만료 시 환율 API 동시 호출을 하나로 합침 (모든 인스턴스 공유)
+forex_flight = SingleFlight("forex")
 
-class ForexService:
-    """환율 정보 조회 서비스 (ExchangeRate-API)"""
+
+class RatesTable:
+    """환율 API 응답 전체를 담는 읽기 전용 환율표
+    
+    통화 코드 -> 인덱스 dict 와 double 배열로 보관하며,
+    모든 환율은 base 통화 1단위 기준이다.
+    """
+    
+    __slots__ = ("base", "_index", "_rates")
+    
+    def __init__(self, base: str, rates: Dict[str, float]):
+        self.base = base.upper()
+        items = sorted((code.upper(), float(value)) for code, value in rates.items())
+        self._index = {code: i for i, (code, _) in enumerate(items)}
+        self._rates = array('d', (value for _, value in items))
+        if self.base not in self._index:
+            self._index[self.base] = len(self._rates)
+            self._rates.append(1.0)
+    
+    def __contains__(self, currency: str) -> bool:
+        return currency.upper() in self._index
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    @property
+    def currencies(self) -> list:
+        return list(self._index)
+    
+    def rate(self, base: str, quote: str) -> Optional[float]:
+        """교차 환율 계산 (base 1단위당 quote)
+        
+        Returns:
+            환율 또는 None (지원하지 않는 통화)
+        """
+        i = self._index.get(base.upper())
+        j = self._index.get(quote.upper())
+        if i is None or j is None or not self._rates[i]:
+            return None
+        return self._rates[j] / self._rates[i]
+
+
+class ExchangeRateProvider:
+    """프로세스 공용 환율 제공자 (stale-while-revalidate)
+    
+    마지막으로 받은 환율표를 즉시 반환하고, 만료 FX_REFRESH_AHEAD 초 전부터는
+    백그라운드에서 갱신한다. 값이 하나도 없을 때(최초 조회)만 호출자가
+    API 응답을 기다린다.
+    """
     
     def __init__(self):
         self.api_url = settings.EXCHANGE_RATE_API_URL
-        self._cache: Optional[float] = None
-        self._cache_time: Optional[datetime] = None
-        self._cache_duration = timedelta(minutes=5)  # 5분 캐싱
+        self.ttl = settings.FX_CACHE_TTL
+        self.refresh_ahead = settings.FX_REFRESH_AHEAD
+        self._table: Optional[RatesTable] = None
+        self._updated_at: Optional[datetime] = None
+        self._lock = Lock()
+        self._refreshing = False
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
     
-    def get_usd_to_krw(self) -> Optional[float]:
-        """현재 USD/KRW 환율 조회 (5분 캐싱 적용)"""
-        now = datetime.now()
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        """마지막 갱신 시각"""
+        return self._updated_at
+    
+    def age_seconds(self) -> Optional[float]:
+        """현재 환율 값의 경과 시간 (초, 값이 없으면 None)"""
+        if self._updated_at is None:
+            return None
+        return (datetime.now() - self._updated_at).total_seconds()
+    
+    def is_stale(self) -> bool:
+        """TTL 초과 여부"""
+        age = self.age_seconds()
+        return age is None or age >= self.ttl
+    
+    def get_rates_table(self) -> Optional[RatesTable]:
+        """환율표 조회 (캐시 값 즉시 반환, 필요시 백그라운드 갱신)"""
+        if self._table is None:
+            fx_cache_requests.inc("miss")
+            return self.refresh()
         
-        # 캐시 유효성 체크
-        if self._cache and self._cache_time:
-            if now - self._cache_time < self._cache_duration:
-                logger.debug(f"Using cached exchange rate: {self._cache}")
-                return self._cache
+        age = self.age_seconds()
+        if age >= self.ttl - self.refresh_ahead:
+            fx_cache_requests.inc("stale")
+            self._refresh_in_background()
+        else:
+            fx_cache_requests.inc("hit")
         
-        # API 호출
+        return self._table
+    
+    def get_rate(self, base: str, quote: str) -> Optional[float]:
+        """교차 환율 조회 (추가 네트워크 호출 없이 환율표에서 계산)"""
+        if base.upper() == quote.upper():
+            return 1.0
+        
+        table = self.get_rates_table()
+        if table is None:
+            return None
+        
+        rate = table.rate(base, quote)
+        if rate is None:
+            logger.warning(f"{base}/{quote} rate not found in rates table")
+        return rate
+    
+    def get_usd_to_krw(self) -> Optional[float]:
+        """USD/KRW 환율 조회"""
+        return self.get_rate("USD", "KRW")
+    
+    def refresh(self) -> Optional[RatesTable]:
+        """환율 API 를 호출해 환율표 갱신 (실패시 기존 값 유지)
+        
+        어떤 오류도 호출자(요청, 백그라운드 갱신 스레드)로 넘기지 않는다.
+        예상하지 못한 오류(응답 형식 변경 등)는 스택과 함께 기록한다.
+        """
         try:
-            logger.info("Fetching exchange rate from API...")
-            response = requests.get(self.api_url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            krw_rate = data.get('rates', {}).get('KRW')
-            if krw_rate:
-                self._cache = float(krw_rate)
-                self._cache_time = now
-                logger.info(f"Exchange rate updated: {self._cache}")
-                return self._cache
-            
-            logger.warning("KRW rate not found in API response")
+            table = forex_flight.do(self.api_url, self._fetch_rates_table)
+        except (requests.exceptions.RequestException, MarketDataError, ValueError) as e:
+            logger.error(f"Error fetching exchange rate: {e}")
+            if self._table:
+                logger.info("Returning cached rates table due to API error")
+            return self._table
+        except Exception:
+            logger.exception("Unexpected error refreshing exchange rates, keeping previous table")
+            return self._table
+        
+        if table is None:
+            logger.warning("Rates not found in API response")
+            return self._table
+        
+        with self._lock:
+            self._table = table
+            self._updated_at = datetime.now()
+        return table
+    
+    def _fetch_rates_table(self) -> Optional[RatesTable]:
+        """환율 API 호출 (전체 통화 환율표, MARKET_DATA_PROVIDER 경유)"""
+        logger.info(f"Fetching exchange rate from {market_data.name}...")
+        data = market_data.get_fx_rates()
+        
+        rates = data.get('rates')
+        if not rates:
             return None
+        
+        table = RatesTable(data.get('base', 'USD'), rates)
+        logger.info(f"Exchange rates updated: {len(table)} currencies (USD/KRW {table.rate('USD', 'KRW')})")
+        return table
+    
+    def _refresh_in_background(self):
+        """요청 스레드를 막지 않고 갱신 (동시에 하나만 실행)"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+        
+        Thread(target=run, name="fx-refresh", daemon=True).start()
+    
+    def start(self):
+        """주기적 선제 갱신 스레드 시작 (만료 FX_REFRESH_AHEAD 초 전마다 갱신)"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        interval = max(self.ttl - self.refresh_ahead, 1)
+        
+        def loop():
+            while not self._stop_event.is_set():
+                self.refresh()
+                self._stop_event.wait(interval)
+        
+        self._thread = Thread(target=loop, name="fx-refresher", daemon=True)
+        self._thread.start()
+        logger.info(f"Exchange rate refresher started (every {interval}s)")
+    
+    def stop(self):
+        """주기적 갱신 스레드 종료"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    def clear(self):
+        """캐시 초기화 (테스트용)"""
+        with self._lock:
+            self._table = None
+            self._updated_at = None
+        logger.info("Exchange rate cache cleared")
+
+
+# 모든 ForexService 인스턴스가 공유하는 환율 제공자
+rate_provider = ExchangeRateProvider()
+
+
+class ForexService:
+    """환율 정보 조회 서비스 (ExchangeRate-API)
+    
+    인스턴스는 상태를 갖지 않고 프로세스 공용 rate_provider 를 사용한다.
+    """
+    
+    def __init__(self):
+        self.provider = rate_provider
+    
+    def get_usd_to_krw(self) -> Optional[float]:
+        """현재 USD/KRW 환율 조회 (마지막 값 즉시 반환, 만료 전 백그라운드 갱신)"""
+        return self.provider.get_usd_to_krw()
+    
+    def get_rate(self, base: str, quote: str) -> Optional[float]:
+        """교차 환율 조회 (base 1단위당 quote)
+        
+        Args:
+            base: 기준 통화 (예: USD)
+            quote: 표시 통화 (예: KRW)
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching exchange rate: {e}")
-            # 실패시 캐시된 값 반환 (있다면)
-            if self._cache:
-                logger.info(f"Returning cached value due to API error: {self._cache}")
-            return self._cache
+        Returns:
+            환율 또는 None
+        """
+        return self.provider.get_rate(base, quote)
+    
+    def convert(self, amount: float, base: str, quote: str) -> Optional[float]:
+        """금액 통화 변환"""
+        rate = self.get_rate(base, quote)
+        return amount * rate if rate is not None else None
+    
+    def get_rate_age(self) -> Optional[float]:
+        """현재 환율 값의 경과 시간 (초)"""
+        return self.provider.age_seconds()
+    
+    def get_updated_at(self) -> Optional[datetime]:
+        """현재 환율 값의 갱신 시각"""
+        return self.provider.updated_at
     
-    def get_historical_rate(self, date: datetime) -> Optional[float]:
-        """특정 날짜의 환율 조회
+    def get_historical_rate(self, date: datetime, db: Session) -> Optional[float]:
+        """특정 날짜의 USD/KRW 환율 조회
         
-        Note: exchangerate-api 무료 버전은 historical 미지원
-        필요시 다른 API로 교체 (예: https://exchangeratesapi.io/)
+        exchangerate-api 무료 버전은 historical 을 지원하지 않으므로
+        load_fx_history.py 로 적재한 로컬 일별 환율 테이블에서 찾는다
+        (휴일이면 직전 영업일). 기록이 없으면 현재 환율을 반환한다.
+        
+        Args:
+            date: 조회 날짜
+            db: 데이터베이스 세션
         """
-        logger.warning("Historical rates not supported, returning current rate")
+        from crud import exchange_rate as crud_exchange_rate
+        
+        rate = crud_exchange_rate.get_rate_on(db, date.date() if isinstance(date, datetime) else date)
+        if rate:
+            return rate
+        
+        logger.warning(f"No historical rate stored for {date:%Y-%m-%d}, returning current rate")
         return self.get_usd_to_krw()
     
     def clear_cache(self):
         """캐시 초기화 (테스트용)"""
-        self._cache = None
-        self._cache_time = None
-        logger.info("Exchange rate cache cleared")
+        self.provider.clear()
@@ -0,0 +1,228 @@
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Optional
+import os
+import logging
+
+from sqlalchemy import text
+
+from database import engine
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class AdvisoryLock:
+    """PostgreSQL 세션 advisory lock (전용 연결이 살아 있는 동안 유지)
+    
+    프로세스가 죽으면 연결이 끊기면서 서버가 잠금을 풀어 준다.
+    """
+    
+    name = "postgres"
+    
+    def __init__(self, key: int):
+        self.key = key
+        self._conn = None
+    
+    def try_acquire(self) -> bool:
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+    
+    def is_held(self) -> bool:
+        """잠금 연결이 살아 있는지 확인"""
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            self._conn.invalidate()
+            self._conn = None
+            return False
+    
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+        except Exception as e:
+            logger.warning(f"Advisory unlock failed: {e}")
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+class FileLock:
+    """파일 잠금 (flock, 같은 호스트의 프로세스 간, SQLite 용)
+    
+    프로세스가 죽으면 OS 가 잠금을 풀어 준다.
+    """
+    
+    name = "file"
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+    
+    def try_acquire(self) -> bool:
+        f = open(self.path, "a+")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()}\n")
+        f.flush()
+        self._file = f
+        return True
+    
+    def is_held(self) -> bool:
+        return self._file is not None
+    
+    def release(self):
+        if self._file is None:
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+class NoLock:
+    """잠금 없음 (항상 리더, 단일 프로세스 실행용)"""
+    
+    name = "none"
+    
+    def try_acquire(self) -> bool:
+        return True
+    
+    def is_held(self) -> bool:
+        return True
+    
+    def release(self):
+        pass
+
+
+def create_lock():
+    """DATABASE_URL 에 맞는 리더 잠금 생성"""
+    if not settings.LEADER_ELECTION:
+        return NoLock()
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLock(settings.LEADER_LOCK_KEY)
+    if fcntl is None:
+        logger.warning("File locks are not supported on this platform; every worker will run the scheduler")
+        return NoLock()
+    return FileLock(settings.LEADER_LOCK_FILE)
+
+
+class LeaderElector:
+    """여러 워커 프로세스 중 하나만 스케줄러를 실행하도록 리더 선출
+    
+    잠금을 얻은 프로세스가 리더가 되어 on_elected 를 호출한다. 나머지는
+    LEADER_RETRY_INTERVAL 초마다 잠금을 다시 시도하므로 리더 프로세스가
+    죽으면 그 중 하나가 이어받는다. 리더는 같은 주기로 잠금 유지 여부를
+    확인하고, 잃었으면 on_demoted 를 호출한 뒤 다시 후보가 된다.
+    """
+    
+    def __init__(
+        self,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        retry_interval: float = None,
+        lock=None
+    ):
+        """
+        Args:
+            on_elected: 리더가 되었을 때 호출 (스케줄러 시작)
+            on_demoted: 리더를 잃었을 때 호출 (스케줄러 종료)
+            retry_interval: 잠금 재시도/확인 주기 (초)
+            lock: 리더 잠금 (기본: DATABASE_URL 에 맞게 생성)
+        """
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.retry_interval = retry_interval or settings.LEADER_RETRY_INTERVAL
+        self.lock = lock or create_lock()
+        self.is_leader = False
+        self.elections = 0  # 리더가 된 횟수
+        self._state_lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+    
+    def _step(self):
+        """잠금 시도 또는 유지 확인 1회"""
+        with self._state_lock:
+            if self.is_leader:
+                if self.lock.is_held():
+                    return
+                logger.error(f"Leader lock lost (pid {os.getpid()}), stopping scheduler")
+                self.is_leader = False
+                self.on_demoted()
+                return
+            
+            try:
+                acquired = self.lock.try_acquire()
+            except Exception as e:
+                logger.error(f"Leader lock attempt failed: {e}")
+                return
+            if not acquired:
+                return
+            
+            self.is_leader = True
+            self.elections += 1
+            logger.info(f"Elected scheduler leader (pid {os.getpid()}, {self.lock.name} lock)")
+            self.on_elected()
+    
+    def start(self):
+        """선출 시작 (첫 시도는 즉시, 이후 백그라운드 스레드에서 주기적으로)"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._step()
+        if not self.is_leader:
+            logger.info(f"Another worker holds the scheduler lock; standing by (pid {os.getpid()})")
+        
+        def loop():
+            while not self._stop_event.wait(self.retry_interval):
+                self._step()
+        
+        self._thread = Thread(target=loop, name="leader-elector", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """선출 중단 (리더였으면 on_demoted 호출 후 잠금 해제)"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        
+        with self._state_lock:
+            if self.is_leader:
+                self.is_leader = False
+                self.on_demoted()
+                self.lock.release()
+                logger.info(f"Scheduler leader lock released (pid {os.getpid()})")
+    
+    def stats(self) -> Dict[str, Any]:
+        """리더 상태"""
+        return {
+            "pid": os.getpid(),
+            "is_leader": self.is_leader,
+            "lock": self.lock.name,
+            "elections": self.elections,
+        }
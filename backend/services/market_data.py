@@ -0,0 +1,326 @@
+from abc import ABC, abstractmethod
+import yfinance as yf
+import requests
+import json
+import random
+import time
+from datetime import date, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
+import logging
+
+from core.config import settings
+from core.metrics import upstream_requests, upstream_errors, upstream_duration
+from core.timing import record_phase, register_thread
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataError(Exception):
+    """시세/환율 제공자 조회 실패"""
+
+
+def _float(value) -> Optional[float]:
+    """pandas 값 -> float (NaN -> None)"""
+    if value is None or value != value:
+        return None
+    return float(value)
+
+
+class MarketDataProvider(ABC):
+    """시세/환율 제공자 인터페이스
+    
+    StockService 와 환율 제공자는 이 인터페이스만 사용하므로
+    MARKET_DATA_PROVIDER 설정으로 네트워크 없이 실행할 수 있다.
+    조회 실패는 예외(MarketDataError, requests 예외 등)로 알린다.
+    메서드를 빠뜨린 제공자는 생성 시점에 TypeError 가 난다.
+    """
+    
+    name = "base"
+    
+    @abstractmethod
+    def get_info(self, ticker: str) -> Dict:
+        """종목 정보
+        
+        Returns:
+            {"name", "currency", "current_price", "previous_close", "daily_change"}
+        """
+    
+    @abstractmethod
+    def get_recent_closes(self, symbols: List[str]) -> Dict[str, List[float]]:
+        """최근 일봉 종가 (오래된 순, 마지막 값이 현재가)
+        
+        Returns:
+            {ticker: [종가, ...]} (데이터가 없는 종목은 빈 리스트 또는 생략)
+        """
+    
+    @abstractmethod
+    def get_daily_bars(self, symbols: List[str], start: date) -> Dict[str, List[Dict]]:
+        """start 이후 일봉 (OHLCV)
+        
+        Returns:
+            {ticker: [{"price_date", "open", "high", "low", "close", "volume"}, ...]}
+        """
+    
+    @abstractmethod
+    def get_fx_rates(self) -> Dict:
+        """전체 환율표
+        
+        Returns:
+            {"base": "USD", "rates": {"KRW": 1320.5, ...}}
+        """
+
+
+class YFinanceProvider(MarketDataProvider):
+    """yfinance 시세 + ExchangeRate-API 환율"""
+    
+    name = "yfinance"
+    
+    def __init__(self, fx_api_url: str):
+        self.fx_api_url = fx_api_url
+    
+    def get_info(self, ticker: str) -> Dict:
+        info = yf.Ticker(ticker).info
+        if not info:
+            raise MarketDataError(f"empty info payload for {ticker}")
+        
+        return {
+            "name": info.get('longName') or info.get('shortName', ticker),
+            "currency": info.get('currency', 'USD'),
+            "current_price": info.get('currentPrice') or info.get('regularMarketPrice'),
+            "previous_close": info.get('previousClose'),
+            "daily_change": info.get('regularMarketChangePercent'),
+        }
+    
+    def get_recent_closes(self, symbols: List[str]) -> Dict[str, List[float]]:
+        data = yf.download(
+            symbols,
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+            threads=True
+        )
+        
+        closes = {}
+        for ticker in symbols:
+            if data is not None and not data.empty and ticker in data.columns.get_level_values(0):
+                closes[ticker] = [float(c) for c in data[ticker]['Close'].dropna().tolist()]
+        return closes
+    
+    def get_daily_bars(self, symbols: List[str], start: date) -> Dict[str, List[Dict]]:
+        data = yf.download(
+            symbols,
+            start=start.isoformat(),
+            end=(date.today() + timedelta(days=1)).isoformat(),
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+            threads=True
+        )
+        
+        bars = {}
+        for ticker in symbols:
+            bars[ticker] = []
+            if data is None or data.empty or ticker not in data.columns.get_level_values(0):
+                continue
+            
+            frame = data[ticker].dropna(subset=['Close'])
+            for day, row in frame.iterrows():
+                volume = _float(row.get('Volume'))
+                bars[ticker].append({
+                    "price_date": day.date(),
+                    "open": _float(row.get('Open')),
+                    "high": _float(row.get('High')),
+                    "low": _float(row.get('Low')),
+                    "close": float(row['Close']),
+                    "volume": int(volume) if volume is not None else None
+                })
+        return bars
+    
+    def get_fx_rates(self) -> Dict:
+        response = requests.get(self.fx_api_url, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+
+class ReplayProvider(MarketDataProvider):
+    """기록 파일 재생 제공자 (네트워크 없음, 부하 테스트/벤치마크용)
+    
+    파일 형식 (record_market_data.py 로 생성):
+        {
+          "quotes": {"AAPL": {"name": "Apple Inc.", "currency": "USD",
+                              "closes": [189.1, 190.5, ...]}},
+          "bars": {"AAPL": [{"date": "2024-01-02", "open": ..., "high": ...,
+                             "low": ..., "close": ..., "volume": ...}]},
+          "fx": {"base": "USD", "rates": {"KRW": 1320.5, ...}}
+        }
+        
+    호출마다 latency_ms 만큼 지연하고 failure_rate 확률로 MarketDataError 를
+    낸다. 실패 여부는 seed 로 고정한 난수열로 정해지므로 실행마다 같다.
+    """
+    
+    name = "replay"
+    
+    def __init__(self, path: str, latency_ms: float = 0, failure_rate: float = 0.0, seed: int = 42):
+        """
+        Args:
+            path: 기록 파일 경로 (JSON)
+            latency_ms: 호출당 지연 (밀리초)
+            failure_rate: 호출 실패 확률 (0~1)
+            seed: 실패 주입 난수 시드
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        
+        self.path = path
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self._quotes = {t.upper(): q for t, q in data.get("quotes", {}).items()}
+        self._bars = {
+            t.upper(): [
+                {**bar, "price_date": date.fromisoformat(bar["date"])}
+                for bar in bars
+            ]
+            for t, bars in data.get("bars", {}).items()
+        }
+        self._fx = data.get("fx")
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self.calls = 0
+        self.failures = 0
+        
+        logger.info(
+            f"Replay market data loaded from {path}: {len(self._quotes)} tickers "
+            f"(latency {latency_ms}ms, failure rate {failure_rate})"
+        )
+    
+    def _simulate(self, operation: str):
+        """지연 및 실패 주입"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        
+        if failed:
+            raise MarketDataError(f"replay: injected failure ({operation})")
+    
+    def get_info(self, ticker: str) -> Dict:
+        self._simulate("info")
+        quote = self._quotes.get(ticker.upper())
+        if not quote:
+            raise MarketDataError(f"replay: unknown ticker {ticker}")
+        
+        closes = quote.get("closes") or []
+        current = closes[-1] if closes else None
+        previous = closes[-2] if len(closes) >= 2 else None
+        return {
+            "name": quote.get("name", ticker),
+            "currency": quote.get("currency", "USD"),
+            "current_price": current,
+            "previous_close": previous,
+            "daily_change": (current - previous) / previous * 100 if current and previous else None,
+        }
+    
+    def get_recent_closes(self, symbols: List[str]) -> Dict[str, List[float]]:
+        self._simulate("quotes")
+        return {
+            ticker: list(self._quotes[ticker].get("closes") or [])
+            for ticker in symbols
+            if ticker in self._quotes
+        }
+    
+    def get_daily_bars(self, symbols: List[str], start: date) -> Dict[str, List[Dict]]:
+        self._simulate("bars")
+        return {
+            ticker: [
+                {
+                    "price_date": bar["price_date"],
+                    "open": bar.get("open"),
+                    "high": bar.get("high"),
+                    "low": bar.get("low"),
+                    "close": bar["close"],
+                    "volume": bar.get("volume"),
+                }
+                for bar in self._bars.get(ticker, [])
+                if bar["price_date"] >= start
+            ]
+            for ticker in symbols
+        }
+    
+    def get_fx_rates(self) -> Dict:
+        self._simulate("fx")
+        if not self._fx:
+            raise MarketDataError("replay: no fx rates recorded")
+        return self._fx
+    
+    def stats(self) -> Dict:
+        """재생 호출/실패 주입 통계"""
+        with self._lock:
+            return {"calls": self.calls, "injected_failures": self.failures}
+
+
+class InstrumentedProvider(MarketDataProvider):
+    """제공자 호출 수/실패 수/소요 시간을 메트릭으로 기록하는 래퍼"""
+    
+    def __init__(self, provider: MarketDataProvider):
+        self.provider = provider
+        self.name = provider.name
+    
+    def __getattr__(self, attr):
+        # stats 등 제공자 고유 속성
+        return getattr(self.provider, attr)
+    
+    def _call(self, operation: str, fn, *args):
+        upstream_requests.inc(self.name, operation)
+        register_thread()
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception:
+            upstream_errors.inc(self.name, operation)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            upstream_duration.observe(elapsed, self.name, operation)
+            # 요청 중 호출이면 Server-Timing 구간에 추가
+            record_phase("fx" if operation == "fx_rates" else "market", elapsed)
+    
+    def get_info(self, ticker: str) -> Dict:
+        return self._call("info", self.provider.get_info, ticker)
+    
+    def get_recent_closes(self, symbols: List[str]) -> Dict[str, List[float]]:
+        return self._call("recent_closes", self.provider.get_recent_closes, symbols)
+    
+    def get_daily_bars(self, symbols: List[str], start: date) -> Dict[str, List[Dict]]:
+        return self._call("daily_bars", self.provider.get_daily_bars, symbols, start)
+    
+    def get_fx_rates(self) -> Dict:
+        return self._call("fx_rates", self.provider.get_fx_rates)
+
+
+def create_provider() -> MarketDataProvider:
+    """MARKET_DATA_PROVIDER 설정에 맞는 제공자 생성"""
+    name = settings.MARKET_DATA_PROVIDER.lower()
+    
+    if name == "replay":
+        return ReplayProvider(
+            settings.REPLAY_DATA_PATH,
+            latency_ms=settings.REPLAY_LATENCY_MS,
+            failure_rate=settings.REPLAY_FAILURE_RATE,
+            seed=settings.REPLAY_SEED
+        )
+    if name != "yfinance":
+        raise ValueError(f"Unknown MARKET_DATA_PROVIDER: {settings.MARKET_DATA_PROVIDER}")
+    
+    return YFinanceProvider(settings.EXCHANGE_RATE_API_URL)
+
+
+# 프로세스 공용 시세/환율 제공자 (호출 메트릭 기록)
+market_data = InstrumentedProvider(create_provider())
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache:
+    """프로세스 공용 시세 캐시 (종목별 TTL + LRU 제거, thread-safe)"""
+    
+    def __init__(self, max_size: int, ttl: Union[float, Callable[[], float]]):
+        """
+        Args:
+            max_size: 최대 보관 종목 수 (초과시 가장 오래 사용하지 않은 종목 제거)
+            ttl: 유효 시간(초) 또는 저장 시점마다 TTL 을 돌려주는 함수
+        """
+        self.max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _current_ttl(self) -> float:
+        return self._ttl() if callable(self._ttl) else self._ttl
+    
+    def get(self, key: str) -> Optional[Any]:
+        """유효한 캐시 값 조회 (만료/미존재시 None)"""
+        found, _ = self.get_many([key])
+        return found.get(key)
+    
+    def get_many(self, keys: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """여러 키 일괄 조회
+        
+        Returns:
+            (캐시 적중 {key: value}, 미적중 key 리스트)
+        """
+        now = time.monotonic()
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[1]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+                    self.misses += 1
+        
+        return found, missing
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """값 저장"""
+        self.set_many({key: value}, ttl)
+    
+    def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None):
+        """여러 값 일괄 저장 (같은 TTL 적용)"""
+        expires_at = time.monotonic() + (ttl if ttl is not None else self._current_ttl())
+        
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key: str):
+        """특정 키 제거"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """캐시 초기화 (테스트용)"""
+        with self._lock:
+            self._entries.clear()
+        logger.info("Quote cache cleared")
+    
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -1,26 +1,90 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, List, Optional
 import pytz
+import time
 import logging
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from database import SessionLocal
-from models import Holdings, Alerts
+from models import Holdings, Transactions
+from crud import price_history as price_history_crud
+from crud import portfolio_history as portfolio_history_crud
+from crud import price_snapshot as price_snapshot_crud
+from crud import alert_outbox as alert_outbox_crud
+from crud.alert_outbox import PendingAlert
+from crud import alert_rule as alert_rule_crud
+from crud import position as position_crud
 from services.stock_service import StockService
-from services.email_service import EmailService
+from services.email_service import smtp_session
+from services.alert_dedup import alert_index
+from services.alert_delivery import alert_delivery
+from services.alert_rules import rule_index
+from services.session_triggers import TradingSessionTrigger, SessionCloseTrigger
+from services.leader import LeaderElector
 from core.config import settings
+from core.metrics import price_scan_duration
+from utils.market_hours import is_us_market_open
 
 logger = logging.getLogger(__name__)
 
 
+class ScanStats:
+    """가격 체크 소요 시간 기록 (체크 간격 초과 여부 포함)"""
+    
+    def __init__(self):
+        self._lock = Lock()
+        self.runs = 0
+        self.overruns = 0
+        self.max_duration = 0.0
+        self.last: Optional[Dict[str, Any]] = None
+    
+    def record(self, started_at: datetime, duration: float, tickers: int, interval_seconds: float):
+        """체크 1회 기록 (간격을 넘기면 경고)"""
+        price_scan_duration.observe(duration)
+        overran = duration > interval_seconds
+        with self._lock:
+            self.runs += 1
+            self.overruns += int(overran)
+            self.max_duration = max(self.max_duration, duration)
+            self.last = {
+                "started_at": started_at,
+                "duration_seconds": round(duration, 3),
+                "tickers": tickers,
+                "overran": overran,
+            }
+        
+        if overran:
+            logger.warning(
+                f"가격 체크가 체크 간격을 초과함: {duration:.1f}s > {interval_seconds:.0f}s ({tickers}개 종목)"
+            )
+        else:
+            logger.info(f"가격 체크 완료: {duration:.2f}s ({tickers}개 종목)")
+    
+    def stats(self) -> Dict[str, Any]:
+        """누적 통계"""
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "overruns": self.overruns,
+                "max_duration_seconds": round(self.max_duration, 3),
+                "last": self.last,
+            }
+
+
+# 가격 체크 소요 시간 (진단 엔드포인트에서 조회)
+scan_stats = ScanStats()
+
+
 class PriceAlertScheduler:
     """가격 변동 모니터링 스케줄러 (미국 증시 시간)"""
     
     def __init__(self):
         self.scheduler = BackgroundScheduler(timezone='Asia/Seoul')
         self.stock_service = StockService()
-        self.email_service = EmailService()
         self.alert_threshold = settings.PRICE_ALERT_THRESHOLD
     
     def is_us_market_open(self) -> bool:
@@ -29,42 +93,56 @@ class PriceAlertScheduler:
         Returns:
             시장 개장 여부
         """
-        now = datetime.now(pytz.timezone('America/New_York'))
-        
-        # 주말 제외
-        if now.weekday() >= 5:  # Saturday(5), Sunday(6)
-            return False
-        
-        # 정규 거래 시간: 09:30 ~ 16:00 EST
-        market_open = now.hour > 9 or (now.hour == 9 and now.minute >= 30)
-        market_close = now.hour < 16
-        
-        return market_open and market_close
+        return is_us_market_open()
     
     def check_price_changes(self):
-        """모든 보유 종목의 가격 변동 체크 및 알림 발송"""
-        if not self.is_us_market_open():
-            logger.info("미국 증시 휴장 중 - 가격 체크 건너뜀")
-            return
+        """보유/규칙 종목의 시세 스냅샷 저장 및 가격 변동 알림 대기열 기록
+        
+        스냅샷은 장 마감 직후 체크에서도 저장하고, 알림은 정규장 중에만 만든다.
+        보유 종목은 전역 임계값(PRICE_ALERT_THRESHOLD)으로, 규칙이 있는 종목은
+        규칙 인덱스로 확인한다. 메일 발송은 발송 작업(alert_delivery)이 따로
+        처리하므로 SMTP 를 기다리지 않는다.
+        """
+        market_open = self.is_us_market_open()
+        started_at = datetime.now()
+        started = time.perf_counter()
+        tickers = []
         
-        logger.info(f"가격 변동 체크 시작 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"가격 변동 체크 시작 - {started_at.strftime('%Y-%m-%d %H:%M:%S')}")
         
         db: Session = SessionLocal()
         try:
-            # 모든 보유 종목 조회
-            holdings = db.query(Holdings).all()
+            # 보유 종목 + 알림 규칙이 있는 종목 (규칙 추가/삭제시 인덱스 재생성)
+            held = dict(db.query(Holdings.ticker, Holdings.currency).all())  # ticker -> 거래 통화
+            rule_index.ensure_fresh(db)
+            tickers = sorted(held.keys() | rule_index.tickers)
             
-            if not holdings:
+            if not tickers:
                 logger.info("보유 종목 없음")
                 return
             
-            for holding in holdings:
-                ticker = holding.ticker
-                
+            # 전 종목 시세를 종목당 한 번만 조회 (배치 일괄 조회, 배치는 워커 풀에서 동시 실행)
+            # 후 스냅샷 저장 (API 스냅샷 모드용)
+            quotes = self.stock_service.get_quotes(tickers, held)
+            price_snapshot_crud.upsert_snapshots(db, quotes)
+            
+            if not market_open:
+                logger.info("미국 증시 정규장 외 - 스냅샷만 저장, 알림 체크 건너뜀")
+                return
+            
+            # 하락률 규칙용 평균 매수가
+            positions = position_crud.get_positions(db, held)
+            
+            # 알림은 모았다가 대기열에 일괄 기록 (발송은 별도 작업)
+            # 전역 임계값 알림은 종목당 1건, 규칙 알림은 발동한 규칙마다 1건
+            pending = []
+            fired_rules = []
+            
+            for ticker in tickers:
                 try:
-                    # 현재가 및 전일 종가 조회
-                    current_price = self.stock_service.get_current_price(ticker)
-                    previous_close = self.stock_service.get_previous_close(ticker)
+                    quote = quotes.get(ticker, {})
+                    current_price = quote.get('current_price')
+                    previous_close = quote.get('previous_close')
                     
                     if not current_price or not previous_close:
                         logger.warning(f"{ticker}: 가격 정보 조회 실패")
@@ -77,96 +155,171 @@ class PriceAlertScheduler:
                     
                     logger.debug(f"{ticker}: ${current_price:.2f} ({change_percent:+.2f}%)")
                     
-                    # 임계값 이상 변동시 알림 처리
-                    if abs(change_percent) >= self.alert_threshold:
-                        self._send_alert_if_needed(db, ticker, change_percent, current_price)
+                    # 보유 종목: 전역 임계값 이상 변동시 알림
+                    if (
+                        ticker in held
+                        and abs(change_percent) >= self.alert_threshold
+                        and not self._is_duplicate(db, ticker)
+                    ):
+                        pending.append(PendingAlert(ticker, change_percent, current_price))
+                    
+                    # 사용자 규칙 (종목별 이진 탐색)
+                    position = positions.get(ticker)
+                    avg_cost = (
+                        position["cost_usd"] / position["buy_shares"]
+                        if position and position["buy_shares"] > 0 else None
+                    )
+                    fired = rule_index.evaluate(
+                        ticker, current_price, previous_close, change_percent, avg_cost
+                    )
+                    for rule_id in fired:
+                        rule_type, threshold = rule_index.rule(rule_id)
+                        pending.append(PendingAlert(
+                            ticker, change_percent, current_price, rule_id, rule_type, threshold
+                        ))
+                    fired_rules.extend(fired)
                 
                 except Exception as e:
                     logger.error(f"{ticker} 처리 중 오류: {e}")
                     continue
+            
+            if fired_rules:
+                alert_rule_crud.mark_triggered(db, fired_rules, datetime.now(pytz.UTC), commit=False)
+                logger.info(f"알림 규칙 {len(fired_rules)}개 발동")
+            if pending:
+                self._enqueue_alerts(db, pending)
         
         except Exception as e:
             logger.error(f"가격 체크 중 오류: {e}")
             db.rollback()
         finally:
             db.close()
+            scan_stats.record(
+                started_at,
+                time.perf_counter() - started,
+                len(tickers),
+                settings.ALERT_CHECK_INTERVAL * 60
+            )
     
-    def _send_alert_if_needed(
-        self,
-        db: Session,
-        ticker: str,
-        change_percent: float,
-        current_price: float
-    ):
-        """알림 필요시 발송 (중복 방지)
+    def sync_price_history(self):
+        """보유 종목 일봉을 마지막 저장일 이후만 받아 추가하고 일별 평가 재계산/연장"""
+        db: Session = SessionLocal()
+        try:
+            # 기록이 없는 종목은 첫 거래일부터 받음
+            start_dates = {
+                ticker: first_trade.date()
+                for ticker, first_trade in db.query(
+                    Transactions.ticker, func.min(Transactions.transaction_time)
+                ).group_by(Transactions.ticker).all()
+            }
+            
+            if not start_dates:
+                return
+            
+            earliest = price_history_crud.sync_bars(db, start_dates)
+            if earliest:
+                portfolio_history_crud.recompute_from(db, earliest)
+                logger.info(f"일봉 동기화 완료 ({earliest} 이후)")
+            else:
+                # 새 일봉이 없어도 오늘까지의 평가 기록은 채움 (조회 API 는 쓰지 않음)
+                portfolio_history_crud.extend_to_today(db)
+        
+        except Exception as e:
+            logger.error(f"일봉 동기화 중 오류: {e}")
+            db.rollback()
+        finally:
+            db.close()
+    
+    def _enqueue_alerts(self, db: Session, alerts: List[PendingAlert]):
+        """알림을 대기열에 일괄 기록하고 발송 작업을 바로 실행하도록 예약
         
         Args:
             db: 데이터베이스 세션
-            ticker: 종목 심볼
-            change_percent: 변동률
-            current_price: 현재가
+            alerts: [PendingAlert, ...] (중복 확인/규칙 재발동 금지 확인 완료)
         """
-        # 중복 알림 방지: 최근 1시간 내 같은 종목 알림 확인
-        one_hour_ago = datetime.now(pytz.UTC) - timedelta(hours=1)
-        
-        recent_alert = db.query(Alerts).filter(
-            Alerts.ticker == ticker,
-            Alerts.sent_at >= one_hour_ago
-        ).first()
+        alert_outbox_crud.enqueue_alerts(db, alerts)
+        # 종목 중복 방지는 전역 임계값 알림만 (규칙은 규칙별 재발동 금지 기간)
+        for alert in alerts:
+            if alert.rule_id is None:
+                alert_index.record(alert.ticker)
         
-        if recent_alert:
+        if self.scheduler.running:
+            self.scheduler.modify_job('alert_delivery', next_run_time=datetime.now(self.scheduler.timezone))
+    
+    def _is_duplicate(self, db: Session, ticker: str) -> bool:
+        """중복 알림 여부 (메모리 인덱스로 확인, 비어 있으면 DB 에서 다시 적재)"""
+        alert_index.ensure_loaded(db)
+        if alert_index.is_recent(ticker):
             logger.info(f"{ticker}: 최근 알림 이미 발송됨 (중복 방지)")
-            return
-        
-        # 알림 발송
-        if self.email_service.send_price_alert(ticker, change_percent, current_price):
-            # 알림 기록 저장
-            alert = Alerts(
-                ticker=ticker,
-                change_percent=change_percent,
-                price=current_price
-            )
-            db.add(alert)
-            db.commit()
-            logger.info(f"알림 발송 완료: {ticker} {change_percent:+.2f}%")
-        else:
-            logger.warning(f"알림 발송 실패: {ticker}")
+            return True
+        return False
     
     def start(self):
         """스케줄러 시작"""
         interval = settings.ALERT_CHECK_INTERVAL
         
-        # 정규장 중 주기적 체크 (한국시간 22:30~06:00)
+        # 중복 방지 인덱스 적재 (실패하면 첫 알림 확인 때 재시도)
+        db: Session = SessionLocal()
+        try:
+            alert_index.load(db)
+        except Exception as e:
+            logger.error(f"알림 중복 방지 인덱스 적재 실패: {e}")
+        finally:
+            db.close()
+        
+        # 정규장 중 주기적 체크 (NYSE 일정 기준, 휴장일/장외 시간에는 실행 시각 없음)
         self.scheduler.add_job(
             self.check_price_changes,
-            CronTrigger(
-                day_of_week='mon-fri',
-                hour='22-23,0-5',
-                minute=f'*/{interval}'
-            ),
+            TradingSessionTrigger(timedelta(minutes=interval)),
             id='regular_hours_check',
             replace_existing=True
         )
         
-        # 장 마감 직후 최종 체크 (06:05)
+        # 장 마감 직후 최종 체크 (폐장 5분 후, 조기 폐장 반영)
         self.scheduler.add_job(
             self.check_price_changes,
-            CronTrigger(
-                day_of_week='mon-fri',
-                hour='6',
-                minute='5'
-            ),
+            SessionCloseTrigger(timedelta(minutes=5)),
             id='market_close_check',
             replace_existing=True
         )
         
+        # 알림 대기열 발송 (재시도 포함, 가격 체크 후에는 바로 실행)
+        self.scheduler.add_job(
+            alert_delivery.deliver_pending,
+            IntervalTrigger(seconds=settings.ALERT_DELIVERY_INTERVAL),
+            id='alert_delivery',
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+        
+        # 장 마감 후 일봉 동기화 (거래일 폐장 30분 후)
+        self.scheduler.add_job(
+            self.sync_price_history,
+            SessionCloseTrigger(timedelta(minutes=30)),
+            id='price_history_sync',
+            replace_existing=True
+        )
+        
         self.scheduler.start()
         logger.info("가격 알림 스케줄러 시작")
-        logger.info(f"  - 정규장 중: {interval}분마다 체크")
-        logger.info("  - 마감 후: 06:05 최종 체크")
+        logger.info(f"  - 정규장 중: {interval}분마다 체크 (NYSE 휴장일/조기 폐장/서머타임 반영)")
+        logger.info("  - 마감 후: 폐장 5분 후 최종 체크, 30분 후 일봉 동기화")
+        next_run = self.scheduler.get_job('regular_hours_check').next_run_time
+        if next_run is not None:
+            logger.info(f"  - 다음 체크: {next_run.astimezone(self.scheduler.timezone)}")
+        else:
+            logger.info("  - 다음 체크: 예정된 정규장 없음")
+        logger.info(f"  - 알림 발송: {settings.ALERT_DELIVERY_INTERVAL}초마다 대기열 처리")
     
     def stop(self):
         """스케줄러 종료"""
         if self.scheduler.running:
             self.scheduler.shutdown()
             logger.info("스케줄러 종료")
+        smtp_session.close()
+
+
+# 프로세스 공용 스케줄러 (여러 워커 중 리더 프로세스에서만 실행)
+price_alert_scheduler = PriceAlertScheduler()
+scheduler_leader = LeaderElector(price_alert_scheduler.start, price_alert_scheduler.stop)
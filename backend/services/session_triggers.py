@@ -0,0 +1,69 @@
+from apscheduler.triggers.base import BaseTrigger
+from datetime import datetime, timedelta
+from typing import Optional
+
+from utils.trading_calendar import TradingCalendar, nyse_calendar
+
+_EPSILON = timedelta(microseconds=1)
+
+
+def _start_from(previous_fire_time: Optional[datetime], now: datetime) -> datetime:
+    """다음 실행 후보 시작 시각 (직전 실행 시각은 제외)"""
+    if previous_fire_time is not None and previous_fire_time >= now:
+        return previous_fire_time + _EPSILON
+    return now
+
+
+class TradingSessionTrigger(BaseTrigger):
+    """정규장 중에만 interval 간격으로 실행 (개장 시각 기준 정렬)
+    
+    휴장일/주말/장외 시간에는 실행 시각을 만들지 않고 다음 개장 시각으로
+    건너뛴다. 조기 폐장일은 폐장 시각까지만 실행한다.
+    """
+    
+    def __init__(self, interval: timedelta, calendar: TradingCalendar = nyse_calendar):
+        """
+        Args:
+            interval: 실행 간격
+            calendar: 거래소 일정
+        """
+        self.interval = interval
+        self.calendar = calendar
+    
+    def get_next_fire_time(self, previous_fire_time: Optional[datetime], now: datetime) -> Optional[datetime]:
+        candidate = _start_from(previous_fire_time, now)
+        while True:
+            open_at, close_at = self.calendar.next_session(candidate)
+            if candidate <= open_at:
+                return open_at
+            
+            steps = -(-(candidate - open_at) // self.interval)  # 올림
+            fire_at = open_at + steps * self.interval
+            if fire_at < close_at:
+                return fire_at
+            candidate = close_at
+    
+    def __str__(self):
+        return f"trading_session[interval={self.interval}]"
+
+
+class SessionCloseTrigger(BaseTrigger):
+    """거래일마다 정규장 폐장 offset 후 1회 실행 (조기 폐장 반영)"""
+    
+    def __init__(self, offset: timedelta, calendar: TradingCalendar = nyse_calendar):
+        """
+        Args:
+            offset: 폐장 후 지연
+            calendar: 거래소 일정
+        """
+        self.offset = offset
+        self.calendar = calendar
+    
+    def get_next_fire_time(self, previous_fire_time: Optional[datetime], now: datetime) -> Optional[datetime]:
+        candidate = _start_from(previous_fire_time, now)
+        # 폐장 + offset >= candidate 인 첫 세션
+        _, close_at = self.calendar.next_session(candidate - self.offset - _EPSILON)
+        return close_at + self.offset
+    
+    def __str__(self):
+        return f"session_close[offset={self.offset}]"
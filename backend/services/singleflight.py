@@ -0,0 +1,120 @@
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """진행 중인 조회 1건"""
+    
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Exception = None
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 조회를 하나로 합치는 coalescing 레이어
+    
+    캐시 미스가 동시에 여러 번 발생해도 키마다 실제 조회는 한 번만 실행되고,
+    나머지 호출은 진행 중인 조회가 끝나기를 기다려 같은 결과를 받는다.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = Lock()
+        self.requests = 0    # 요청된 키 수
+        self.executions = 0  # 실제 조회 실행 횟수
+        self.collapsed = 0   # 진행 중인 조회에 합쳐진 키 수
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """단일 키 조회
+        
+        Args:
+            key: 조회 키 (예: 티커, 통화쌍)
+            fn: 실제 조회 함수
+            
+        Returns:
+            조회 결과 (동시 호출자는 모두 같은 결과를 받음)
+        """
+        return self.do_many([key], lambda keys: {key: fn()})[key]
+    
+    def do_many(
+        self,
+        keys: Iterable[Hashable],
+        fn: Callable[[List[Hashable]], Dict[Hashable, Any]]
+    ) -> Dict[Hashable, Any]:
+        """여러 키 일괄 조회
+        
+        이미 다른 호출이 조회 중인 키는 그 결과를 기다리고,
+        나머지 키만 모아 fn 을 한 번 호출한다.
+        
+        Args:
+            keys: 조회 키 목록
+            fn: 키 목록을 받아 {key: 결과} 를 돌려주는 조회 함수
+            
+        Returns:
+            {key: 결과} (fn 결과에 없는 키는 None)
+        """
+        owned: List[Hashable] = []
+        waiting: Dict[Hashable, _Call] = {}
+        
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                self.requests += 1
+                call = self._calls.get(key)
+                if call is not None:
+                    waiting[key] = call
+                    self.collapsed += 1
+                else:
+                    self._calls[key] = _Call()
+                    owned.append(key)
+            if owned:
+                self.executions += 1
+        
+        results: Dict[Hashable, Any] = {}
+        
+        # 담당 키를 먼저 조회해야 서로 기다리는 교착 상태가 생기지 않는다
+        if owned:
+            error = None
+            fetched: Dict[Hashable, Any] = {}
+            try:
+                fetched = fn(owned) or {}
+            except Exception as e:
+                error = e
+            
+            with self._lock:
+                for key in owned:
+                    call = self._calls.pop(key)
+                    call.result = fetched.get(key)
+                    call.error = error
+                    call.done.set()
+            
+            if error is not None:
+                raise error
+            
+            for key in owned:
+                results[key] = fetched.get(key)
+        
+        if waiting:
+            logger.debug(f"[{self.name}] {len(waiting)} key(s) joined in-flight fetch")
+        
+        for key, call in waiting.items():
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results[key] = call.result
+        
+        return results
+    
+    def stats(self) -> Dict[str, int]:
+        """coalescing 통계"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls),
+            }
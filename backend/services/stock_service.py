@@ -1,62 +1,285 @@
-import yfinance as yf
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+import time
 import logging
 
+from core.config import settings
+from core.metrics import metrics, quote_fetch_per_ticker
+from services.quote_cache import QuoteCache
+from services.singleflight import SingleFlight
+from services.circuit_breaker import NegativeCache, CircuitBreaker
+from services.market_data import market_data
+from utils.market_hours import is_us_market_open
+
 logger = logging.getLogger(__name__)
 
+# yf.download 한 번에 요청할 최대 종목 수
+QUOTE_BATCH_SIZE = 100
+
+
+def _quote_ttl() -> float:
+    """정규장 중에는 짧게, 장 마감 후에는 길게 캐싱"""
+    if is_us_market_open():
+        return settings.QUOTE_CACHE_TTL_MARKET_OPEN
+    return settings.QUOTE_CACHE_TTL_MARKET_CLOSED
+
+
+# 배치 단위 조회를 동시에 실행하는 공용 워커 풀 (프로세스 전체 동시 호출 상한)
+fetch_pool = ThreadPoolExecutor(
+    max_workers=settings.QUOTE_FETCH_CONCURRENCY,
+    thread_name_prefix="quote-fetch"
+)
+
+
+def _map_batches(fn, symbols: List[str], *args) -> List:
+    """QUOTE_BATCH_SIZE 단위 배치에 fn 적용 (배치가 여럿이면 워커 풀에서 동시 실행)"""
+    batches = [symbols[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(symbols), QUOTE_BATCH_SIZE)]
+    if len(batches) <= 1:
+        return [fn(batch, *args) for batch in batches]
+    # 요청 컨텍스트(Server-Timing 측정)를 워커 스레드로 전달
+    contexts = [copy_context() for _ in batches]
+    return list(fetch_pool.map(lambda ctx, batch: ctx.run(fn, batch, *args), contexts, batches))
+
+
+# 모든 StockService 인스턴스가 공유하는 시세 캐시
+quote_cache = QuoteCache(max_size=settings.QUOTE_CACHE_MAX_SIZE, ttl=_quote_ttl)
+
+metrics.callback("quote_cache_hits_total", "시세 캐시 적중 수", "counter", lambda: quote_cache.hits)
+metrics.callback("quote_cache_misses_total", "시세 캐시 미스 수", "counter", lambda: quote_cache.misses)
+metrics.callback("quote_cache_entries", "시세 캐시 종목 수", "gauge", lambda: quote_cache.stats()["size"])
+
+# 캐시 미스 시 같은 종목에 대한 동시 조회를 하나로 합침
+quote_flight = SingleFlight("quotes")
+
+# 조회 실패 종목은 지수 백오프 동안 yfinance 를 호출하지 않음
+negative_cache = NegativeCache(
+    base_backoff=settings.NEGATIVE_CACHE_BASE_BACKOFF,
+    max_backoff=settings.NEGATIVE_CACHE_MAX_BACKOFF
+)
+
+# yfinance 연속 실패시 호출 차단 (차단 중에는 마지막 시세 사용)
+quote_breaker = CircuitBreaker(
+    "yfinance",
+    failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+
+# 마지막으로 받은 시세 (만료 없음, 백오프/차단 중 대체 값)
+last_known_quotes = QuoteCache(max_size=settings.QUOTE_CACHE_MAX_SIZE, ttl=float("inf"))
+
 
 class StockService:
-    """주가 정보 조회 서비스 (yfinance)"""
+    """주가 정보 조회 서비스 (MARKET_DATA_PROVIDER, 기본 yfinance)"""
     
     @staticmethod
     def get_current_price(ticker: str) -> Optional[float]:
-        """현재가 조회"""
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # 현재가 또는 최근 종가
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-            return float(current_price) if current_price else None
-        except Exception as e:
-            logger.error(f"Error fetching price for {ticker}: {e}")
-            return None
+        """현재가 조회 (시세 캐시 경유)"""
+        ticker = ticker.upper()
+        return StockService.get_quotes([ticker])[ticker].get('current_price')
     
     @staticmethod
     def get_stock_info(ticker: str) -> Dict:
-        """종목 상세 정보 조회"""
+        """종목 상세 정보 조회 (실패 종목 백오프/차단 중에는 기본값 반환)"""
+        key = f"info:{ticker.upper()}"
+        if negative_cache.is_blocked(key) or not quote_breaker.allow_request():
+            logger.info(f"Skipping info fetch for {ticker} (backoff or circuit open)")
+            return StockService._empty_info(ticker)
+        
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            return {
-                "ticker": ticker,
-                "name": info.get('longName') or info.get('shortName', ticker),
-                "current_price": info.get('currentPrice') or info.get('regularMarketPrice'),
-                "previous_close": info.get('previousClose'),
-                "daily_change": info.get('regularMarketChangePercent'),
-                "currency": info.get('currency', 'USD')
-            }
+            info = market_data.get_info(ticker)
         except Exception as e:
             logger.error(f"Error fetching info for {ticker}: {e}")
-            return {
+            negative_cache.record_failure(key)
+            quote_breaker.record_failure()
+            return StockService._empty_info(ticker)
+        
+        negative_cache.record_success(key)
+        quote_breaker.record_success()
+        return {"ticker": ticker, **info}
+    
+    @staticmethod
+    def _empty_info(ticker: str) -> Dict:
+        """조회 실패시 기본 종목 정보 (통화는 알 수 없으므로 None)"""
+        return {
+            "ticker": ticker,
+            "name": ticker,
+            "current_price": None,
+            "previous_close": None,
+            "daily_change": None,
+            "currency": None
+        }
+    
+    @staticmethod
+    def get_quotes(
+        tickers: Iterable[str],
+        currencies: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict]:
+        """여러 종목 시세 일괄 조회
+        
+        공용 캐시에 없는 종목만 모아 시세 제공자(기본 yf.download)로 최근 일봉을
+        QUOTE_BATCH_SIZE 단위로 받아 현재가/전일 종가를 계산한다. 배치가 여럿이면
+        QUOTE_FETCH_CONCURRENCY 개까지 동시에 조회한다.
+        다른 요청이 이미 조회 중인 종목은 그 결과를 기다린다.
+        최근 실패해 백오프 중인 종목과 차단기가 열린 동안의 조회는
+        yfinance 를 호출하지 않고 마지막으로 받은 시세를 돌려준다.
+        
+        일봉 일괄 조회에는 통화 정보가 없으므로 통화는 currencies (보유 종목의
+        holdings.currency) 로 채운다.
+        
+        Args:
+            tickers: 종목 심볼 목록
+            currencies: {ticker: 거래 통화} (없는 종목은 USD)
+            
+        Returns:
+            {ticker: 시세 dict} (조회 실패 종목은 가격 필드가 None)
+        """
+        symbols = list(dict.fromkeys(t.upper() for t in tickers))
+        quotes, missing = quote_cache.get_many(symbols)
+        
+        if missing:
+            skipped = negative_cache.blocked(missing)
+            to_fetch = [t for t in missing if t not in skipped]
+            if to_fetch and not quote_breaker.allow_request():
+                skipped.update(to_fetch)
+                to_fetch = []
+            
+            if to_fetch:
+                quotes.update(quote_flight.do_many(to_fetch, StockService._fetch_and_cache))
+            if skipped:
+                quotes.update(StockService._last_known(skipped))
+        
+        # 캐시의 시세 dict 는 공유되므로 통화가 다른 종목만 복사해서 바꿈
+        if currencies:
+            for ticker, quote in quotes.items():
+                currency = currencies.get(ticker) or "USD"
+                if quote["currency"] != currency:
+                    quotes[ticker] = {**quote, "currency": currency}
+        
+        return quotes
+    
+    @staticmethod
+    def _last_known(symbols: Iterable[str]) -> Dict[str, Dict]:
+        """마지막으로 받은 시세 (없으면 가격 필드가 None 인 dict)"""
+        found, missing = last_known_quotes.get_many(symbols)
+        for ticker in missing:
+            found[ticker] = {
                 "ticker": ticker,
-                "name": ticker,
                 "current_price": None,
                 "previous_close": None,
                 "daily_change": None,
-                "currency": "USD"
+                "currency": "USD",
+                "fetched_at": None
             }
+        return found
     
     @staticmethod
-    def get_previous_close(ticker: str) -> Optional[float]:
-        """전일 종가 조회"""
+    def _fetch_and_cache(symbols: List[str]) -> Dict[str, Dict]:
+        """캐시 미스 종목을 배치 단위로 (동시) 조회하고 캐시에 저장"""
+        quotes: Dict[str, Dict] = {}
+        
+        for fetched in _map_batches(StockService._download_quotes, symbols):
+            priced = {
+                ticker: quote for ticker, quote in fetched.items()
+                if quote['current_price'] is not None
+            }
+            failed = [ticker for ticker in fetched if ticker not in priced]
+            
+            # 배치 전체 실패만 upstream 장애로 집계
+            if priced:
+                quote_breaker.record_success()
+            else:
+                quote_breaker.record_failure()
+            
+            for ticker in priced:
+                negative_cache.record_success(ticker)
+            for ticker in failed:
+                negative_cache.record_failure(ticker)
+            
+            # 가격을 받은 종목만 캐싱, 실패 종목은 마지막 시세로 대체 (백오프 후 재시도)
+            quote_cache.set_many(priced)
+            last_known_quotes.set_many(priced)
+            quotes.update(fetched)
+            if failed:
+                quotes.update(StockService._last_known(failed))
+        
+        return quotes
+    
+    @staticmethod
+    def _download_quotes(symbols: List[str]) -> Dict[str, Dict]:
+        """시세 제공자 1회 호출로 종목 묶음의 시세 조회"""
+        started = time.perf_counter()
         try:
-            stock = yf.Ticker(ticker)
-            return float(stock.info.get('previousClose', 0))
+            recent_closes = market_data.get_recent_closes(symbols)
         except Exception as e:
-            logger.error(f"Error fetching previous close for {ticker}: {e}")
-            return None
+            logger.error(f"Error downloading quotes for {len(symbols)} tickers: {e}")
+            recent_closes = {}
+        if symbols:
+            quote_fetch_per_ticker.observe((time.perf_counter() - started) / len(symbols))
+        
+        fetched_at = datetime.now()
+        quotes = {}
+        for ticker in symbols:
+            closes = recent_closes.get(ticker) or []
+            current_price = float(closes[-1]) if closes else None
+            previous_close = float(closes[-2]) if len(closes) >= 2 else None
+            daily_change = None
+            if current_price is not None and previous_close:
+                daily_change = StockService.calculate_change_percent(current_price, previous_close)
+            
+            if current_price is None:
+                logger.warning(f"No quote data for {ticker}")
+            
+            quotes[ticker] = {
+                "ticker": ticker,
+                "current_price": current_price,
+                "previous_close": previous_close,
+                "daily_change": daily_change,
+                "currency": "USD",
+                "fetched_at": fetched_at if current_price is not None else None
+            }
+        
+        return quotes
+    
+    @staticmethod
+    def download_daily_bars(symbols: List[str], start: date) -> Dict[str, List[Dict]]:
+        """start 이후 일봉(OHLCV) 조회 (QUOTE_BATCH_SIZE 단위, 배치는 동시 실행)
+        
+        Args:
+            symbols: 종목 심볼 목록
+            start: 첫 날짜 (포함)
+            
+        Returns:
+            {ticker: [{"price_date", "open", "high", "low", "close", "volume"}, ...]}
+            (조회 실패 종목은 빈 리스트)
+        """
+        bars: Dict[str, List[Dict]] = {}
+        for fetched in _map_batches(StockService._download_bars, symbols, start):
+            bars.update(fetched)
+        return bars
+    
+    @staticmethod
+    def _download_bars(symbols: List[str], start: date) -> Dict[str, List[Dict]]:
+        """시세 제공자 1회 호출로 종목 묶음의 일봉 조회"""
+        try:
+            fetched = market_data.get_daily_bars(symbols, start)
+        except Exception as e:
+            logger.error(f"Error downloading daily bars for {len(symbols)} tickers: {e}")
+            fetched = {}
+        
+        bars = {}
+        for ticker in symbols:
+            bars[ticker] = fetched.get(ticker) or []
+            if not bars[ticker]:
+                logger.warning(f"No daily bars for {ticker} since {start}")
+        return bars
+    
+    @staticmethod
+    def get_previous_close(ticker: str) -> Optional[float]:
+        """전일 종가 조회 (시세 캐시 경유)"""
+        ticker = ticker.upper()
+        return StockService.get_quotes([ticker])[ticker].get('previous_close')
     
     @staticmethod
     def calculate_change_percent(current: float, previous: float) -> float:
@@ -0,0 +1,149 @@
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import Dict, List, Optional
+import numpy as np
+
+
+_POSITION_FIELDS = itemgetter("net_shares", "buy_shares", "cost_usd", "cost_krw")
+
+_ROW_FIELDS = (
+    "ticker", "name", "shares", "avg_price", "current_price", "value_krw", "profit_pct",
+    "daily_change_pct", "profit_krw", "position_profit_pct", "weight_pct",
+    "price_as_of", "currency", "reporting_currency",
+)
+
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    """float 배열 -> 파이썬 리스트 (NaN -> None)"""
+    if not np.isnan(values).any():
+        return values.tolist()
+    return [None if v != v else v for v in values.tolist()]
+
+
+class PortfolioValuation:
+    """보유 종목 평가 엔진 (NumPy 벡터 연산)
+    
+    보유 현황과 시세를 종목 순서대로 배열에 담아 평가액, 손익, 수익률,
+    비중을 한 번에 계산한다. 시세나 환율이 없는 종목은 NaN 으로 전파되어
+    결과에서 None 이 된다.
+    """
+    
+    def __init__(
+        self,
+        positions: Dict[str, dict],
+        quotes: Dict[str, dict],
+        fx_rates: Dict[str, Optional[float]],
+        reporting_currency: str = "KRW"
+    ):
+        """
+        Args:
+            positions: {ticker: {name, net_shares, buy_shares, cost_usd, cost_krw}}
+            quotes: {ticker: StockService 시세 dict}
+            fx_rates: {통화: 보고 통화 환율} (USD 포함)
+            reporting_currency: 보고 통화
+        """
+        self.tickers: List[str] = list(positions)
+        self.names: List[str] = [positions[t]["name"] for t in self.tickers]
+        self.reporting_currency = reporting_currency
+        n = len(self.tickers)
+        
+        # 종목당 한 번만 dict 를 읽어 2차원 배열로 변환 (None -> NaN)
+        position_values = np.fromiter(
+            chain.from_iterable(map(_POSITION_FIELDS, positions.values())),
+            dtype=np.float64, count=n * 4
+        ).reshape(n, 4)
+        empty = {}
+        quote_values = np.fromiter(
+            (
+                np.nan if value is None else value
+                for q in (quotes.get(t, empty) for t in self.tickers)
+                for value in (
+                    q.get("current_price"), q.get("daily_change"), fx_rates.get(q.get("currency", "USD"))
+                )
+            ),
+            dtype=np.float64, count=n * 3
+        ).reshape(n, 3)
+        
+        # 시세 조회 시각 (스냅샷 모드에서는 스케줄러 기록 시각)
+        self.fetched_at = [quotes.get(t, empty).get("fetched_at") for t in self.tickers]
+        # 종목 거래 통화 (avg_price / current_price 의 표시 통화)
+        self.currencies = [
+            quotes.get(t, empty).get("currency") or positions[t].get("currency") or "USD"
+            for t in self.tickers
+        ]
+        
+        self.net_shares, self.buy_shares, self.cost_usd, self.cost_krw = position_values.T
+        self.price, self.daily_change, self.fx = quote_values.T
+        
+        # KRW 보고시 거래 시점 원화 비용, 그 외 통화는 USD 비용을 현재 환율로 환산
+        usd_rate = fx_rates.get("USD")
+        if reporting_currency.upper() == "KRW":
+            self.cost = np.nan_to_num(self.cost_krw)
+        else:
+            self.cost = np.nan_to_num(self.cost_usd) * (np.nan if usd_rate is None else usd_rate)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # 평균 매입가는 USD 로 기록되므로 현재가와 같은 종목 거래 통화로 환산
+            # (USD -> 보고 통화 -> 거래 통화). 환율이 없으면 USD 값을 그대로 노출
+            avg_price_usd = np.where(self.buy_shares > 0, self.cost_usd / self.buy_shares, 0.0)
+            avg_price_native = avg_price_usd * (np.nan if usd_rate is None else usd_rate) / self.fx
+            self.avg_price = np.where(np.isnan(avg_price_native), avg_price_usd, avg_price_native)
+            self.value = self.net_shares * self.price * self.fx
+            self.profit = self.value - self.cost
+            self.profit_pct = np.where(self.cost > 0, self.profit / self.cost * 100, 0.0)
+            self.profit_pct[np.isnan(self.value)] = np.nan
+            self.price_return_pct = np.where(
+                avg_price_native > 0, (self.price - avg_price_native) / avg_price_native * 100, 0.0
+            )
+            self.price_return_pct[np.isnan(self.value) | np.isnan(avg_price_native)] = np.nan
+            
+            self.total_value = float(np.nansum(self.value))
+            self.total_cost = float(np.nansum(self.cost))
+            self.weight_pct = (
+                self.value / self.total_value * 100 if self.total_value > 0
+                else np.full(n, np.nan)
+            )
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def rows(self) -> List[dict]:
+        """종목별 평가 결과 (수익률 높은 순 정렬)
+        
+        Returns:
+            HoldingResponse 형식 dict 리스트
+        """
+        order = np.argsort(-np.nan_to_num(self.price_return_pct, nan=-np.inf), kind="stable")
+        columns = [
+            _to_list(values[order])
+            for values in (
+                self.net_shares, self.avg_price, self.price, self.value,
+                self.price_return_pct, self.daily_change, self.profit,
+                self.profit_pct, self.weight_pct,
+            )
+        ]
+        index = order.tolist()
+        tickers = [self.tickers[i] for i in index]
+        names = [self.names[i] for i in index]
+        fetched_at = [self.fetched_at[i] for i in index]
+        currencies = [self.currencies[i] for i in index]
+        reporting_currency = repeat(self.reporting_currency, len(index))
+        
+        return [
+            dict(zip(_ROW_FIELDS, values))
+            for values in zip(tickers, names, *columns, fetched_at, currencies, reporting_currency)
+        ]
+    
+    def totals(self) -> dict:
+        """포트폴리오 합계"""
+        total_profit = self.total_value - self.total_cost
+        fetched_at = [t for t in self.fetched_at if t is not None]
+        return {
+            "total_value_krw": self.total_value,
+            "total_cost_krw": self.total_cost,
+            "total_profit_krw": total_profit,
+            "total_profit_pct": (total_profit / self.total_cost * 100) if self.total_cost > 0 else 0,
+            "holdings_count": len(self),
+            "prices_as_of": min(fetched_at) if fetched_at else None,  # 가장 오래된 시세 시각
+            "reporting_currency": self.reporting_currency
+        }
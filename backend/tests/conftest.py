@@ -0,0 +1,84 @@
+"""테스트 공용 설정 및 로컬 SMTP 대역 서버"""
+
+import os
+import socketserver
+import tempfile
+import threading
+
+import pytest
+
+# 설정(core.config)은 import 시점에 읽히므로 앱 모듈보다 먼저 지정
+_db_dir = tempfile.mkdtemp(prefix="investment-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """SMTP 명령을 최소한으로 처리하고 받은 메일을 서버 객체에 기록"""
+    
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+    
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        received = 0
+        self._reply("220 fake-smtp ready")
+        
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250-fake-smtp")
+                self._reply("250 AUTH PLAIN LOGIN")
+            elif command.startswith("AUTH"):
+                server.logins += 1
+                self._reply("235 authenticated")
+            elif command == "DATA":
+                self._reply("354 end with <CRLF>.<CRLF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data.append(chunk)
+                server.messages.append(b"".join(data))
+                received += 1
+                self._reply("250 queued")
+                # 메일 n 통을 받은 뒤 연결 끊기 (서버측 유휴 타임아웃 흉내)
+                if server.drop_after and received >= server.drop_after:
+                    return
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeSMTPHandler)
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.drop_after = None
+    
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """테스트마다 새로 띄우는 로컬 SMTP 대역 서버"""
+    server = FakeSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,149 @@
+"""SMTP 연결 재사용 / 재연결 / 다이제스트 발송 테스트 (로컬 SMTP 대역 서버 사용)"""
+
+from datetime import timedelta
+from email import message_from_bytes
+
+import pytest
+
+from core.config import settings
+from database import Base, engine, SessionLocal
+from crud import alert_rule as alert_rule_crud
+from models import Holdings, AlertOutbox
+from services.email_service import EmailService, SMTPSession
+from services.alert_delivery import AlertDeliveryWorker
+from services import scheduler as scheduler_module
+from services.alert_dedup import AlertDedupIndex
+from services.alert_rules import AlertRuleIndex
+from services.scheduler import PriceAlertScheduler
+
+
+def _session(server) -> SMTPSession:
+    return SMTPSession("127.0.0.1", server.port, "user", "secret", use_ssl=False, timeout=5)
+
+
+def _html_body(raw: bytes) -> str:
+    """받은 메일의 HTML 본문 (base64 디코딩)"""
+    message = message_from_bytes(raw)
+    for part in message.walk():
+        if part.get_content_type() == "text/html":
+            return part.get_payload(decode=True).decode("utf-8")
+    return ""
+
+
+def _email_service(session: SMTPSession) -> EmailService:
+    service = EmailService()
+    service.smtp_user = "alerts@example.com"
+    service.smtp_password = "secret"
+    service.alert_email = "me@example.com"
+    service.session = session
+    return service
+
+
+def test_one_login_serves_many_sends(smtp_server):
+    session = _session(smtp_server)
+    email_service = _email_service(session)
+    
+    for i in range(5):
+        assert email_service.send_price_alert(f"T{i}", 6.0, 100.0)
+    
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == 1
+    assert session.stats() == {"connected": True, "connects": 1, "sent": 5}
+    session.close()
+
+
+def test_reconnects_and_retries_after_server_drop(smtp_server):
+    session = _session(smtp_server)
+    email_service = _email_service(session)
+    smtp_server.drop_after = 1
+    
+    assert email_service.send_price_alert("AAPL", 6.0, 100.0)
+    # 서버가 연결을 끊었으므로 다음 발송은 재연결 후 재시도해서 성공해야 함
+    assert email_service.send_price_alert("MSFT", -7.0, 200.0)
+    
+    assert len(smtp_server.messages) == 2
+    assert smtp_server.connections == 2
+    assert session.stats()["connects"] == 2
+    assert session.stats()["sent"] == 2
+    session.close()
+
+
+@pytest.fixture
+def held_tickers(monkeypatch):
+    """보유 종목 3개가 있는 빈 DB (스케줄러 공용 인덱스도 새로 만듦)"""
+    monkeypatch.setattr(scheduler_module, "alert_index", AlertDedupIndex(timedelta(minutes=60)))
+    monkeypatch.setattr(scheduler_module, "rule_index", AlertRuleIndex(timedelta(minutes=60)))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    tickers = ["AAPL", "MSFT", "NVDA"]
+    db = SessionLocal()
+    try:
+        db.add_all(Holdings(ticker=t, name=t, currency="USD") for t in tickers)
+        db.commit()
+    finally:
+        db.close()
+    yield tickers
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_digest_sends_one_message_per_scan(smtp_server, held_tickers, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_DIGEST", True)
+    session = _session(smtp_server)
+    
+    scheduler = PriceAlertScheduler()
+    monkeypatch.setattr(scheduler, "is_us_market_open", lambda: True)
+    monkeypatch.setattr(
+        scheduler.stock_service, "get_quotes",
+        lambda tickers, currencies=None: {
+            t: {"ticker": t, "current_price": 110.0, "previous_close": 100.0, "currency": "USD"}
+            for t in tickers
+        }
+    )
+    worker = AlertDeliveryWorker(_email_service(session))
+    
+    scheduler.check_price_changes()
+    assert worker.deliver_pending() == len(held_tickers)
+    
+    assert len(smtp_server.messages) == 1
+    body = _html_body(smtp_server.messages[0])
+    assert all(ticker in body for ticker in held_tickers)
+    session.close()
+
+
+def test_rule_alerts_are_queued_per_rule_and_show_condition(smtp_server, held_tickers, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_DIGEST", False)
+    db = SessionLocal()
+    try:
+        alert_rule_crud.create_rule(db, "AAPL", "price_above", 105.0)
+        alert_rule_crud.create_rule(db, "AAPL", "pct_move", 8.0)
+    finally:
+        db.close()
+    
+    session = _session(smtp_server)
+    scheduler = PriceAlertScheduler()
+    monkeypatch.setattr(scheduler, "is_us_market_open", lambda: True)
+    monkeypatch.setattr(
+        scheduler.stock_service, "get_quotes",
+        lambda tickers, currencies=None: {
+            t: {"ticker": t, "current_price": 110.0, "previous_close": 100.0, "currency": "USD"}
+            for t in tickers
+        }
+    )
+    scheduler.check_price_changes()
+    
+    db = SessionLocal()
+    try:
+        queued = db.query(AlertOutbox).filter(AlertOutbox.ticker == "AAPL").all()
+    finally:
+        db.close()
+    # 전역 임계값 알림 1건 + 발동한 규칙마다 1건
+    assert sorted((e.rule_type or "") for e in queued) == ["", "pct_move", "price_above"]
+    
+    worker = AlertDeliveryWorker(_email_service(session))
+    assert worker.deliver_pending() == len(held_tickers) + 2
+    
+    bodies = [_html_body(raw) for raw in smtp_server.messages]
+    assert any("$105.00 상향 돌파" in body for body in bodies)
+    assert any("±8.00% 이상 변동" in body for body in bodies)
+    session.close()
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+
+from utils.trading_calendar import NEW_YORK_TZ, nyse_calendar
+
+
+def is_us_market_open(now: Optional[datetime] = None) -> bool:
+    """미국 증시 정규장 오픈 여부 확인 (NYSE 휴장일/조기 폐장/서머타임 반영)
+    
+    Args:
+        now: 기준 시각 (기본: 현재 시각)
+        
+    Returns:
+        시장 개장 여부
+    """
+    return nyse_calendar.is_open(now)
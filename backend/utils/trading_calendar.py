@@ -0,0 +1,219 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+import pytz
+import logging
+
+logger = logging.getLogger(__name__)
+
+NEW_YORK_TZ = pytz.timezone('America/New_York')
+
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+# NYSE 휴장일 (거래소 공지 기준, 네트워크 없이 사용)
+NYSE_HOLIDAYS: Dict[date, str] = {
+    date(2024, 1, 1): "New Year's Day",
+    date(2024, 1, 15): "Martin Luther King Jr. Day",
+    date(2024, 2, 19): "Washington's Birthday",
+    date(2024, 3, 29): "Good Friday",
+    date(2024, 5, 27): "Memorial Day",
+    date(2024, 6, 19): "Juneteenth",
+    date(2024, 7, 4): "Independence Day",
+    date(2024, 9, 2): "Labor Day",
+    date(2024, 11, 28): "Thanksgiving Day",
+    date(2024, 12, 25): "Christmas Day",
+    
+    date(2025, 1, 1): "New Year's Day",
+    date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+    date(2025, 1, 20): "Martin Luther King Jr. Day",
+    date(2025, 2, 17): "Washington's Birthday",
+    date(2025, 4, 18): "Good Friday",
+    date(2025, 5, 26): "Memorial Day",
+    date(2025, 6, 19): "Juneteenth",
+    date(2025, 7, 4): "Independence Day",
+    date(2025, 9, 1): "Labor Day",
+    date(2025, 11, 27): "Thanksgiving Day",
+    date(2025, 12, 25): "Christmas Day",
+    
+    date(2026, 1, 1): "New Year's Day",
+    date(2026, 1, 19): "Martin Luther King Jr. Day",
+    date(2026, 2, 16): "Washington's Birthday",
+    date(2026, 4, 3): "Good Friday",
+    date(2026, 5, 25): "Memorial Day",
+    date(2026, 6, 19): "Juneteenth",
+    date(2026, 7, 3): "Independence Day",
+    date(2026, 9, 7): "Labor Day",
+    date(2026, 11, 26): "Thanksgiving Day",
+    date(2026, 12, 25): "Christmas Day",
+    
+    date(2027, 1, 1): "New Year's Day",
+    date(2027, 1, 18): "Martin Luther King Jr. Day",
+    date(2027, 2, 15): "Washington's Birthday",
+    date(2027, 3, 26): "Good Friday",
+    date(2027, 5, 31): "Memorial Day",
+    date(2027, 6, 18): "Juneteenth",
+    date(2027, 7, 5): "Independence Day",
+    date(2027, 9, 6): "Labor Day",
+    date(2027, 11, 25): "Thanksgiving Day",
+    date(2027, 12, 24): "Christmas Day",
+    
+    date(2028, 1, 17): "Martin Luther King Jr. Day",
+    date(2028, 2, 21): "Washington's Birthday",
+    date(2028, 4, 14): "Good Friday",
+    date(2028, 5, 29): "Memorial Day",
+    date(2028, 6, 19): "Juneteenth",
+    date(2028, 7, 4): "Independence Day",
+    date(2028, 9, 4): "Labor Day",
+    date(2028, 11, 23): "Thanksgiving Day",
+    date(2028, 12, 25): "Christmas Day",
+    
+    date(2029, 1, 1): "New Year's Day",
+    date(2029, 1, 15): "Martin Luther King Jr. Day",
+    date(2029, 2, 19): "Washington's Birthday",
+    date(2029, 3, 30): "Good Friday",
+    date(2029, 5, 28): "Memorial Day",
+    date(2029, 6, 19): "Juneteenth",
+    date(2029, 7, 4): "Independence Day",
+    date(2029, 9, 3): "Labor Day",
+    date(2029, 11, 22): "Thanksgiving Day",
+    date(2029, 12, 25): "Christmas Day",
+    
+    date(2030, 1, 1): "New Year's Day",
+    date(2030, 1, 21): "Martin Luther King Jr. Day",
+    date(2030, 2, 18): "Washington's Birthday",
+    date(2030, 4, 19): "Good Friday",
+    date(2030, 5, 27): "Memorial Day",
+    date(2030, 6, 19): "Juneteenth",
+    date(2030, 7, 4): "Independence Day",
+    date(2030, 9, 2): "Labor Day",
+    date(2030, 11, 28): "Thanksgiving Day",
+    date(2030, 12, 25): "Christmas Day",
+}
+
+# NYSE 조기 폐장일 (13:00 ET 마감)
+NYSE_EARLY_CLOSES: Dict[date, str] = {
+    date(2024, 7, 3): "Independence Day eve",
+    date(2024, 11, 29): "Day after Thanksgiving",
+    date(2024, 12, 24): "Christmas Eve",
+    
+    date(2025, 7, 3): "Independence Day eve",
+    date(2025, 11, 28): "Day after Thanksgiving",
+    date(2025, 12, 24): "Christmas Eve",
+    
+    date(2026, 11, 27): "Day after Thanksgiving",
+    date(2026, 12, 24): "Christmas Eve",
+    
+    date(2027, 11, 26): "Day after Thanksgiving",
+    
+    date(2028, 7, 3): "Independence Day eve",
+    date(2028, 11, 24): "Day after Thanksgiving",
+    
+    date(2029, 7, 3): "Independence Day eve",
+    date(2029, 11, 23): "Day after Thanksgiving",
+    date(2029, 12, 24): "Christmas Eve",
+    
+    date(2030, 7, 3): "Independence Day eve",
+    date(2030, 11, 29): "Day after Thanksgiving",
+    date(2030, 12, 24): "Christmas Eve",
+}
+
+# 휴장일 표가 다루는 기간 (밖의 날짜는 평일 정규장으로 간주)
+CALENDAR_START = date(2024, 1, 1)
+CALENDAR_END = date(2030, 12, 31)
+
+Session = Tuple[datetime, datetime]
+
+
+class TradingCalendar:
+    """거래소 정규장 일정 (휴장일, 조기 폐장, 서머타임 반영)
+    
+    표 기간의 거래일별 개장/폐장 시각을 생성 시 UTC 로 미리 계산해 두므로
+    조회는 dict 조회뿐이다. 개장/폐장은 뉴욕 현지 시각 기준이라 서머타임
+    전환과 무관하게 맞는다. 표 기간 밖의 날짜는 평일 정규장으로 계산한다.
+    """
+    
+    def __init__(
+        self,
+        holidays: Dict[date, str],
+        early_closes: Dict[date, str],
+        start: date,
+        end: date,
+        tz=NEW_YORK_TZ
+    ):
+        """
+        Args:
+            holidays: {휴장일: 사유}
+            early_closes: {조기 폐장일: 사유}
+            start: 표 시작일
+            end: 표 종료일
+            tz: 거래소 시간대
+        """
+        self.holidays = holidays
+        self.early_closes = early_closes
+        self.start = start
+        self.end = end
+        self.tz = tz
+        self._warned = False
+        
+        self._sessions: Dict[date, Session] = {}
+        day = start
+        while day <= end:
+            if day.weekday() < 5 and day not in holidays:
+                self._sessions[day] = self._build_session(day)
+            day += timedelta(days=1)
+    
+    def _build_session(self, day: date) -> Session:
+        close = EARLY_CLOSE if day in self.early_closes else REGULAR_CLOSE
+        return (
+            self.tz.localize(datetime.combine(day, REGULAR_OPEN)).astimezone(pytz.UTC),
+            self.tz.localize(datetime.combine(day, close)).astimezone(pytz.UTC),
+        )
+    
+    def session(self, day: date) -> Optional[Session]:
+        """해당일(거래소 현지 날짜) 정규장 개장/폐장 시각 (UTC)
+        
+        Returns:
+            (개장, 폐장) 또는 휴장이면 None
+        """
+        if self.start <= day <= self.end:
+            return self._sessions.get(day)
+        
+        if not self._warned:
+            self._warned = True
+            logger.warning(f"Trading calendar covers {self.start}~{self.end}; treating {day} by weekday only")
+        return self._build_session(day) if day.weekday() < 5 else None
+    
+    def is_trading_day(self, day: date) -> bool:
+        """거래일 여부"""
+        return self.session(day) is not None
+    
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """정규장 진행 중 여부"""
+        now = now or datetime.now(pytz.UTC)
+        session = self.session(now.astimezone(self.tz).date())
+        return session is not None and session[0] <= now < session[1]
+    
+    def next_session(self, after: datetime) -> Session:
+        """after 이후에 끝나는 첫 정규장 (진행 중이면 현재 세션)"""
+        day = after.astimezone(self.tz).date()
+        while True:
+            session = self.session(day)
+            if session is not None and session[1] > after:
+                return session
+            day += timedelta(days=1)
+    
+    def sessions_between(self, start: date, end: date) -> List[Tuple[date, Session]]:
+        """start ~ end 사이 거래일과 정규장 시각"""
+        result = []
+        day = start
+        while day <= end:
+            session = self.session(day)
+            if session is not None:
+                result.append((day, session))
+            day += timedelta(days=1)
+        return result
+
+
+# NYSE 정규장 일정
+nyse_calendar = TradingCalendar(NYSE_HOLIDAYS, NYSE_EARLY_CLOSES, CALENDAR_START, CALENDAR_END)
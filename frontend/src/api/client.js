@@ -2,8 +2,12 @@ import axios from 'axios';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// 모든 API 경로의 공통 접두사 (백엔드 api_router 마운트 경로, REST 호출과 실시간 스트림이 같은 경로를 사용)
+// 목록 경로는 백엔드 라우트처럼 끝에 / 를 붙여 307 리다이렉트를 피함
+const API_PREFIX = '/api/v1';
+
 const apiClient = axios.create({
-  baseURL: API_BASE_URL,
+  baseURL: `${API_BASE_URL}${API_PREFIX}`,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -12,41 +16,59 @@ const apiClient = axios.create({
 // ==================== 환율 API ====================
 
 export const getExchangeRate = async () => {
-  const response = await apiClient.get('/api/exchange-rate');
+  const response = await apiClient.get('/exchange-rate/');
   return response.data;
 };
 
 // ==================== 보유 종목 API ====================
 
 export const getHoldings = async () => {
-  const response = await apiClient.get('/api/holdings');
+  const response = await apiClient.get('/holdings/');
   return response.data;
 };
 
 export const getStockDetail = async (ticker) => {
-  const response = await apiClient.get(`/api/holdings/${ticker}`);
+  const response = await apiClient.get(`/holdings/${ticker}`);
+  return response.data;
+};
+
+export const getPriceHistory = async (ticker, start, end) => {
+  const response = await apiClient.get(`/holdings/${ticker}/history`, {
+    params: { start, end },
+  });
   return response.data;
 };
 
 // ==================== 거래 API ====================
 
 export const createTransaction = async (transactionData) => {
-  const response = await apiClient.post('/api/transactions', transactionData);
+  const response = await apiClient.post('/transactions/', transactionData);
   return response.data;
 };
 
 // ==================== 포트폴리오 API ====================
 
 export const getPortfolioSummary = async () => {
-  const response = await apiClient.get('/api/portfolio/summary');
+  const response = await apiClient.get('/portfolio/summary');
   return response.data;
 };
 
 // ==================== 알림 API ====================
 
 export const getAlerts = async (limit = 10) => {
-  const response = await apiClient.get(`/api/alerts?limit=${limit}`);
+  const response = await apiClient.get('/alerts/', { params: { limit } });
   return response.data;
 };
 
+// ==================== 실시간 스트림 (SSE) ====================
+
+// handlers: { 이벤트 종류: (data) => void } (끊기면 브라우저가 자동 재연결)
+export const openEventStream = (handlers) => {
+  const source = new EventSource(apiClient.getUri({ url: '/stream/' }));
+  Object.entries(handlers).forEach(([event, handler]) => {
+    source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+  });
+  return source;
+};
+
 export default apiClient;
@@ -11,8 +11,26 @@ import {
   getPortfolioSummary,
   getAlerts,
   getStockDetail,
+  openEventStream,
 } from '../api/client';
 
+// 스트림 시세로 보유 종목 평가 갱신 (평가액은 환율/표시 통화를 유지한 채 가격 비율만 반영)
+const applyPrices = (holdings, prices) =>
+  holdings.map((holding) => {
+    const quote = prices[holding.ticker];
+    if (!quote || quote.price == null) return holding;
+
+    const ratio = holding.current_price ? quote.price / holding.current_price : null;
+    return {
+      ...holding,
+      current_price: quote.price,
+      value_krw: ratio != null && holding.value_krw != null ? holding.value_krw * ratio : holding.value_krw,
+      profit_pct: holding.avg_price ? (quote.price / holding.avg_price - 1) * 100 : holding.profit_pct,
+      daily_change_pct: quote.change_pct ?? holding.daily_change_pct,
+      price_as_of: quote.fetched_at,
+    };
+  });
+
 const Dashboard = () => {
   const [exchangeRate, setExchangeRate] = useState(null);
   const [holdings, setHoldings] = useState([]);
@@ -47,17 +65,15 @@ const Dashboard = () => {
   useEffect(() => {
     fetchData();
 
-    // 30초마다 환율 업데이트
-    const interval = setInterval(async () => {
-      try {
-        const rateData = await getExchangeRate();
-        setExchangeRate(rateData);
-      } catch (error) {
-        console.error('환율 업데이트 실패:', error);
-      }
-    }, 30000);
-
-    return () => clearInterval(interval);
+    // 서버 푸시로 시세/환율/알림 갱신 (모든 대시보드가 서버의 공용 스트림을 구독)
+    const stream = openEventStream({
+      prices: (prices) => setHoldings((prev) => applyPrices(prev, prices)),
+      exchange_rate: (rateData) => setExchangeRate(rateData),
+      alert: (alert) => setAlerts((prev) => [alert, ...prev].slice(0, 5)),
+    });
+    stream.onerror = () => console.error('실시간 스트림 연결 끊김 (자동 재연결)');
+
+    return () => stream.close();
   }, []);
 
   // 종목 클릭 핸들러